@@ -0,0 +1,135 @@
+"""API keys for machine clients, sent in the X-API-Key header."""
+
+import hashlib
+import hmac
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from fastapi import HTTPException
+from antidote import injectable, inject
+import gel
+
+from config import AuthConfig
+from database import DatabaseService
+from shared_state import SharedState
+from auth.models import ApiKey, ApiKeyCreated, User
+
+# Import generated queries
+from auth.queries import (
+    CreateApiKeyResult,
+    create_api_key,
+    get_api_key_by_prefix,
+    list_api_keys,
+    revoke_api_key,
+)
+
+KEY_PREFIX = "grk_"
+
+
+def _hash_key(key: str) -> str:
+    # Keys are 256 random bits, so a plain digest is as safe as a KDF here and takes microseconds
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _split_key(key: str) -> Optional[str]:
+    """Return the lookup prefix of a well-formed key."""
+    if not key.startswith(KEY_PREFIX):
+        return None
+    prefix, _, secret = key[len(KEY_PREFIX):].partition(".")
+    return prefix if prefix and secret else None
+
+
+def _to_api_key(key: CreateApiKeyResult) -> ApiKey:
+    """Convert a generated query result into the API model."""
+    return ApiKey(
+        id=str(key.id),
+        name=key.name,
+        prefix=key.prefix,
+        created_at=key.created_at,
+        expires_at=key.expires_at,
+        revoked_at=key.revoked_at
+    )
+
+
+@injectable
+class ApiKeyService:
+    """Issues, revokes and checks API keys; checks are served from the shared cache."""
+    
+    def __init__(
+        self,
+        config: AuthConfig = inject[AuthConfig],
+        db: DatabaseService = inject[DatabaseService],
+        state: SharedState = inject[SharedState]
+    ):
+        self.config = config
+        self.db = db
+        # Keyed by prefix; unknown prefixes are cached too, so a client retrying a bad key stays off the database
+        self._cache = state.cache("api_key", config.api_key_cache_ttl_seconds)
+    
+    async def create(self, name: str, username: str, expires_in_days: Optional[int] = None) -> ApiKeyCreated:
+        """Create a key for `username`; the returned key is not stored and cannot be shown again."""
+        prefix = secrets.token_hex(6)
+        key = f"{KEY_PREFIX}{prefix}.{secrets.token_urlsafe(32)}"
+        expires_at = None
+        if expires_in_days is not None:
+            expires_at = datetime.now(timezone.utc) + timedelta(days=expires_in_days)
+        
+        client = await self.db.get_client()
+        created = await create_api_key(
+            client,
+            name=name,
+            prefix=prefix,
+            key_hash=_hash_key(key),
+            expires_at=expires_at,
+            username=username
+        )
+        await self._cache.delete(prefix)
+        return ApiKeyCreated(**_to_api_key(created).model_dump(), key=key)
+    
+    async def list_keys(self) -> List[ApiKey]:
+        """Get every key, newest first, including revoked ones."""
+        client = await self.db.get_client()
+        return [_to_api_key(key) for key in await list_api_keys(client)]
+    
+    async def revoke(self, key_id: str) -> bool:
+        """Revoke a key and drop its cached lookup."""
+        client = await self.db.get_client()
+        try:
+            revoked = await revoke_api_key(client, key_id=key_id)
+        except gel.InvalidValueError:
+            raise HTTPException(status_code=400, detail="Invalid API key ID format")
+        if revoked is None:
+            return False
+        await self._cache.delete(revoked.prefix)
+        return True
+    
+    async def authenticate(self, key: str) -> User:
+        """Resolve the user a key acts as, or raise 401."""
+        prefix = _split_key(key)
+        if prefix is None:
+            raise HTTPException(status_code=401, detail="Invalid API key")
+        
+        entry = await self._cache.get(prefix)
+        if entry is None:
+            client = await self.db.get_client()
+            found = await get_api_key_by_prefix(client, prefix=prefix)
+            entry = {"found": False}
+            if found is not None:
+                entry = {
+                    "found": True,
+                    "key_hash": found.key_hash,
+                    "expires_at": found.expires_at.timestamp() if found.expires_at else None,
+                    "username": found.user.username,
+                }
+            await self._cache.set(prefix, entry)
+        
+        if not entry["found"] or not hmac.compare_digest(entry["key_hash"], _hash_key(key)):
+            raise HTTPException(status_code=401, detail="Invalid API key")
+        if entry["expires_at"] is not None and entry["expires_at"] <= time.time():
+            raise HTTPException(status_code=401, detail="API key expired")
+        return User(username=entry["username"])
+    
+    def cache_stats(self) -> dict:
+        """Return key lookup cache size and hit/miss counters."""
+        return self._cache.stats()
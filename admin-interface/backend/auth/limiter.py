@@ -0,0 +1,120 @@
+"""Brute-force protection for POST /auth/login."""
+
+import hashlib
+import logging
+import math
+import time
+from typing import Optional
+
+from fastapi import HTTPException
+from antidote import injectable, inject
+
+from config import AuthConfig
+from observability import Metrics
+from shared_state import SharedState, StateUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+@injectable
+class LoginLimiter:
+    """Sliding-window limits on login attempts per username and per client IP.
+    
+    Each key counts attempts in fixed windows of `login_window_seconds`; the
+    sliding count adds the previous window weighted by how much of it still
+    falls within the last window length. Counters live in SharedState, so every
+    worker enforces the same limits and the store's LRU bound caps memory when
+    an attacker cycles through usernames.
+    """
+    
+    def __init__(
+        self,
+        config: AuthConfig = inject[AuthConfig],
+        state: SharedState = inject[SharedState],
+        metrics: Metrics = inject[Metrics]
+    ):
+        self.window = config.login_window_seconds
+        self.limits = {
+            "ip": config.login_max_attempts_per_ip,
+            "username": config.login_max_attempts_per_user,
+        }
+        self.state = state
+        self.metrics = metrics
+    
+    @staticmethod
+    def _username_key(username: str) -> str:
+        # Digest so that arbitrarily long usernames cost the store a fixed-size key
+        return hashlib.sha256(username.casefold().encode()).hexdigest()
+    
+    def _retry_after(self, previous: int, current: int, elapsed: float, limit: int) -> int:
+        """Seconds until the sliding count leaves room for one more attempt."""
+        room = limit - 1
+        if current <= room:
+            # The previous window's share decays within this window
+            wait = self.window * (1 - (room - current) / previous) - elapsed
+        else:
+            # This window must roll over and then decay in turn
+            wait = self.window - elapsed + self.window * (1 - room / current)
+        return max(1, math.ceil(wait))
+    
+    async def _count(self, scope: str, value: str) -> Optional[int]:
+        """Count an attempt under one key; return the Retry-After when it is over the limit."""
+        limit = self.limits[scope]
+        if limit <= 0:
+            return None
+        
+        index, elapsed = divmod(time.time(), self.window)
+        key = f"login:{scope}:{value}"
+        # Kept for two windows so that it can serve as the previous one
+        current = await self.state.incr(f"{key}:{int(index)}", ttl=2 * self.window)
+        previous = await self.state.get(f"{key}:{int(index) - 1}") or 0
+        if previous * (1 - elapsed / self.window) + current <= limit:
+            return None
+        return self._retry_after(previous, current, elapsed, limit)
+    
+    async def check(self, username: str, client_ip: Optional[str]):
+        """Count a login attempt, raising 429 with Retry-After once a limit is reached.
+        
+        Called before the user is looked up or a password hashed, so rejected
+        attempts cost neither a query nor a KDF run.
+        """
+        keys = [("username", self._username_key(username))]
+        if client_ip:
+            # A flood from one address is stopped before it counts against the username
+            keys.insert(0, ("ip", client_ip))
+        
+        for scope, value in keys:
+            try:
+                retry_after = await self._count(scope, value)
+            except StateUnavailable as e:
+                # Fail open: an unreachable store must not lock every user out
+                logger.warning("Login limiter unavailable: %s", e)
+                return
+            if retry_after is not None:
+                self.metrics.login_attempts.labels(f"limited_{scope}").inc()
+                raise HTTPException(
+                    status_code=429,
+                    detail="Too many login attempts",
+                    headers={"Retry-After": str(retry_after)}
+                )
+    
+    async def record_success(self, username: str, client_ip: Optional[str]):
+        """Clear the username's counters so its owner is not locked out by earlier typos,
+        and take the attempt back from the IP's count so that only failures add up there.
+        """
+        self.metrics.login_attempts.labels("success").inc()
+        index = int(time.time() // self.window)
+        key = f"login:username:{self._username_key(username)}"
+        try:
+            await self.state.delete(f"{key}:{index}")
+            await self.state.delete(f"{key}:{index - 1}")
+            if client_ip and self.limits["ip"] > 0:
+                ip_key = f"login:ip:{client_ip}:{index}"
+                # Nothing to take back when the attempt was counted in the window that just ended
+                if await self.state.incr(ip_key, -1, ttl=2 * self.window) < 0:
+                    await self.state.incr(ip_key, 1, ttl=2 * self.window)
+        except StateUnavailable as e:
+            logger.warning("Login limiter unavailable: %s", e)
+    
+    def record_failure(self):
+        self.metrics.login_attempts.labels("failure").inc()
@@ -1,6 +1,8 @@
 """Auth module models."""
 
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
 
 
 class LoginRequest(BaseModel):
@@ -18,3 +20,25 @@ class TokenResponse(BaseModel):
 class User(BaseModel):
     """User model."""
     username: str
+
+
+class ApiKeyCreate(BaseModel):
+    """Request model for creating an API key."""
+    name: str = Field(..., min_length=1)
+    # Never expires when omitted
+    expires_in_days: Optional[int] = Field(None, ge=1)
+
+
+class ApiKey(BaseModel):
+    """API key metadata; the key itself is only returned on creation."""
+    id: str
+    name: str
+    prefix: str
+    created_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    revoked_at: Optional[datetime] = None
+
+
+class ApiKeyCreated(ApiKey):
+    """Newly created API key, including the secret to send as X-API-Key."""
+    key: str
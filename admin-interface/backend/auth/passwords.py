@@ -0,0 +1,61 @@
+"""Password hashing that keeps the KDF off the event loop."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Optional, Tuple, TypeVar
+
+from antidote import injectable, inject
+
+from config import AuthConfig
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+T = TypeVar("T")
+
+
+@injectable
+class PasswordHasher:
+    """Hashes and verifies passwords in a bounded worker pool."""
+    
+    def __init__(self, config: AuthConfig = inject[AuthConfig]):
+        self.config = config
+        # bcrypt releases the GIL, so threads hash in parallel
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.password_hash_workers,
+            thread_name_prefix="password-hash",
+        )
+        self._slots = asyncio.Semaphore(config.password_hash_concurrency)
+    
+    @cached_property
+    def _context(self) -> "CryptContext":
+        """Built on first use, so passlib and bcrypt load with the first login rather than at startup."""
+        from passlib.context import CryptContext
+        
+        # Plain SHA-256 digests are still accepted, but flagged for rehashing
+        return CryptContext(
+            schemes=["bcrypt", "hex_sha256"],
+            deprecated=["hex_sha256"],
+            bcrypt__rounds=self.config.password_hash_rounds,
+        )
+    
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        """Run a blocking KDF call in the pool, waiting for a free slot."""
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def hash(self, password: str) -> str:
+        """Hash a password with the current scheme and work factor."""
+        return await self._run(self._context.hash, password)
+    
+    async def verify_and_update(
+        self, password: str, password_hash: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password and return a replacement hash if it is outdated."""
+        return await self._run(self._context.verify_and_update, password, password_hash)
+    
+    async def dummy_verify(self) -> None:
+        """Spend the time of a real verification, for unknown users."""
+        await self._run(self._context.dummy_verify)
@@ -1,12 +1,18 @@
 # AUTOGENERATED FROM:
 #     'admin-interface/backend/auth/queries/authenticate_user.edgeql'
+#     'admin-interface/backend/auth/queries/create_api_key.edgeql'
 #     'admin-interface/backend/auth/queries/create_user.edgeql'
+#     'admin-interface/backend/auth/queries/get_api_key_by_prefix.edgeql'
+#     'admin-interface/backend/auth/queries/list_api_keys.edgeql'
+#     'admin-interface/backend/auth/queries/revoke_api_key.edgeql'
+#     'admin-interface/backend/auth/queries/update_password_hash.edgeql'
 # WITH:
 #     $ gel-py --dir admin-interface/backend/auth/queries --file admin-interface/backend/auth/queries.py
 
 
 from __future__ import annotations
 import dataclasses
+import datetime
 import gel
 import uuid
 
@@ -31,6 +37,17 @@ class NoPydanticValidation:
 class AuthenticateUserResult(NoPydanticValidation):
     id: uuid.UUID
     username: str
+    password_hash: str
+
+
+@dataclasses.dataclass
+class CreateApiKeyResult(NoPydanticValidation):
+    id: uuid.UUID
+    name: str
+    prefix: str
+    created_at: datetime.datetime | None
+    expires_at: datetime.datetime | None
+    revoked_at: datetime.datetime | None
 
 
 @dataclasses.dataclass
@@ -38,21 +55,76 @@ class CreateUserResult(NoPydanticValidation):
     id: uuid.UUID
 
 
+@dataclasses.dataclass
+class GetApiKeyByPrefixResult(NoPydanticValidation):
+    id: uuid.UUID
+    key_hash: str
+    expires_at: datetime.datetime | None
+    user: GetApiKeyByPrefixResultUser
+
+
+@dataclasses.dataclass
+class GetApiKeyByPrefixResultUser(NoPydanticValidation):
+    id: uuid.UUID
+    username: str
+
+
+@dataclasses.dataclass
+class RevokeApiKeyResult(NoPydanticValidation):
+    id: uuid.UUID
+    prefix: str
+
+
 async def authenticate_user(
     executor: gel.AsyncIOExecutor,
     *,
     username: str,
-    password_hash: str,
 ) -> AuthenticateUserResult | None:
     return await executor.query_single(
         """\
         SELECT User {
-            username
+            username,
+            password_hash
         }
-        FILTER .username = <str>$username AND .password_hash = <str>$password_hash\
+        FILTER .username = <str>$username\
         """,
         username=username,
-        password_hash=password_hash,
+    )
+
+
+async def create_api_key(
+    executor: gel.AsyncIOExecutor,
+    *,
+    name: str,
+    prefix: str,
+    key_hash: str,
+    expires_at: datetime.datetime | None = None,
+    username: str,
+) -> CreateApiKeyResult:
+    return await executor.query_single(
+        """\
+        SELECT (
+            INSERT ApiKey {
+                name := <str>$name,
+                prefix := <str>$prefix,
+                key_hash := <str>$key_hash,
+                expires_at := <optional datetime>$expires_at,
+                user := assert_exists((SELECT User FILTER .username = <str>$username))
+            }
+        ) {
+            id,
+            name,
+            prefix,
+            created_at,
+            expires_at,
+            revoked_at
+        }\
+        """,
+        name=name,
+        prefix=prefix,
+        key_hash=key_hash,
+        expires_at=expires_at,
+        username=username,
     )
 
 
@@ -72,3 +144,82 @@ async def create_user(
         username=username,
         password_hash=password_hash,
     )
+
+
+async def get_api_key_by_prefix(
+    executor: gel.AsyncIOExecutor,
+    *,
+    prefix: str,
+) -> GetApiKeyByPrefixResult | None:
+    return await executor.query_single(
+        """\
+        SELECT ApiKey {
+            key_hash,
+            expires_at,
+            user: {
+                username
+            }
+        }
+        FILTER .prefix = <str>$prefix AND NOT EXISTS .revoked_at\
+        """,
+        prefix=prefix,
+    )
+
+
+async def list_api_keys(
+    executor: gel.AsyncIOExecutor,
+) -> list[CreateApiKeyResult]:
+    return await executor.query(
+        """\
+        SELECT ApiKey {
+            id,
+            name,
+            prefix,
+            created_at,
+            expires_at,
+            revoked_at
+        }
+        ORDER BY .created_at DESC\
+        """,
+    )
+
+
+async def revoke_api_key(
+    executor: gel.AsyncIOExecutor,
+    *,
+    key_id: uuid.UUID,
+) -> RevokeApiKeyResult | None:
+    return await executor.query_single(
+        """\
+        SELECT (
+            UPDATE ApiKey
+            FILTER .id = <uuid>$key_id AND NOT EXISTS .revoked_at
+            SET {
+                revoked_at := datetime_of_statement()
+            }
+        ) {
+            id,
+            prefix
+        }\
+        """,
+        key_id=key_id,
+    )
+
+
+async def update_password_hash(
+    executor: gel.AsyncIOExecutor,
+    *,
+    user_id: uuid.UUID,
+    password_hash: str,
+) -> CreateUserResult | None:
+    return await executor.query_single(
+        """\
+        UPDATE User
+        FILTER .id = <uuid>$user_id
+        SET {
+            password_hash := <str>$password_hash
+        }\
+        """,
+        user_id=user_id,
+        password_hash=password_hash,
+    )
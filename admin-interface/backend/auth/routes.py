@@ -1,34 +1,83 @@
 """Auth routes."""
 
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import HTTPAuthorizationCredentials
-from antidote import inject
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials
 
-from auth.models import LoginRequest, TokenResponse, User
+from auth.api_keys import ApiKeyService
+from auth.limiter import LoginLimiter
+from auth.models import ApiKey, ApiKeyCreate, ApiKeyCreated, LoginRequest, TokenResponse, User
 from auth.service import AuthService, security
+from dependencies import provide
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
     login_data: LoginRequest,
-    auth_service: AuthService = inject[AuthService]
+    request: Request,
+    auth_service: AuthService = provide(AuthService),
+    limiter: LoginLimiter = provide(LoginLimiter)
 ):
     """Authenticate user and return JWT token."""
+    # Rejects brute-force attempts with 429 before any query or hashing
+    client_ip = request.client.host if request.client else None
+    await limiter.check(login_data.username, client_ip)
+    
     user = await auth_service.authenticate_user_login(login_data.username, login_data.password)
     
     if not user:
+        limiter.record_failure()
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
+    await limiter.record_success(login_data.username, client_ip)
     access_token = auth_service.create_access_token(data={"sub": login_data.username})
     return TokenResponse(access_token=access_token)
 
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    auth_service: AuthService = inject[AuthService]
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    api_key: Optional[str] = Depends(api_key_header),
+    auth_service: AuthService = provide(AuthService),
+    api_key_service: ApiKeyService = provide(ApiKeyService)
 ) -> User:
-    """Get current authenticated user from JWT token."""
-    username = auth_service.verify_token(credentials)
-    return User(username=username)
+    """Get current authenticated user from an X-API-Key header or a JWT token."""
+    if api_key:
+        return await api_key_service.authenticate(api_key)
+    if credentials is None:
+        raise HTTPException(status_code=403, detail="Not authenticated")
+    return auth_service.get_token_user(credentials)
+
+
+@router.post("/api-keys", response_model=ApiKeyCreated)
+async def create_api_key(
+    key_data: ApiKeyCreate,
+    current_user: User = Depends(get_current_user),
+    api_key_service: ApiKeyService = provide(ApiKeyService)
+):
+    """Create an API key acting as the current user; the key is only shown in this response."""
+    return await api_key_service.create(key_data.name, current_user.username, key_data.expires_in_days)
+
+
+@router.get("/api-keys", response_model=List[ApiKey])
+async def list_api_keys(
+    current_user: User = Depends(get_current_user),
+    api_key_service: ApiKeyService = provide(ApiKeyService)
+):
+    """List API keys, newest first."""
+    return await api_key_service.list_keys()
+
+
+@router.delete("/api-keys/{key_id}")
+async def revoke_api_key(
+    key_id: str,
+    current_user: User = Depends(get_current_user),
+    api_key_service: ApiKeyService = provide(ApiKeyService)
+):
+    """Revoke an API key."""
+    if not await api_key_service.revoke(key_id):
+        raise HTTPException(status_code=404, detail="API key not found")
+    return {"message": "API key revoked"}
@@ -1,23 +1,26 @@
 """Auth service with authentication and JWT management."""
 
 import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
 from antidote import injectable, inject
 
+from cache import TTLCache
 from config import AuthConfig
 from database import DatabaseService
 from auth.models import User
+from auth.passwords import PasswordHasher
 
 # Import generated queries
-from auth.queries import authenticate_user
+from auth.queries import authenticate_user, update_password_hash
 
 
-security = HTTPBearer()
+# Optional because X-API-Key is accepted instead; get_current_user rejects requests with neither
+security = HTTPBearer(auto_error=False)
 
 
 @injectable
@@ -27,13 +30,20 @@ class AuthService:
     def __init__(
         self, 
         config: AuthConfig = inject[AuthConfig],
-        db: DatabaseService = inject[DatabaseService]
+        db: DatabaseService = inject[DatabaseService],
+        hasher: PasswordHasher = inject[PasswordHasher]
     ):
         self.config = config
         self.db = db
+        self.hasher = hasher
+        # Verified tokens keyed by their SHA-256 digest
+        self._token_cache: TTLCache[User] = TTLCache(config.token_cache_size)
     
     def create_access_token(self, data: dict) -> str:
         """Create JWT access token."""
+        # jose pulls in its crypto backends; only load it once a token is needed
+        from jose import jwt
+        
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(hours=self.config.access_token_expire_hours)
         to_encode.update({"exp": expire})
@@ -47,32 +57,59 @@ class AuthService:
     
     def verify_token(self, credentials: HTTPAuthorizationCredentials) -> str:
         """Verify JWT token and return username."""
+        return self.get_token_user(credentials).username
+    
+    def get_token_user(self, credentials: HTTPAuthorizationCredentials) -> User:
+        """Resolve the user of a JWT token, reusing earlier verifications."""
+        key = hashlib.sha256(credentials.credentials.encode()).digest()
+        user = self._token_cache.get(key)
+        if user is not None:
+            return user
+        
+        from jose import jwt, JWTError
+        
         try:
             payload = jwt.decode(
                 credentials.credentials, 
                 self.config.secret_key, 
                 algorithms=[self.config.algorithm]
             )
-            username: str = payload.get("sub")
-            if username is None:
-                raise HTTPException(status_code=401, detail="Invalid token")
-            return username
         except JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
+        
+        username: str = payload.get("sub")
+        if username is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        
+        # Never keep a token past its own expiry
+        expires_at = time.time() + self.config.token_cache_ttl_seconds
+        if payload.get("exp") is not None:
+            expires_at = min(expires_at, payload["exp"])
+        
+        user = User(username=username)
+        self._token_cache.set(key, user, expires_at)
+        return user
+    
+    def token_cache_stats(self) -> dict:
+        """Return token cache size and hit/miss counters."""
+        return self._token_cache.stats()
     
     async def authenticate_user_login(self, username: str, password: str) -> Optional[User]:
         """Authenticate user with username and password."""
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-        
         client = await self.db.get_client()
-        users = await authenticate_user(
-            client,
-            username=username,
-            password_hash=password_hash
-        )
+        user = await authenticate_user(client, username=username)
+        
+        if user is None:
+            # Take as long as a wrong password so usernames cannot be probed
+            await self.hasher.dummy_verify()
+            return None
+        
+        valid, new_hash = await self.hasher.verify_and_update(password, user.password_hash)
+        if not valid:
+            return None
+        
+        # Upgrade legacy or weaker hashes now that we know the password
+        if new_hash is not None:
+            await update_password_hash(client, user_id=user.id, password_hash=new_hash)
         
-        if users:
-            # authenticate_user returns a list, get the first user
-            user = users[0]
-            return User(username=user.username)
-        return None
+        return User(username=user.username)
@@ -0,0 +1,279 @@
+"""Latency and throughput of the admin API's hot endpoints.
+
+Builds the app with `main.create_app()` in a cloned Antidote world and drives
+it in-process through httpx, so what is measured is routing, auth,
+validation, services and serialization. By default `DatabaseService` is
+replaced with the in-memory `FakeGel`; `--backend gel` uses the database from
+the environment instead (it creates and deletes its own sources).
+
+    cd admin-interface/backend
+    python -m benchmarks.bench_api --requests 500 --concurrency 20
+    python -m benchmarks.bench_api --output before.json
+    python -m benchmarks.bench_api --baseline before.json   # exit 1 on a p95 regression
+
+Login cost is dominated by bcrypt; set PASSWORD_HASH_ROUNDS to match production.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+# The login scenario measures hashing, not the brute-force limiter
+os.environ.setdefault("LOGIN_MAX_ATTEMPTS_PER_USER", "0")
+os.environ.setdefault("LOGIN_MAX_ATTEMPTS_PER_IP", "0")
+
+import httpx
+from antidote import world
+
+from config import AuthConfig
+from database import DatabaseService
+from main import create_app
+from benchmarks.fakedb import FakeDatabaseService
+
+ADMIN = {"username": "admin", "password": "admin123"}
+
+
+@dataclass
+class Scenario:
+    """One endpoint under load; `prepare` returns a sender for request i."""
+    name: str
+    prepare: Callable[["Harness", int], Awaitable[Callable[[int], Awaitable[httpx.Response]]]]
+
+
+class Harness:
+    """An authenticated client against the app, tracking sources it creates."""
+    
+    def __init__(self, client: httpx.AsyncClient, seed: int):
+        self.client = client
+        self.seed = seed
+        self.headers: Dict[str, str] = {}
+        self.created: List[str] = []
+    
+    async def login(self):
+        response = await self.client.post("/auth/login", json=ADMIN)
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    async def create_source(self, n: int) -> httpx.Response:
+        response = await self.client.post(
+            "/sources/",
+            json={"name": f"Bench channel {n}", "type": "youtube", "url": f"https://www.youtube.com/@bench{n}"},
+            headers=self.headers,
+        )
+        if response.status_code == 200:
+            self.created.append(response.json()["id"])
+        return response
+    
+    async def cleanup(self):
+        """Delete whatever the run left behind."""
+        for source_id in self.created:
+            await self.client.delete(f"/sources/{source_id}", headers=self.headers)
+        self.created.clear()
+
+
+async def prepare_login(harness: Harness, count: int):
+    async def send(i: int) -> httpx.Response:
+        return await harness.client.post("/auth/login", json=ADMIN)
+    return send
+
+
+async def prepare_list(harness: Harness, count: int):
+    # Fill at least one full page
+    for n in range(harness.seed):
+        await harness.create_source(-n - 1)
+    
+    async def send(i: int) -> httpx.Response:
+        return await harness.client.get("/sources/", params={"limit": 50}, headers=harness.headers)
+    return send
+
+
+async def prepare_list_api_key(harness: Harness, count: int):
+    # The same listing as a machine client: no JWT decode, the key check is a cache hit
+    await prepare_list(harness, count)
+    response = await harness.client.post("/auth/api-keys", json={"name": "bench"}, headers=harness.headers)
+    response.raise_for_status()
+    headers = {"X-API-Key": response.json()["key"]}
+    
+    async def send(i: int) -> httpx.Response:
+        return await harness.client.get("/sources/", params={"limit": 50}, headers=headers)
+    return send
+
+
+async def prepare_create(harness: Harness, count: int):
+    offset = len(harness.created)
+    
+    async def send(i: int) -> httpx.Response:
+        return await harness.create_source(offset + i)
+    return send
+
+
+async def prepare_delete(harness: Harness, count: int):
+    victims = []
+    for n in range(count):
+        response = await harness.create_source(1_000_000 + n)
+        victims.append(response.json()["id"])
+    
+    async def send(i: int) -> httpx.Response:
+        response = await harness.client.delete(f"/sources/{victims[i]}", headers=harness.headers)
+        if response.status_code == 200:
+            harness.created.remove(victims[i])
+        return response
+    return send
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("login", prepare_login),
+        Scenario("list", prepare_list),
+        Scenario("list_api_key", prepare_list_api_key),
+        Scenario("create", prepare_create),
+        Scenario("delete", prepare_delete),
+    ]
+}
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, concurrency: int) -> dict:
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "mean": ms(sum(ordered) / len(ordered)),
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1]),
+        },
+    }
+
+
+async def drive(
+    send: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    warmup: int,
+    concurrency: int
+) -> dict:
+    """Issue `requests` calls from `concurrency` concurrent clients after a warm-up."""
+    for i in range(warmup):
+        await send(i)
+    
+    counter = itertools.count(warmup)
+    total = warmup + requests
+    latencies: List[float] = []
+    errors = 0
+    
+    async def client():
+        nonlocal errors
+        while (i := next(counter)) < total:
+            start = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start, concurrency)
+
+
+async def run(args) -> dict:
+    with world.test.clone() as overrides:
+        if args.backend == "memory":
+            overrides[DatabaseService] = FakeDatabaseService(latency=args.db_latency_ms / 1000)
+        
+        app = create_app()
+        db: DatabaseService = world[DatabaseService]
+        await db.startup()
+        # Creates the default admin user
+        await db.initialize()
+        
+        results = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            harness = Harness(client, args.seed)
+            await harness.login()
+            try:
+                for name in args.scenarios:
+                    send = await SCENARIOS[name].prepare(harness, args.warmup + args.requests)
+                    results[name] = await drive(send, args.requests, args.warmup, args.concurrency)
+            finally:
+                await harness.cleanup()
+        await db.close()
+        
+        return {
+            "backend": args.backend,
+            "db_latency_ms": args.db_latency_ms if args.backend == "memory" else None,
+            "password_hash_rounds": world[AuthConfig].password_hash_rounds,
+            "scenarios": results,
+        }
+
+
+def regressions(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Scenarios whose p95 grew by more than `tolerance` over the baseline."""
+    found = []
+    for name, result in report["scenarios"].items():
+        before: Optional[dict] = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        old, new = before["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        if new > old * (1 + tolerance):
+            found.append(f"{name}: p95 {old}ms -> {new}ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["memory", "gel"], default="memory")
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS),
+                        help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=200, help="sources created before the list scenario")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0,
+                        help="simulated round trip per query for the memory backend")
+    parser.add_argument("--output", help="also write the report to this file")
+    parser.add_argument("--baseline", help="report from an earlier run to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth over the baseline")
+    args = parser.parse_args()
+    
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.tolerance)
+        for line in found:
+            print(f"regression: {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
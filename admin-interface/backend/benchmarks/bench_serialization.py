@@ -0,0 +1,117 @@
+"""Per-row CPU cost of turning a sources page into response bytes.
+
+Compares the previous read path (query result -> pydantic Source ->
+response_model validation -> json.dumps) with the current one (query result
+-> dict -> orjson). No database or server is involved.
+
+    cd admin-interface/backend
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from responses import APIResponse
+from sources.models import Source, SourcePage
+from sources.queries import CreateSourceResult
+from sources.service import _to_source_row
+
+
+def make_rows(count: int) -> List[CreateSourceResult]:
+    """Rows shaped like get_sources_page results."""
+    now = datetime.now(timezone.utc)
+    return [
+        CreateSourceResult(
+            id=uuid.uuid4(),
+            name=f"Channel {i}",
+            type="youtube",
+            url=f"https://www.youtube.com/@channel{i}",
+            is_active=i % 7 != 0,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now - timedelta(minutes=i // 2),
+            content_count=i * 3,
+            last_published_at=now - timedelta(hours=i),
+            last_crawl_at=now - timedelta(minutes=i % 60),
+            last_error=None,
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_to_source(source: CreateSourceResult) -> Source:
+    """The conversion used before the fast path, kept here for comparison."""
+    return Source(
+        id=str(source.id),
+        name=source.name,
+        type=source.type,
+        url=source.url,
+        is_active=source.is_active or False,
+        created_at=source.created_at or datetime.now(),
+        updated_at=source.updated_at or datetime.now(),
+        content_count=source.content_count or 0,
+        last_published_at=source.last_published_at,
+        last_crawl_at=source.last_crawl_at,
+        last_error=source.last_error
+    )
+
+
+RESPONSE_FIELD = create_model_field("Response_get_sources", SourcePage, mode="serialization")
+
+
+def before(rows: List[CreateSourceResult]) -> bytes:
+    page = SourcePage(items=[legacy_to_source(row) for row in rows], total=len(rows), next_cursor=None)
+    # What FastAPI does with a returned model when the route declares response_model
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=page))
+    return JSONResponse(content).body
+
+
+def after(rows: List[CreateSourceResult]) -> bytes:
+    page = {"items": [_to_source_row(row) for row in rows], "total": len(rows), "next_cursor": None}
+    return APIResponse(page).body
+
+
+def measure(path: Callable[[List[CreateSourceResult]], bytes], rows, repeat: int) -> dict:
+    path(rows)  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        path(rows)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        "best_ms": round(best * 1000, 2),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "us_per_row": round(best / len(rows) * 1e6, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    # Both paths must produce the same document
+    assert json.loads(before(rows)) == json.loads(after(rows))
+
+    results = {"rows": args.rows, "before": measure(before, rows, args.repeat), "after": measure(after, rows, args.repeat)}
+    results["speedup"] = round(results["before"]["best_ms"] / results["after"]["best_ms"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
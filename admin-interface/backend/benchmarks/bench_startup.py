@@ -0,0 +1,142 @@
+"""Cold start: import time of `main` and time until a new process answers.
+
+Each measurement runs in a fresh interpreter. `import main` is timed with
+`python -X importtime`; "first response" is the wall time from spawning a
+process to it serving GET /health through the app factory and lifespan,
+with the in-memory FakeGel standing in for the database.
+
+    cd admin-interface/backend
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --import-budget-ms 900   # exit 1 when over
+
+The report also lists modules that must stay out of the import path until
+they are first used.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Loaded on first login / first query instead of at import
+LAZY_MODULES = ["jose", "passlib", "edgedb", "dotenv"]
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("SECRET_KEY", "benchmark")
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    return env
+
+
+def import_profile() -> Dict[str, int]:
+    """Cumulative import time in microseconds per module, from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def import_ms() -> float:
+    """Wall time of `import main` in a fresh interpreter."""
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def first_response_ms() -> float:
+    """Wall time from spawning a process to its first answered request."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--serve-once"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, check=True,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def serve_once():
+    """Child process: build the app, run its lifespan and answer one request."""
+    import asyncio
+    import uuid
+    
+    import httpx
+    from antidote import world
+    
+    from auth.queries import AuthenticateUserResult
+    from database import DatabaseService
+    from main import create_app
+    from benchmarks.fakedb import FakeDatabaseService
+    
+    async def run():
+        with world.test.clone() as overrides:
+            db = FakeDatabaseService()
+            # A replica joining a database that already has its admin user
+            db.fake.users["admin"] = AuthenticateUserResult(id=uuid.uuid4(), username="admin", password_hash="")
+            overrides[DatabaseService] = db
+            app = create_app()
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                    response = await client.get("/health")
+                    response.raise_for_status()
+    
+    asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list")
+    parser.add_argument("--import-budget-ms", type=float, help="fail when the median import time exceeds this")
+    parser.add_argument("--serve-once", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.serve_once:
+        serve_once()
+        return
+    
+    profile = import_profile()
+    imports: List[float] = [import_ms() for _ in range(args.repeat)]
+    responses: List[float] = [first_response_ms() for _ in range(args.repeat)]
+    # Only packages imported directly or by our own modules are worth listing
+    top_level = {name: us for name, us in profile.items() if "." not in name}
+    report = {
+        "import_main_ms": round(statistics.median(imports), 1),
+        "first_response_ms": round(statistics.median(responses), 1),
+        "slowest_imports_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]
+        },
+        "eagerly_imported": [name for name in LAZY_MODULES if name in profile],
+    }
+    print(json.dumps(report, indent=2))
+    
+    failures = []
+    if report["eagerly_imported"]:
+        failures.append(f"imported by `import main`: {', '.join(report['eagerly_imported'])}")
+    if args.import_budget_ms is not None and report["import_main_ms"] > args.import_budget_ms:
+        failures.append(f"import main took {report['import_main_ms']}ms, budget {args.import_budget_ms}ms")
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
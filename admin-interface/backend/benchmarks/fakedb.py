@@ -0,0 +1,463 @@
+"""In-memory stand-in for Gel, enough to serve the auth and sources endpoints and ingestion.
+
+Queries are recognised by the name of the `.edgeql` file whose text the
+generated function sends (see `database.query_name`), so the fake follows the
+queries as they change and fails loudly on ones it does not implement.
+"""
+
+import asyncio
+import dataclasses
+import itertools
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import gel
+
+from database import DatabaseService, query_name
+from auth.queries import (
+    AuthenticateUserResult,
+    CreateApiKeyResult,
+    CreateUserResult,
+    GetApiKeyByPrefixResult,
+    GetApiKeyByPrefixResultUser,
+    RevokeApiKeyResult,
+)
+from ingestion.queries import GetCrawlSourcesResult, RecordCrawlErrorResult
+from sources.queries import (
+    BulkCreateSourcesResult,
+    CreateSourceResult,
+    DeleteSourceResult,
+    GetSourcesStatsResult,
+    GetSourceChangesResult,
+    GetSourcesStatsResultByTypeItem,
+    GetSourcesVersionResult,
+    PruneSourceChangesResult,
+)
+
+
+class FakeGel:
+    """Executor holding users, sources, content and the change log in dicts."""
+    
+    def __init__(self, latency: float = 0.0):
+        # Simulated round trip per query, in seconds
+        self.latency = latency
+        self.users: Dict[str, AuthenticateUserResult] = {}
+        # Unrevoked API keys by prefix, with the hash and username of each
+        self.api_keys: Dict[str, GetApiKeyByPrefixResult] = {}
+        # Every key ever created, by id, as listed
+        self.api_key_rows: Dict[uuid.UUID, CreateApiKeyResult] = {}
+        self.sources: Dict[uuid.UUID, CreateSourceResult] = {}
+        # Taken canonical keys, standing in for the exclusive constraint
+        self.canonical_keys: Dict[str, uuid.UUID] = {}
+        self._source_keys: Dict[uuid.UUID, str] = {}
+        # Ingestion state per source, and stored content by (source id, external id)
+        self.crawl_state: Dict[uuid.UUID, GetCrawlSourcesResult] = {}
+        self.contents: Dict[Tuple[uuid.UUID, str], Dict[str, Any]] = {}
+        self.version = GetSourcesVersionResult(seq=None, changes=0, changed_at=None, stats_updated_at=None)
+        # SourceChange log in sequence order; sources are joined in when it is read
+        self.changes: List[GetSourceChangesResult] = []
+        # Highest pruned sequence number
+        self.changes_horizon: Optional[int] = None
+        self.queries: Dict[str, int] = {}
+        self._seq = itertools.count(1)
+        self._handlers: Dict[str, Callable[..., Any]] = {
+            "authenticate_user": self._authenticate_user,
+            "create_user": self._create_user,
+            "update_password_hash": self._update_password_hash,
+            "create_api_key": self._create_api_key,
+            "get_api_key_by_prefix": self._get_api_key_by_prefix,
+            "list_api_keys": self._list_api_keys,
+            "revoke_api_key": self._revoke_api_key,
+            "create_source": self._create_source,
+            "bulk_create_sources": self._bulk_create_sources,
+            "delete_source": self._delete_source,
+            "update_source": self._update_source,
+            "update_sources": self._update_sources,
+            "delete_sources": self._delete_sources,
+            "get_source_by_id": self._get_source_by_id,
+            "get_sources_page": self._get_sources_page,
+            "count_sources": self._count_sources,
+            "get_sources_version": self._get_sources_version,
+            "get_sources_stats": self._get_sources_stats,
+            "get_source_changes": self._get_source_changes,
+            "get_source_changes_horizon": self._get_source_changes_horizon,
+            "prune_source_changes": self._prune_source_changes,
+            "get_crawl_sources": self._get_crawl_sources,
+            "set_platform_id": self._set_platform_id,
+            "record_duplicate_source": self._record_duplicate_source,
+            "upsert_contents": self._upsert_contents,
+            "update_crawl_state": self._update_crawl_state,
+            "record_crawl_error": self._record_crawl_error,
+        }
+    
+    async def _run(self, query: str, kwargs: Dict[str, Any]) -> Any:
+        name = query_name(query)
+        handler = self._handlers.get(name)
+        if handler is None:
+            raise NotImplementedError(f"FakeGel does not implement query {name!r}: {query[:80]!r}")
+        self.queries[name] = self.queries.get(name, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return handler(**kwargs)
+    
+    async def query(self, query: str, **kwargs) -> Any:
+        return await self._run(query, kwargs)
+    
+    async def query_single(self, query: str, **kwargs) -> Any:
+        return await self._run(query, kwargs)
+    
+    async def query_required_single(self, query: str, **kwargs) -> Any:
+        return await self._run(query, kwargs)
+    
+    async def execute(self, query: str, **kwargs) -> None:
+        await self._run(query, kwargs)
+    
+    async def transaction(self) -> AsyncIterator["FakeGel"]:
+        """Single attempt whose statements run on this executor; nothing is rolled back."""
+        yield _FakeTransaction(self)
+    
+    async def ensure_connected(self):
+        return self
+    
+    async def aclose(self):
+        pass
+    
+    def _log_change(self, kind: str, source_id: uuid.UUID):
+        change = GetSourceChangesResult(
+            seq=next(self._seq), kind=kind, source_id=source_id,
+            changed_at=datetime.now(timezone.utc), settled=False, source=None,
+        )
+        self.changes.append(change)
+        self.version = dataclasses.replace(
+            self.version, seq=change.seq, changes=len(self.changes), changed_at=change.changed_at
+        )
+    
+    # auth
+    
+    def _authenticate_user(self, username: str) -> Optional[AuthenticateUserResult]:
+        return self.users.get(username)
+    
+    def _create_user(self, username: str, password_hash: str) -> Optional[CreateUserResult]:
+        if username in self.users:
+            return None
+        user = AuthenticateUserResult(id=uuid.uuid4(), username=username, password_hash=password_hash)
+        self.users[username] = user
+        return CreateUserResult(id=user.id)
+    
+    def _update_password_hash(self, user_id: uuid.UUID, password_hash: str) -> Optional[CreateUserResult]:
+        for username, user in self.users.items():
+            if user.id == user_id:
+                self.users[username] = AuthenticateUserResult(
+                    id=user.id, username=username, password_hash=password_hash
+                )
+                return CreateUserResult(id=user.id)
+        return None
+    
+    def _create_api_key(
+        self, name: str, prefix: str, key_hash: str, expires_at: Optional[datetime], username: str
+    ) -> CreateApiKeyResult:
+        user = self.users[username]
+        key_id = uuid.uuid4()
+        self.api_keys[prefix] = GetApiKeyByPrefixResult(
+            id=key_id, key_hash=key_hash, expires_at=expires_at,
+            user=GetApiKeyByPrefixResultUser(id=user.id, username=username),
+        )
+        row = CreateApiKeyResult(
+            id=key_id, name=name, prefix=prefix, created_at=datetime.now(timezone.utc),
+            expires_at=expires_at, revoked_at=None,
+        )
+        self.api_key_rows[key_id] = row
+        return dataclasses.replace(row)
+    
+    def _get_api_key_by_prefix(self, prefix: str) -> Optional[GetApiKeyByPrefixResult]:
+        return self.api_keys.get(prefix)
+    
+    def _list_api_keys(self) -> List[CreateApiKeyResult]:
+        return sorted(self.api_key_rows.values(), key=lambda key: key.created_at, reverse=True)
+    
+    def _revoke_api_key(self, key_id: Any) -> Optional[RevokeApiKeyResult]:
+        row = self.api_key_rows.get(self._uuid(key_id))
+        if row is None or row.revoked_at is not None:
+            return None
+        row.revoked_at = datetime.now(timezone.utc)
+        self.api_keys.pop(row.prefix, None)
+        return RevokeApiKeyResult(id=row.id, prefix=row.prefix)
+    
+    # sources
+    
+    def _create_source(self, name: str, type: str, url: str, canonical_key: str) -> Optional[CreateSourceResult]:
+        if canonical_key in self.canonical_keys:
+            return None
+        now = datetime.now(timezone.utc)
+        source = CreateSourceResult(
+            id=uuid.uuid4(), name=name, type=type, url=url,
+            is_active=True, created_at=now, updated_at=now,
+            content_count=0, last_published_at=None, last_crawl_at=None, last_error=None,
+        )
+        self.sources[source.id] = source
+        self.canonical_keys[canonical_key] = source.id
+        self._source_keys[source.id] = canonical_key
+        self._log_change("insert", source.id)
+        return source
+    
+    def _bulk_create_sources(self, sources: str) -> List[BulkCreateSourcesResult]:
+        created = []
+        for row, item in enumerate(json.loads(sources)):
+            source = self._create_source(**item)
+            if source is not None:
+                created.append(BulkCreateSourcesResult(**vars(source), row=row))
+        return created
+    
+    @staticmethod
+    def _uuid(value: Any) -> uuid.UUID:
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            raise gel.InvalidValueError(f"invalid input syntax for type std::uuid: {value!r}")
+    
+    def _delete_source(self, source_id: Any) -> Optional[DeleteSourceResult]:
+        source = self.sources.pop(self._uuid(source_id), None)
+        if source is None:
+            return None
+        self.canonical_keys.pop(self._source_keys.pop(source.id), None)
+        self._log_change("delete", source.id)
+        return DeleteSourceResult(id=source.id)
+    
+    def _get_source_by_id(self, source_id: Any) -> Optional[CreateSourceResult]:
+        return self.sources.get(self._uuid(source_id))
+    
+    def _update_source(self, source_id: Any, canonical_key: Optional[str] = None, **changes) -> Optional[CreateSourceResult]:
+        source = self.sources.get(self._uuid(source_id))
+        if source is None:
+            return None
+        if canonical_key is not None and self.canonical_keys.get(canonical_key, source.id) != source.id:
+            raise gel.ConstraintViolationError("Source.canonical_key violates exclusivity constraint")
+        updated = dataclasses.replace(source, **{k: v for k, v in changes.items() if v is not None})
+        if canonical_key is not None:
+            self.canonical_keys.pop(self._source_keys[source.id], None)
+            self.canonical_keys[canonical_key] = source.id
+            self._source_keys[source.id] = canonical_key
+        # updated_at and the change log only move when a value does
+        if updated != source:
+            updated.updated_at = datetime.now(timezone.utc)
+            self._log_change("update", source.id)
+        self.sources[source.id] = updated
+        return updated
+    
+    def _selected(
+        self,
+        ids: Optional[List[uuid.UUID]],
+        type: Optional[str],
+        is_active: Optional[bool],
+        created_before: Optional[datetime],
+    ) -> List[CreateSourceResult]:
+        return [
+            source for source in self._filtered(type, is_active)
+            if (ids is None or source.id in ids)
+            and (created_before is None or source.created_at < created_before)
+        ]
+    
+    def _update_sources(self, set_is_active: bool, **selection) -> List[CreateSourceResult]:
+        return [
+            self._update_source(source.id, is_active=set_is_active)
+            for source in self._selected(**selection)
+        ]
+    
+    def _delete_sources(self, **selection) -> List[DeleteSourceResult]:
+        return [self._delete_source(source.id) for source in self._selected(**selection)]
+    
+    def _filtered(self, type: Optional[str], is_active: Optional[bool]) -> List[CreateSourceResult]:
+        return [
+            source for source in self.sources.values()
+            if (type is None or source.type == type)
+            and (is_active is None or source.is_active == is_active)
+        ]
+    
+    def _get_sources_page(
+        self,
+        limit: int,
+        type: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        cursor_created_at: Optional[datetime] = None,
+        cursor_id: Optional[uuid.UUID] = None,
+    ) -> List[CreateSourceResult]:
+        rows = self._filtered(type, is_active)
+        if cursor_created_at is not None:
+            cursor = (cursor_created_at, cursor_id)
+            rows = [source for source in rows if (source.created_at, source.id) < cursor]
+        rows.sort(key=lambda source: (source.created_at, source.id), reverse=True)
+        return rows[:limit]
+    
+    def _count_sources(self, type: Optional[str] = None, is_active: Optional[bool] = None) -> int:
+        return len(self._filtered(type, is_active))
+    
+    def _get_sources_version(self) -> GetSourcesVersionResult:
+        return self.version
+    
+    def _get_source_changes(self, since: int, limit: int, commit_lag: timedelta) -> List[GetSourceChangesResult]:
+        settled_before = datetime.now(timezone.utc) - commit_lag
+        return [
+            dataclasses.replace(
+                change, settled=change.changed_at < settled_before, source=self.sources.get(change.source_id)
+            )
+            for change in self.changes if change.seq > since
+        ][:limit]
+    
+    def _get_source_changes_horizon(self) -> Optional[int]:
+        return self.changes_horizon
+    
+    def _prune_source_changes(self, retention: timedelta) -> PruneSourceChangesResult:
+        cutoff = datetime.now(timezone.utc) - retention
+        pruned = [change for change in self.changes if change.changed_at < cutoff]
+        self.changes = [change for change in self.changes if change.changed_at >= cutoff]
+        if pruned:
+            self.changes_horizon = max(self.changes_horizon or 0, pruned[-1].seq)
+        return PruneSourceChangesResult(pruned=len(pruned), through=self.changes_horizon if pruned else None)
+    
+    @staticmethod
+    def _summarise(sources: List[CreateSourceResult]) -> Dict[str, Any]:
+        return {
+            "total": len(sources),
+            "active": sum(bool(source.is_active) for source in sources),
+            "failing": sum(source.last_error is not None for source in sources),
+            "content_count": sum(source.content_count or 0 for source in sources),
+            "last_published_at": max(
+                (s.last_published_at for s in sources if s.last_published_at), default=None
+            ),
+            "last_crawl_at": max((s.last_crawl_at for s in sources if s.last_crawl_at), default=None),
+        }
+    
+    def _get_sources_stats(self) -> GetSourcesStatsResult:
+        sources = list(self.sources.values())
+        by_type: Dict[str, List[CreateSourceResult]] = {}
+        for source in sources:
+            by_type.setdefault(source.type, []).append(source)
+        return GetSourcesStatsResult(
+            **self._summarise(sources),
+            never_crawled=sum(source.last_crawl_at is None for source in sources),
+            by_type=[
+                GetSourcesStatsResultByTypeItem(type=type, **self._summarise(group))
+                for type, group in sorted(by_type.items())
+            ],
+        )
+    
+    # ingestion
+    
+    def _crawl_state(self, source_id: uuid.UUID) -> GetCrawlSourcesResult:
+        source = self.sources[source_id]
+        if source_id not in self.crawl_state:
+            self.crawl_state[source_id] = GetCrawlSourcesResult(
+                id=source_id, url=source.url, platform_id=None, crawl_etag=None, crawl_cursor=None
+            )
+        return self.crawl_state[source_id]
+    
+    def _update_stats(self, source_id: uuid.UUID, **stats) -> Optional[RecordCrawlErrorResult]:
+        source = self.sources.get(source_id)
+        if source is None:
+            return None
+        now = datetime.now(timezone.utc)
+        self.sources[source_id] = dataclasses.replace(source, **stats)
+        self.version = dataclasses.replace(self.version, stats_updated_at=now)
+        return RecordCrawlErrorResult(id=source_id)
+    
+    def _get_crawl_sources(self, type: str) -> List[GetCrawlSourcesResult]:
+        return [
+            dataclasses.replace(self._crawl_state(source.id))
+            for source in sorted(self._filtered(type, True), key=lambda source: source.id)
+        ]
+    
+    def _set_platform_id(self, source_id: uuid.UUID, platform_id: str) -> Optional[RecordCrawlErrorResult]:
+        owner = next(
+            (
+                state.id for state in self.crawl_state.values()
+                if state.platform_id == platform_id and self.sources[state.id].type == self.sources[source_id].type
+            ),
+            source_id,
+        )
+        if owner != source_id:
+            raise gel.ConstraintViolationError("Source.platform_id violates exclusivity constraint")
+        self._crawl_state(source_id).platform_id = platform_id
+        return RecordCrawlErrorResult(id=source_id)
+    
+    def _record_duplicate_source(self, type: str, platform_id: str, source_id: uuid.UUID) -> Optional[RecordCrawlErrorResult]:
+        original = next(
+            state.id for state in self.crawl_state.values()
+            if state.platform_id == platform_id and self.sources[state.id].type == type
+        )
+        self._update_source(source_id, is_active=False)
+        return self._update_stats(
+            source_id, last_crawl_at=datetime.now(timezone.utc), last_error=f"Same channel as source {original}"
+        )
+    
+    def _upsert_contents(self, source_id: uuid.UUID, items: str) -> int:
+        written = 0
+        for item in json.loads(items):
+            key = (source_id, item["external_id"])
+            stored = self.contents.get(key)
+            # Known items are rewritten only when their metadata changed
+            if stored is None or stored["content_hash"] != item["content_hash"]:
+                self.contents[key] = item
+                written += 1
+        published = [
+            datetime.fromisoformat(item["published_at"])
+            for (owner, _), item in self.contents.items() if owner == source_id
+        ]
+        self._update_stats(
+            source_id, content_count=len(published), last_published_at=max(published, default=None)
+        )
+        return written
+    
+    def _update_crawl_state(
+        self,
+        source_id: uuid.UUID,
+        platform_id: Optional[str] = None,
+        crawl_etag: Optional[str] = None,
+        crawl_cursor: Optional[datetime] = None,
+    ) -> Optional[RecordCrawlErrorResult]:
+        state = self._crawl_state(source_id)
+        state.platform_id = platform_id or state.platform_id
+        state.crawl_etag = crawl_etag or state.crawl_etag
+        state.crawl_cursor = crawl_cursor or state.crawl_cursor
+        return self._update_stats(source_id, last_crawl_at=datetime.now(timezone.utc), last_error=None)
+    
+    def _record_crawl_error(self, source_id: uuid.UUID, error: str) -> Optional[RecordCrawlErrorResult]:
+        return self._update_stats(source_id, last_crawl_at=datetime.now(timezone.utc), last_error=error)
+
+
+class _FakeTransaction:
+    """`async with tx:` block of FakeGel.transaction(), querying the fake itself."""
+    
+    def __init__(self, fake: FakeGel):
+        self.fake = fake
+    
+    async def __aenter__(self) -> FakeGel:
+        return self.fake
+    
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.fake, name)
+
+
+class FakeDatabaseService(DatabaseService):
+    """DatabaseService whose client is a FakeGel instead of a connection pool."""
+    
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.fake = FakeGel(latency)
+        self._client = self.fake
+    
+    async def startup(self):
+        pass
+    
+    async def get_client(self) -> FakeGel:
+        return self.fake
+    
+    def pool_stats(self) -> Dict[str, int]:
+        return {"max_concurrency": 0, "free": 0, "in_use": 0}
+    
+    async def close(self):
+        pass
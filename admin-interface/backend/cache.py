@@ -0,0 +1,70 @@
+"""Bounded in-process caches."""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """LRU cache whose entries expire at an absolute wall-clock time."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return a live entry, dropping it if it has expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+    
+    def set(self, key: Hashable, value: V, expires_at: float) -> None:
+        """Store an entry until expires_at, evicting the least recently used."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def add(self, key: Hashable, amount: int, expires_at: float) -> int:
+        """Add to a counter entry; a missing or expired one starts at `amount` and expires at expires_at."""
+        entry = self._entries.get(key)
+        if entry is None or time.time() >= entry[1]:
+            self.set(key, amount, expires_at)
+            return amount
+        value = entry[0] + amount
+        self._entries[key] = (value, entry[1])
+        self._entries.move_to_end(key)
+        return value
+    
+    def delete(self, key: Hashable) -> None:
+        """Drop an entry if present."""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Return size and hit/miss counters."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
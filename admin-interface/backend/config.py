@@ -1,35 +1,49 @@
-"""Configuration management using Antidote DI and environment variables."""
+"""Configuration management using Antidote DI and environment variables.
 
+Nothing is read at import: call `load_env()` once at startup (the app factory
+and the worker entry points do), then each config class reads its variables
+when Antidote first builds it.
+"""
+
+import logging
 import os
 from dataclasses import dataclass, field
-from typing import Optional
-from dotenv import load_dotenv
+from pathlib import Path
+from typing import Any, Callable, Optional
 from antidote import injectable, inject
 
-# Load environment variables from .env file
-# Try multiple locations to ensure .env is found
-from pathlib import Path
+logger = logging.getLogger(__name__)
+
+_env_loaded = False
+
+
+def load_env() -> Optional[Path]:
+    """Load the first .env file found next to the backend or in the working directory.
 
-def _load_env_file():
-    """Load .env file from multiple possible locations."""
+    Variables already set in the process environment take precedence. Safe to
+    call more than once; only the first call reads the filesystem.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return None
+    _env_loaded = True
+    
     current_dir = Path(__file__).parent
     possible_paths = [
         current_dir / ".env",  # Same directory as config.py
         current_dir.parent / ".env",  # Parent directory
         Path.cwd() / ".env",  # Current working directory
     ]
-    
     for env_path in possible_paths:
         if env_path.exists():
+            # python-dotenv is only needed when there is a file to parse
+            from dotenv import load_dotenv
             load_dotenv(env_path)
-            print(f"Loaded environment from: {env_path}")
-            return True
+            logger.info("Loaded environment from %s", env_path)
+            return env_path
     
-    print("Warning: No .env file found in expected locations")
-    return False
-
-# Load environment variables
-_load_env_file()
+    logger.info("No .env file found; using the process environment")
+    return None
 
 
 def _require_env(var_name: str) -> str:
@@ -40,45 +54,201 @@ def _require_env(var_name: str) -> str:
     return value
 
 
+def _parse_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _parse_list(value: str) -> list[str]:
+    return value.split(",")
+
+
+def env(name: str, default: Optional[str] = None, parse: Callable[[str], Any] = str) -> Any:
+    """Dataclass field read from the environment when the config is built.
+
+    Unset and empty variables fall back to `default`; None stays None.
+    """
+    def read():
+        value = os.getenv(name) or default
+        return None if value is None else parse(value)
+    return field(default_factory=read)
+
+
 @injectable
 @dataclass(frozen=True)
 class DatabaseConfig:
     """EdgeDB database configuration."""
-    host: str = os.getenv("EDGEDB_HOST", "localhost")
-    port: int = int(os.getenv("EDGEDB_PORT", "5656"))
-    database: str = os.getenv("EDGEDB_DATABASE", "grundrisse")
-    user: Optional[str] = os.getenv("EDGEDB_USER")
-    password: Optional[str] = os.getenv("EDGEDB_PASSWORD")
+    host: str = env("EDGEDB_HOST", "localhost")
+    port: int = env("EDGEDB_PORT", "5656", int)
+    database: str = env("EDGEDB_DATABASE", "grundrisse")
+    user: Optional[str] = env("EDGEDB_USER")
+    password: Optional[str] = env("EDGEDB_PASSWORD")
+    # Connections per worker process; unset lets the server suggest a size
+    max_concurrency: Optional[int] = env("EDGEDB_MAX_CONCURRENCY", parse=int)
+    warm_connections: int = env("EDGEDB_WARM_CONNECTIONS", "1", int)
+    connect_timeout: int = env("EDGEDB_CONNECT_TIMEOUT", "10", int)
+    wait_until_available: int = env("EDGEDB_WAIT_UNTIL_AVAILABLE", "30", int)
+    retry_attempts: int = env("EDGEDB_RETRY_ATTEMPTS", "3", int)
 
 
 @injectable
 @dataclass(frozen=True)
 class AuthConfig:
     """Authentication configuration."""
-    secret_key: str = os.getenv("SECRET_KEY") or _require_env("SECRET_KEY")
-    algorithm: str = os.getenv("JWT_ALGORITHM", "HS256")
-    access_token_expire_hours: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_HOURS", "24"))
+    secret_key: str = field(default_factory=lambda: _require_env("SECRET_KEY"))
+    algorithm: str = env("JWT_ALGORITHM", "HS256")
+    access_token_expire_hours: int = env("ACCESS_TOKEN_EXPIRE_HOURS", "24", int)
+    token_cache_size: int = env("TOKEN_CACHE_SIZE", "1024", int)
+    token_cache_ttl_seconds: int = env("TOKEN_CACHE_TTL_SECONDS", "300", int)
+    # API key lookups are cached this long; revocation clears them at once on this node
+    api_key_cache_ttl_seconds: int = env("API_KEY_CACHE_TTL_SECONDS", "60", int)
+    password_hash_rounds: int = env("PASSWORD_HASH_ROUNDS", "12", int)
+    password_hash_workers: int = env("PASSWORD_HASH_WORKERS", "2", int)
+    password_hash_concurrency: int = env("PASSWORD_HASH_CONCURRENCY", "8", int)
+    # Login attempts allowed per sliding window; 0 disables a limit
+    login_max_attempts_per_user: int = env("LOGIN_MAX_ATTEMPTS_PER_USER", "5", int)
+    login_max_attempts_per_ip: int = env("LOGIN_MAX_ATTEMPTS_PER_IP", "20", int)
+    login_window_seconds: int = env("LOGIN_WINDOW_SECONDS", "300", int)
 
 
 @injectable
 @dataclass(frozen=True)
 class ServerConfig:
     """Server configuration."""
-    host: str = os.getenv("SERVER_HOST", "0.0.0.0")
-    port: int = int(os.getenv("SERVER_PORT", "8000"))
-    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
-    cors_origins: list[str] = field(default_factory=lambda: os.getenv("CORS_ORIGINS", "http://localhost:3000").split(","))
+    host: str = env("SERVER_HOST", "0.0.0.0")
+    port: int = env("SERVER_PORT", "8000", int)
+    debug: bool = env("DEBUG", "false", _parse_bool)
+    cors_origins: list[str] = env("CORS_ORIGINS", "http://localhost:3000", _parse_list)
+    # `python -m serve`: worker processes (0 = one per core) and seconds to drain on shutdown
+    workers: int = env("SERVER_WORKERS", "0", int)
+    graceful_timeout_seconds: int = env("SERVER_GRACEFUL_TIMEOUT", "30", int)
+    # Proxies whose X-Forwarded-For/-Proto are trusted for the client address ("*" for any)
+    forwarded_allow_ips: str = env("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+@injectable
+@dataclass(frozen=True)
+class SourcesConfig:
+    """Sources listing configuration."""
+    default_page_size: int = env("SOURCES_PAGE_SIZE", "50", int)
+    max_page_size: int = env("SOURCES_MAX_PAGE_SIZE", "200", int)
+    bulk_chunk_size: int = env("SOURCES_BULK_CHUNK_SIZE", "500", int)
+    bulk_max_chunk_size: int = env("SOURCES_BULK_MAX_CHUNK_SIZE", "5000", int)
+    bulk_max_rows: int = env("SOURCES_BULK_MAX_ROWS", "50000", int)
+    changes_page_size: int = env("SOURCES_CHANGES_PAGE_SIZE", "500", int)
+    changes_max_page_size: int = env("SOURCES_CHANGES_MAX_PAGE_SIZE", "5000", int)
+    # Long-poll bound, and how often waiters re-check for writes made by other processes
+    changes_max_wait_seconds: float = env("SOURCES_CHANGES_MAX_WAIT", "30", float)
+    changes_poll_interval_seconds: float = env("SOURCES_CHANGES_POLL_INTERVAL", "1", float)
+    changes_heartbeat_seconds: float = env("SOURCES_CHANGES_HEARTBEAT", "15", float)
+    # Longest a write transaction may stay open and still be delivered by the feed
+    changes_commit_lag_seconds: float = env("SOURCES_CHANGES_COMMIT_LAG", "30", float)
+    # Age at which python -m sources.prune_changes drops change log entries
+    changes_retention_days: int = env("SOURCES_CHANGES_RETENTION_DAYS", "30", int)
+    export_page_size: int = env("SOURCES_EXPORT_PAGE_SIZE", "1000", int)
+
+
+@injectable
+@dataclass(frozen=True)
+class ContentsConfig:
+    """Contents search configuration."""
+    search_default_limit: int = env("CONTENTS_SEARCH_LIMIT", "20", int)
+    search_max_limit: int = env("CONTENTS_SEARCH_MAX_LIMIT", "100", int)
+    search_cache_ttl_seconds: int = env("CONTENTS_SEARCH_CACHE_TTL_SECONDS", "30", int)
+    transcript_batch_size: int = env("TRANSCRIPT_BATCH_SIZE", "500", int)
+    transcript_page_size: int = env("TRANSCRIPT_PAGE_SIZE", "200", int)
+    transcript_max_page_size: int = env("TRANSCRIPT_MAX_PAGE_SIZE", "1000", int)
+    export_page_size: int = env("CONTENTS_EXPORT_PAGE_SIZE", "1000", int)
+
+
+@injectable
+@dataclass(frozen=True)
+class GraphConfig:
+    """Knowledge graph traversal configuration."""
+    # Neighbours of each kind taken per node, and new nodes taken per hop
+    default_fanout: int = env("GRAPH_FANOUT", "20", int)
+    max_fanout: int = env("GRAPH_MAX_FANOUT", "100", int)
+    max_nodes_per_hop: int = env("GRAPH_MAX_NODES_PER_HOP", "500", int)
+    cache_ttl_seconds: int = env("GRAPH_CACHE_TTL_SECONDS", "300", int)
+
+
+@injectable
+@dataclass(frozen=True)
+class IngestionConfig:
+    """Platform ingestion worker configuration."""
+    youtube_api_key: str = env("YOUTUBE_API_KEY", "")
+    youtube_api_url: str = env("YOUTUBE_API_URL", "https://www.googleapis.com/youtube/v3")
+    request_timeout_seconds: float = env("INGESTION_REQUEST_TIMEOUT", "10", float)
+    # Sources crawled at once, and API calls allowed across all of them
+    concurrency: int = env("INGESTION_CONCURRENCY", "8", int)
+    rate_per_second: float = env("INGESTION_RATE_PER_SECOND", "10", float)
+    burst: int = env("INGESTION_BURST", "20", int)
+    # API calls allowed for a single source, and pages read per crawl; listing starts
+    # at the newest upload, so uploads past these pages are never stored
+    source_rate_per_second: float = env("INGESTION_SOURCE_RATE_PER_SECOND", "2", float)
+    source_burst: int = env("INGESTION_SOURCE_BURST", "4", int)
+    max_pages_per_source: int = env("INGESTION_MAX_PAGES_PER_SOURCE", "20", int)
+    write_batch_size: int = env("INGESTION_WRITE_BATCH_SIZE", "200", int)
+    interval_seconds: int = env("INGESTION_INTERVAL_SECONDS", "900", int)
+
+
+@injectable
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """Crawl scheduler configuration."""
+    source_types: list[str] = env("SCHEDULER_SOURCE_TYPES", "youtube", _parse_list)
+    # Jobs run at once by one scheduler process, and how long a claim is held
+    concurrency: int = env("SCHEDULER_CONCURRENCY", "8", int)
+    lease_seconds: int = env("SCHEDULER_LEASE_SECONDS", "300", int)
+    poll_interval_seconds: float = env("SCHEDULER_POLL_INTERVAL", "5", float)
+    sync_interval_seconds: int = env("SCHEDULER_SYNC_INTERVAL", "60", int)
+    # Crawl interval bounds; it shrinks after runs that found new content and grows otherwise
+    initial_interval_seconds: int = env("SCHEDULER_INITIAL_INTERVAL", "3600", int)
+    min_interval_seconds: int = env("SCHEDULER_MIN_INTERVAL", "900", int)
+    max_interval_seconds: int = env("SCHEDULER_MAX_INTERVAL", "86400", int)
+    speedup_factor: float = env("SCHEDULER_SPEEDUP_FACTOR", "0.5", float)
+    slowdown_factor: float = env("SCHEDULER_SLOWDOWN_FACTOR", "1.5", float)
+    # Exponential backoff after failed runs
+    retry_base_seconds: int = env("SCHEDULER_RETRY_BASE", "60", int)
+    retry_max_seconds: int = env("SCHEDULER_RETRY_MAX", "3600", int)
+
+
+@injectable
+@dataclass(frozen=True)
+class ObservabilityConfig:
+    """Metrics and tracing configuration."""
+    # Traces are exported over OTLP/HTTP only when an endpoint is set
+    otlp_endpoint: Optional[str] = env("OTEL_EXPORTER_OTLP_ENDPOINT")
+    service_name: str = env("OTEL_SERVICE_NAME", "grundrisse-admin-api")
+
+
+@injectable
+@dataclass(frozen=True)
+class StateConfig:
+    """Store behind shared caches and counters."""
+    # "local" keeps them per process; "socket" uses the node's state server at socket_path
+    backend: str = env("STATE_BACKEND", "local")
+    socket_path: Optional[str] = env("STATE_SOCKET")
+    max_entries: int = env("STATE_MAX_ENTRIES", "100000", int)
+    # Connections each process keeps to the state server, so requests need not queue
+    connections: int = env("STATE_CONNECTIONS", "4", int)
 
 
 @injectable
 @dataclass(frozen=True)
 class AppConfig:
     """Main application configuration."""
-    title: str = os.getenv("APP_TITLE", "Grundrisse Admin API")
-    version: str = os.getenv("APP_VERSION", "1.0.0")
-    description: str = os.getenv("APP_DESCRIPTION", "Admin interface for managing content sources")
+    title: str = env("APP_TITLE", "Grundrisse Admin API")
+    version: str = env("APP_VERSION", "1.0.0")
+    description: str = env("APP_DESCRIPTION", "Admin interface for managing content sources")
     
     # Injected configurations
     database: DatabaseConfig = inject[DatabaseConfig]
     auth: AuthConfig = inject[AuthConfig]
     server: ServerConfig = inject[ServerConfig]
+    sources: SourcesConfig = inject[SourcesConfig]
+    contents: ContentsConfig = inject[ContentsConfig]
+    graph: GraphConfig = inject[GraphConfig]
+    ingestion: IngestionConfig = inject[IngestionConfig]
+    scheduler: SchedulerConfig = inject[SchedulerConfig]
+    observability: ObservabilityConfig = inject[ObservabilityConfig]
+    state: StateConfig = inject[StateConfig]
@@ -0,0 +1 @@
+# Contents module
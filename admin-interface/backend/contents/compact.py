@@ -0,0 +1,30 @@
+"""Merge duplicate content rows before the (source, external_id) constraint: python -m contents.compact."""
+
+import argparse
+import asyncio
+import json
+import logging
+from antidote import world
+
+from config import load_env
+from database import DatabaseService
+from contents.service import ContentService
+
+
+async def main(batch_size: int):
+    db_service: DatabaseService = world[DatabaseService]
+    await db_service.startup()
+    try:
+        result = await world[ContentService].compact_duplicates(batch_size)
+        print(json.dumps(result, indent=2))
+    finally:
+        await db_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge content stored more than once for the same video")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_env()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,94 @@
+"""Contents module models."""
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+
+class ContentSourceRef(BaseModel):
+    """Source a content item belongs to."""
+    id: str
+    name: str
+
+
+class ContentSearchHit(BaseModel):
+    """Content item matching a full-text search."""
+    id: str
+    title: str
+    url: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    published_at: Optional[datetime] = None
+    source: ContentSourceRef
+    score: float
+    # HTML-escaped text with matching words wrapped in <mark>
+    title_snippet: Optional[str] = None
+    description_snippet: Optional[str] = None
+
+
+class ContentSearchPage(BaseModel):
+    """One page of search hits, best match first."""
+    items: List[ContentSearchHit]
+    offset: int
+    next_offset: Optional[int] = None
+
+
+class TranscriptSegmentIn(BaseModel):
+    """Transcript segment to store, with offsets in seconds."""
+    start: float = Field(..., ge=0)
+    end: float = Field(..., ge=0)
+    text: str
+    language: Optional[str] = None
+    
+    @model_validator(mode="after")
+    def check_offsets(self) -> "TranscriptSegmentIn":
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        return self
+
+
+class TranscriptUpload(BaseModel):
+    """Request model for storing a transcript."""
+    segments: List[TranscriptSegmentIn]
+    # Default language for segments that do not set their own
+    language: Optional[str] = None
+    # Drop existing segments (of this language, if given) first
+    replace: bool = False
+
+
+class TranscriptUploadResult(BaseModel):
+    """Response model for a stored transcript."""
+    inserted: int
+    deleted: int
+
+
+class TranscriptSegment(BaseModel):
+    """Stored transcript segment, with offsets in seconds."""
+    id: str
+    start_seconds: float
+    end_seconds: float
+    language: Optional[str] = None
+    text: str
+
+
+class ContentRef(BaseModel):
+    """Content item a transcript segment belongs to."""
+    id: str
+    title: str
+    url: Optional[str] = None
+    source: ContentSourceRef
+
+
+class TranscriptSearchHit(BaseModel):
+    """Transcript segment matching a full-text search."""
+    segment: TranscriptSegment
+    content: ContentRef
+    score: float
+    # HTML-escaped text with matching words wrapped in <mark>
+    snippet: Optional[str] = None
+
+
+class TranscriptSearchPage(BaseModel):
+    """One page of transcript hits, best match first."""
+    items: List[TranscriptSearchHit]
+    offset: int
+    next_offset: Optional[int] = None
@@ -0,0 +1,473 @@
+# AUTOGENERATED FROM:
+#     'admin-interface/backend/contents/queries/delete_contents.edgeql'
+#     'admin-interface/backend/contents/queries/delete_transcript_segments.edgeql'
+#     'admin-interface/backend/contents/queries/get_contents_page.edgeql'
+#     'admin-interface/backend/contents/queries/get_duplicate_contents.edgeql'
+#     'admin-interface/backend/contents/queries/get_transcript_segments.edgeql'
+#     'admin-interface/backend/contents/queries/insert_transcript_segments.edgeql'
+#     'admin-interface/backend/contents/queries/merge_duplicate_contents.edgeql'
+#     'admin-interface/backend/contents/queries/search_contents.edgeql'
+#     'admin-interface/backend/contents/queries/search_transcript_segments.edgeql'
+# WITH:
+#     $ gel-py --dir admin-interface/backend/contents/queries --file admin-interface/backend/contents/queries.py
+
+
+from __future__ import annotations
+import dataclasses
+import datetime
+import gel
+import uuid
+
+
+class NoPydanticValidation:
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source_type, _handler):
+        # Pydantic 2.x
+        from pydantic_core.core_schema import any_schema
+        return any_schema()
+    
+    @classmethod
+    def __get_validators__(cls):
+        # Pydantic 1.x
+        from pydantic.dataclasses import dataclass as pydantic_dataclass
+        _ = pydantic_dataclass(cls)
+        cls.__pydantic_model__.__get_validators__ = lambda: []
+        return []
+
+
+@dataclasses.dataclass
+class GetContentsPageResult(NoPydanticValidation):
+    id: uuid.UUID
+    external_id: str | None
+    title: str
+    description: str | None
+    url: str | None
+    duration: datetime.timedelta | None
+    published_at: datetime.datetime | None
+    created_at: datetime.datetime | None
+    source: GetContentsPageResultSource
+
+
+@dataclasses.dataclass
+class GetContentsPageResultSource(NoPydanticValidation):
+    id: uuid.UUID
+
+
+@dataclasses.dataclass
+class GetDuplicateContentsResult(NoPydanticValidation):
+    source_id: uuid.UUID
+    external_id: str | None
+    keep_id: uuid.UUID | None
+    ids: list[uuid.UUID]
+
+
+@dataclasses.dataclass
+class GetTranscriptSegmentsResult(NoPydanticValidation):
+    id: uuid.UUID
+    start_offset: datetime.timedelta
+    end_offset: datetime.timedelta
+    language: str | None
+    text: str
+
+
+@dataclasses.dataclass
+class MergeDuplicateContentsResult(NoPydanticValidation):
+    id: uuid.UUID
+    moved_segments: int
+    moved_citations: int
+
+
+@dataclasses.dataclass
+class SearchContentsResult(NoPydanticValidation):
+    id: uuid.UUID
+    title: str
+    description: str | None
+    url: str | None
+    duration: datetime.timedelta | None
+    published_at: datetime.datetime | None
+    source: SearchContentsResultSource
+    score: float
+
+
+@dataclasses.dataclass
+class SearchContentsResultSource(NoPydanticValidation):
+    id: uuid.UUID
+    name: str
+
+
+@dataclasses.dataclass
+class SearchTranscriptSegmentsResult(NoPydanticValidation):
+    id: uuid.UUID
+    start_offset: datetime.timedelta
+    end_offset: datetime.timedelta
+    language: str | None
+    text: str
+    content: SearchTranscriptSegmentsResultContent
+    score: float
+
+
+@dataclasses.dataclass
+class SearchTranscriptSegmentsResultContent(NoPydanticValidation):
+    id: uuid.UUID
+    title: str
+    url: str | None
+    source: SearchContentsResultSource
+
+
+async def delete_contents(
+    executor: gel.AsyncIOExecutor,
+    *,
+    ids: list[uuid.UUID],
+) -> int:
+    return await executor.query_single(
+        """\
+        SELECT count((
+            DELETE Content
+            FILTER .id IN array_unpack(<array<uuid>>$ids)
+        ))\
+        """,
+        ids=ids,
+    )
+
+
+async def delete_transcript_segments(
+    executor: gel.AsyncIOExecutor,
+    *,
+    language: str | None = None,
+    content_id: uuid.UUID,
+) -> int:
+    return await executor.query_single(
+        """\
+        WITH
+            language_filter := <optional str>$language,
+        SELECT count((
+            DELETE TranscriptSegment
+            FILTER .content.id = <uuid>$content_id
+                AND ((.language = language_filter) ?? true)
+        ))\
+        """,
+        language=language,
+        content_id=content_id,
+    )
+
+
+async def get_contents_page(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID | None = None,
+    after: uuid.UUID | None = None,
+    limit: int,
+) -> list[GetContentsPageResult]:
+    return await executor.query(
+        """\
+        WITH
+            source_filter := <optional uuid>$source_id,
+            after := <optional uuid>$after,
+        SELECT Content {
+            id,
+            external_id,
+            title,
+            description,
+            url,
+            duration,
+            published_at,
+            created_at,
+            source: {
+                id
+            }
+        }
+        FILTER
+            ((.source.id = source_filter) ?? true)
+            AND ((.id > after) ?? true)
+        ORDER BY .id
+        LIMIT <int64>$limit\
+        """,
+        source_id=source_id,
+        after=after,
+        limit=limit,
+    )
+
+
+async def get_duplicate_contents(
+    executor: gel.AsyncIOExecutor,
+    *,
+    limit: int,
+) -> list[GetDuplicateContentsResult]:
+    return await executor.query(
+        """\
+        WITH
+            groups := (
+                GROUP Content
+                USING source_id := .source.id
+                BY source_id, .external_id
+            ),
+        SELECT groups {
+            source_id := .key.source_id,
+            external_id := .key.external_id,
+            # The oldest row is kept and the others merged into it
+            keep_id := (SELECT .elements ORDER BY .created_at THEN .id LIMIT 1).id,
+            ids := array_agg(.elements.id)
+        }
+        FILTER EXISTS .key.external_id AND count(.elements) > 1
+        LIMIT <int64>$limit\
+        """,
+        limit=limit,
+    )
+
+
+async def get_transcript_segments(
+    executor: gel.AsyncIOExecutor,
+    *,
+    start_at: datetime.timedelta | None = None,
+    end_at: datetime.timedelta | None = None,
+    language: str | None = None,
+    content_id: uuid.UUID,
+    limit: int,
+) -> list[GetTranscriptSegmentsResult]:
+    return await executor.query(
+        """\
+        WITH
+            start_at := <optional duration>$start_at,
+            end_at := <optional duration>$end_at,
+            language_filter := <optional str>$language,
+        SELECT TranscriptSegment {
+            id,
+            start_offset,
+            end_offset,
+            language,
+            text
+        }
+        FILTER .content.id = <uuid>$content_id
+            AND ((.end_offset > start_at) ?? true)
+            AND ((.start_offset < end_at) ?? true)
+            AND ((.language = language_filter) ?? true)
+        ORDER BY .start_offset
+        LIMIT <int64>$limit\
+        """,
+        start_at=start_at,
+        end_at=end_at,
+        language=language,
+        content_id=content_id,
+        limit=limit,
+    )
+
+
+async def insert_transcript_segments(
+    executor: gel.AsyncIOExecutor,
+    *,
+    content_id: uuid.UUID,
+    segments: str,
+) -> int:
+    return await executor.query_single(
+        """\
+        WITH
+            content := (SELECT Content FILTER .id = <uuid>$content_id),
+        SELECT count((
+            FOR segment IN json_array_unpack(<json>$segments) UNION (
+                INSERT TranscriptSegment {
+                    content := content,
+                    start_offset := to_duration(seconds := <float64>segment['start']),
+                    end_offset := to_duration(seconds := <float64>segment['end']),
+                    language := <str>json_get(segment, 'language'),
+                    text := <str>segment['text']
+                }
+            )
+        ))\
+        """,
+        content_id=content_id,
+        segments=segments,
+    )
+
+
+async def merge_duplicate_contents(
+    executor: gel.AsyncIOExecutor,
+    *,
+    keep_id: uuid.UUID,
+    duplicate_ids: list[uuid.UUID],
+) -> MergeDuplicateContentsResult | None:
+    return await executor.query_single(
+        """\
+        WITH
+            keeper := (SELECT Content FILTER .id = <uuid>$keep_id),
+            duplicates := (
+                SELECT Content
+                FILTER .id IN array_unpack(<array<uuid>>$duplicate_ids) AND .id != <uuid>$keep_id
+            ),
+            merged := (keeper UNION duplicates),
+            # A transcript is taken over only when the kept row has none of its own
+            donor := (
+                SELECT duplicates
+                FILTER EXISTS .<content[is TranscriptSegment]
+                ORDER BY .created_at THEN .id
+                LIMIT 1
+            ),
+            segments := (
+                UPDATE TranscriptSegment
+                FILTER .content = donor AND NOT EXISTS keeper.<content[is TranscriptSegment]
+                SET { content := keeper }
+            ),
+            # Citations between the merged rows themselves are dropped
+            cites := (
+                FOR cited_work IN DISTINCT (
+                    SELECT Citation FILTER .citing IN duplicates AND .cited NOT IN merged
+                ).cited UNION (
+                    INSERT Citation {
+                        citing := keeper,
+                        cited := cited_work,
+                        context := (
+                            SELECT Citation FILTER .citing IN duplicates AND .cited = cited_work LIMIT 1
+                        ).context
+                    }
+                    UNLESS CONFLICT
+                )
+            ),
+            cited_by := (
+                FOR citing_work IN DISTINCT (
+                    SELECT Citation FILTER .cited IN duplicates AND .citing NOT IN merged
+                ).citing UNION (
+                    INSERT Citation {
+                        citing := citing_work,
+                        cited := keeper,
+                        context := (
+                            SELECT Citation FILTER .cited IN duplicates AND .citing = citing_work LIMIT 1
+                        ).context
+                    }
+                    UNLESS CONFLICT
+                )
+            ),
+        SELECT (
+            UPDATE keeper
+            SET {
+                authors += duplicates.authors,
+                concepts += duplicates.concepts,
+                transcript := .transcript ?? (
+                    SELECT duplicates FILTER EXISTS .transcript ORDER BY .created_at THEN .id LIMIT 1
+                ).transcript
+            }
+        ) {
+            id,
+            moved_segments := count(segments),
+            moved_citations := count(cites) + count(cited_by)
+        }\
+        """,
+        keep_id=keep_id,
+        duplicate_ids=duplicate_ids,
+    )
+
+
+async def search_contents(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID | None = None,
+    published_after: datetime.datetime | None = None,
+    published_before: datetime.datetime | None = None,
+    min_duration: datetime.timedelta | None = None,
+    max_duration: datetime.timedelta | None = None,
+    query: str,
+    limit: int,
+    offset: int,
+) -> list[SearchContentsResult]:
+    return await executor.query(
+        """\
+        WITH
+            source_id := <optional uuid>$source_id,
+            published_after := <optional datetime>$published_after,
+            published_before := <optional datetime>$published_before,
+            min_duration := <optional duration>$min_duration,
+            max_duration := <optional duration>$max_duration,
+            hits := (
+                FOR hit IN fts::search(Content, <str>$query, language := 'por') UNION (
+                    SELECT hit.object {
+                        score := hit.score
+                    }
+                )
+            ),
+        SELECT hits {
+            id,
+            title,
+            description,
+            url,
+            duration,
+            published_at,
+            source: {
+                id,
+                name
+            },
+            score
+        }
+        FILTER
+            ((.source.id = source_id) ?? true)
+            AND ((.published_at >= published_after) ?? true)
+            AND ((.published_at < published_before) ?? true)
+            AND ((.duration >= min_duration) ?? true)
+            AND ((.duration <= max_duration) ?? true)
+        ORDER BY .score DESC THEN .id
+        LIMIT <int64>$limit
+        OFFSET <int64>$offset\
+        """,
+        source_id=source_id,
+        published_after=published_after,
+        published_before=published_before,
+        min_duration=min_duration,
+        max_duration=max_duration,
+        query=query,
+        limit=limit,
+        offset=offset,
+    )
+
+
+async def search_transcript_segments(
+    executor: gel.AsyncIOExecutor,
+    *,
+    content_id: uuid.UUID | None = None,
+    source_id: uuid.UUID | None = None,
+    language: str | None = None,
+    query: str,
+    limit: int,
+    offset: int,
+) -> list[SearchTranscriptSegmentsResult]:
+    return await executor.query(
+        """\
+        WITH
+            content_id := <optional uuid>$content_id,
+            source_id := <optional uuid>$source_id,
+            language_filter := <optional str>$language,
+            hits := (
+                FOR hit IN fts::search(TranscriptSegment, <str>$query, language := 'por') UNION (
+                    SELECT hit.object {
+                        score := hit.score
+                    }
+                )
+            ),
+        SELECT hits {
+            id,
+            start_offset,
+            end_offset,
+            language,
+            text,
+            content: {
+                id,
+                title,
+                url,
+                source: {
+                    id,
+                    name
+                }
+            },
+            score
+        }
+        FILTER
+            ((.content.id = content_id) ?? true)
+            AND ((.content.source.id = source_id) ?? true)
+            AND ((.language = language_filter) ?? true)
+        ORDER BY .score DESC THEN .id
+        LIMIT <int64>$limit
+        OFFSET <int64>$offset\
+        """,
+        content_id=content_id,
+        source_id=source_id,
+        language=language,
+        query=query,
+        limit=limit,
+        offset=offset,
+    )
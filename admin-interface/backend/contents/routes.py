@@ -0,0 +1,119 @@
+"""Contents routes."""
+
+import uuid
+from datetime import timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from pydantic import AwareDatetime
+
+from auth.routes import get_current_user
+from auth.models import User
+from dependencies import provide
+from export import ExportFormat, export_response
+from contents.models import (
+    ContentSearchPage,
+    TranscriptSearchPage,
+    TranscriptSegment,
+    TranscriptUpload,
+    TranscriptUploadResult,
+)
+from contents.service import ContentService
+
+router = APIRouter(prefix="/contents", tags=["contents"])
+
+
+@router.get("/search", response_model=ContentSearchPage)
+async def search_contents(
+    q: str = Query(..., min_length=1),
+    source_id: Optional[uuid.UUID] = None,
+    # Offsets are required: the database cannot compare a naive time
+    published_after: Optional[AwareDatetime] = None,
+    published_before: Optional[AwareDatetime] = None,
+    min_duration: Optional[float] = Query(None, ge=0, description="Seconds"),
+    max_duration: Optional[float] = Query(None, ge=0, description="Seconds"),
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    content_service: ContentService = provide(ContentService)
+):
+    """Full-text search over content titles and descriptions."""
+    return await content_service.search(
+        q,
+        source_id=source_id,
+        published_after=published_after,
+        published_before=published_before,
+        min_duration=timedelta(seconds=min_duration) if min_duration is not None else None,
+        max_duration=timedelta(seconds=max_duration) if max_duration is not None else None,
+        limit=limit,
+        offset=offset
+    )
+
+
+@router.get("/export")
+async def export_contents(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    source_id: Optional[uuid.UUID] = None,
+    current_user: User = Depends(get_current_user),
+    content_service: ContentService = provide(ContentService)
+):
+    """Stream all content, or one source's, as NDJSON or CSV."""
+    rows = await content_service.export_contents(export_format, source_id=source_id)
+    return export_response(rows, export_format, "contents")
+
+
+@router.get("/transcripts/search", response_model=TranscriptSearchPage)
+async def search_transcripts(
+    q: str = Query(..., min_length=1),
+    content_id: Optional[uuid.UUID] = None,
+    source_id: Optional[uuid.UUID] = None,
+    language: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    content_service: ContentService = provide(ContentService)
+):
+    """Full-text search over transcript segments, with their timestamps."""
+    return await content_service.search_transcripts(
+        q,
+        content_id=content_id,
+        source_id=source_id,
+        language=language,
+        limit=limit,
+        offset=offset
+    )
+
+
+@router.get("/{content_id}/transcript", response_model=List[TranscriptSegment])
+async def get_transcript(
+    content_id: uuid.UUID,
+    start: Optional[float] = Query(None, ge=0, description="Seconds"),
+    end: Optional[float] = Query(None, ge=0, description="Seconds"),
+    language: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    current_user: User = Depends(get_current_user),
+    content_service: ContentService = provide(ContentService)
+):
+    """Get the transcript segments overlapping a time range."""
+    return await content_service.get_transcript(
+        content_id,
+        start=timedelta(seconds=start) if start is not None else None,
+        end=timedelta(seconds=end) if end is not None else None,
+        language=language,
+        limit=limit
+    )
+
+
+@router.post("/{content_id}/transcript", response_model=TranscriptUploadResult)
+async def add_transcript(
+    content_id: uuid.UUID,
+    upload: TranscriptUpload,
+    current_user: User = Depends(get_current_user),
+    content_service: ContentService = provide(ContentService)
+):
+    """Store transcript segments for a content item."""
+    return await content_service.add_transcript(
+        content_id,
+        upload.segments,
+        language=upload.language,
+        replace=upload.replace
+    )
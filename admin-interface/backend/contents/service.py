@@ -0,0 +1,329 @@
+"""Contents service for searching indexed content."""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from fastapi import HTTPException
+from antidote import injectable, inject
+import gel
+
+from config import ContentsConfig
+from database import DatabaseService
+from export import ExportFormat, encode_rows, iter_pages
+from shared_state import SharedState
+from contents.models import (
+    ContentRef,
+    ContentSearchHit,
+    ContentSearchPage,
+    ContentSourceRef,
+    TranscriptSearchHit,
+    TranscriptSearchPage,
+    TranscriptSegment,
+    TranscriptSegmentIn,
+    TranscriptUploadResult,
+)
+from contents.snippets import highlight, query_terms
+
+# Import generated queries
+from contents.queries import (
+    GetContentsPageResult,
+    GetTranscriptSegmentsResult,
+    SearchTranscriptSegmentsResult,
+    delete_contents,
+    delete_transcript_segments,
+    get_contents_page,
+    get_duplicate_contents,
+    get_transcript_segments,
+    insert_transcript_segments,
+    merge_duplicate_contents,
+    search_contents,
+    search_transcript_segments,
+)
+
+
+def _to_segment(
+    segment: Union[GetTranscriptSegmentsResult, SearchTranscriptSegmentsResult]
+) -> TranscriptSegment:
+    """Convert a generated query result into the API model."""
+    return TranscriptSegment(
+        id=str(segment.id),
+        start_seconds=segment.start_offset.total_seconds(),
+        end_seconds=segment.end_offset.total_seconds(),
+        language=segment.language,
+        text=segment.text
+    )
+
+
+EXPORT_FIELDS = [
+    "id", "source_id", "external_id", "title", "description", "url",
+    "duration_seconds", "published_at", "created_at",
+]
+
+
+def _cache_key(*parts: Any) -> str:
+    """Search cache key; the parts' reprs keep None and "" apart."""
+    return "|".join(map(repr, parts))
+
+
+def _to_export_row(content: GetContentsPageResult) -> Dict[str, Any]:
+    """Flatten a content row for NDJSON/CSV export."""
+    return {
+        "id": str(content.id),
+        "source_id": str(content.source.id),
+        "external_id": content.external_id,
+        "title": content.title,
+        "description": content.description,
+        "url": content.url,
+        "duration_seconds": content.duration.total_seconds() if content.duration is not None else None,
+        "published_at": content.published_at,
+        "created_at": content.created_at,
+    }
+
+
+@injectable
+class ContentService:
+    """Service for querying indexed content."""
+    
+    def __init__(
+        self,
+        db: DatabaseService = inject[DatabaseService],
+        config: ContentsConfig = inject[ContentsConfig],
+        state: SharedState = inject[SharedState]
+    ):
+        self.db = db
+        self.config = config
+        # Shared by all workers under `python -m serve`, so a search is run once per node
+        self._search_cache = state.cache("search", config.search_cache_ttl_seconds)
+    
+    async def search(
+        self,
+        query: str,
+        source_id: Optional[uuid.UUID] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        min_duration: Optional[timedelta] = None,
+        max_duration: Optional[timedelta] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> ContentSearchPage:
+        """Rank content by full-text relevance, with optional filters."""
+        query = " ".join(query.split())
+        limit = min(limit or self.config.search_default_limit, self.config.search_max_limit)
+        
+        key = _cache_key(
+            "contents", query.lower(), source_id, published_after, published_before,
+            min_duration, max_duration, limit, offset
+        )
+        cached = await self._search_cache.get(key)
+        if cached is not None:
+            return ContentSearchPage.model_validate(cached)
+        
+        client = await self.db.get_client()
+        # Fetch one extra hit to know whether another page follows
+        hits = await search_contents(
+            client,
+            source_id=source_id,
+            published_after=published_after,
+            published_before=published_before,
+            min_duration=min_duration,
+            max_duration=max_duration,
+            query=query,
+            limit=limit + 1,
+            offset=offset
+        )
+        
+        terms = query_terms(query)
+        page = ContentSearchPage(
+            items=[
+                ContentSearchHit(
+                    id=str(hit.id),
+                    title=hit.title,
+                    url=hit.url,
+                    duration_seconds=hit.duration.total_seconds() if hit.duration is not None else None,
+                    published_at=hit.published_at,
+                    source=ContentSourceRef(id=str(hit.source.id), name=hit.source.name),
+                    score=hit.score,
+                    title_snippet=highlight(hit.title, terms),
+                    description_snippet=highlight(hit.description, terms)
+                )
+                for hit in hits[:limit]
+            ],
+            offset=offset,
+            next_offset=offset + limit if len(hits) > limit else None
+        )
+        
+        await self._search_cache.set(key, page.model_dump(mode="json"))
+        return page
+    
+    async def export_contents(
+        self,
+        export_format: ExportFormat,
+        source_id: Optional[uuid.UUID] = None
+    ) -> AsyncIterator[bytes]:
+        """Encode every content row in id order, reading one keyset page at a time."""
+        client = await self.db.get_client()
+        
+        async def fetch(after: Optional[uuid.UUID], limit: int) -> List[GetContentsPageResult]:
+            return await get_contents_page(client, source_id=source_id, after=after, limit=limit)
+        
+        async def rows() -> AsyncIterator[List[Dict[str, Any]]]:
+            async for page in iter_pages(fetch, lambda content: content.id, self.config.export_page_size):
+                yield [_to_export_row(content) for content in page]
+        
+        return encode_rows(rows(), export_format, EXPORT_FIELDS)
+    
+    async def add_transcript(
+        self,
+        content_id: uuid.UUID,
+        segments: List[TranscriptSegmentIn],
+        language: Optional[str] = None,
+        replace: bool = False
+    ) -> TranscriptUploadResult:
+        """Store transcript segments in batches, in a single transaction."""
+        rows = [
+            {
+                "start": segment.start,
+                "end": segment.end,
+                "language": segment.language or language,
+                "text": segment.text,
+            }
+            for segment in segments
+        ]
+        batch_size = self.config.transcript_batch_size
+        
+        client = await self.db.get_client()
+        try:
+            async for tx in client.transaction():
+                async with tx:
+                    deleted = 0
+                    if replace:
+                        deleted = await delete_transcript_segments(
+                            tx,
+                            language=language,
+                            content_id=content_id
+                        )
+                    inserted = 0
+                    for start in range(0, len(rows), batch_size):
+                        inserted += await insert_transcript_segments(
+                            tx,
+                            content_id=content_id,
+                            segments=json.dumps(rows[start:start + batch_size])
+                        )
+        except gel.MissingRequiredError:
+            raise HTTPException(status_code=404, detail="Content not found")
+        
+        return TranscriptUploadResult(inserted=inserted, deleted=deleted)
+    
+    async def compact_duplicates(self, batch_size: int) -> Dict[str, int]:
+        """Merge content rows sharing a source and external id into the oldest one.
+        
+        Each group is merged in its own transaction: graph links, citations and
+        a transcript the kept row lacks move over, then the other rows are
+        deleted. Merged groups no longer match, so batches are re-read until
+        none remain.
+        """
+        client = await self.db.get_client()
+        totals = {"groups": 0, "deleted": 0, "moved_segments": 0, "moved_citations": 0}
+        
+        while True:
+            groups = await get_duplicate_contents(client, limit=batch_size)
+            if not groups:
+                return totals
+            for group in groups:
+                duplicate_ids = [content_id for content_id in group.ids if content_id != group.keep_id]
+                async for tx in client.transaction():
+                    async with tx:
+                        merged = await merge_duplicate_contents(
+                            tx,
+                            keep_id=group.keep_id,
+                            duplicate_ids=duplicate_ids
+                        )
+                        deleted = await delete_contents(tx, ids=duplicate_ids)
+                totals["groups"] += 1
+                totals["deleted"] += deleted
+                if merged is not None:
+                    totals["moved_segments"] += merged.moved_segments
+                    totals["moved_citations"] += merged.moved_citations
+    
+    async def get_transcript(
+        self,
+        content_id: uuid.UUID,
+        start: Optional[timedelta] = None,
+        end: Optional[timedelta] = None,
+        language: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[TranscriptSegment]:
+        """Get the segments overlapping a time range, in order."""
+        limit = min(limit or self.config.transcript_page_size, self.config.transcript_max_page_size)
+        
+        client = await self.db.get_client()
+        segments = await get_transcript_segments(
+            client,
+            start_at=start,
+            end_at=end,
+            language=language,
+            content_id=content_id,
+            limit=limit
+        )
+        return [_to_segment(segment) for segment in segments]
+    
+    async def search_transcripts(
+        self,
+        query: str,
+        content_id: Optional[uuid.UUID] = None,
+        source_id: Optional[uuid.UUID] = None,
+        language: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> TranscriptSearchPage:
+        """Rank transcript segments by full-text relevance."""
+        query = " ".join(query.split())
+        limit = min(limit or self.config.search_default_limit, self.config.search_max_limit)
+        
+        key = _cache_key("transcripts", query.lower(), content_id, source_id, language, limit, offset)
+        cached = await self._search_cache.get(key)
+        if cached is not None:
+            return TranscriptSearchPage.model_validate(cached)
+        
+        client = await self.db.get_client()
+        # Fetch one extra hit to know whether another page follows
+        hits = await search_transcript_segments(
+            client,
+            content_id=content_id,
+            source_id=source_id,
+            language=language,
+            query=query,
+            limit=limit + 1,
+            offset=offset
+        )
+        
+        terms = query_terms(query)
+        page = TranscriptSearchPage(
+            items=[
+                TranscriptSearchHit(
+                    segment=_to_segment(hit),
+                    content=ContentRef(
+                        id=str(hit.content.id),
+                        title=hit.content.title,
+                        url=hit.content.url,
+                        source=ContentSourceRef(
+                            id=str(hit.content.source.id),
+                            name=hit.content.source.name
+                        )
+                    ),
+                    score=hit.score,
+                    snippet=highlight(hit.text, terms)
+                )
+                for hit in hits[:limit]
+            ],
+            offset=offset,
+            next_offset=offset + limit if len(hits) > limit else None
+        )
+        
+        await self._search_cache.set(key, page.model_dump(mode="json"))
+        return page
+    
+    def search_cache_stats(self) -> dict:
+        """Return search cache size and hit/miss counters."""
+        return self._search_cache.stats()
@@ -0,0 +1,64 @@
+"""Highlighted snippets for full-text search hits."""
+
+import html
+import re
+import unicodedata
+from typing import List, Optional
+
+_WORD = re.compile(r"\w+")
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents, one character per character of `text`.
+    
+    Folding each character on its own keeps offsets into the result valid in
+    `text`, even for characters like "İ" whose lowercase is two code points.
+    """
+    return "".join(
+        unicodedata.normalize("NFD", char.lower())[0] for char in text
+    )
+
+
+def query_terms(query: str) -> List[str]:
+    """Extract crude stems of the words of a search query."""
+    # Dropping the last letters lets "revolução" match "revoluções"
+    return [
+        _fold(word)[:max(4, len(word) - 2)]
+        for word in _WORD.findall(query)
+        if word.upper() not in ("AND", "OR", "NOT")
+    ]
+
+
+def highlight(text: Optional[str], terms: List[str], width: int = 200) -> Optional[str]:
+    """Return an HTML-escaped window of text with matching words in <mark>."""
+    if not text:
+        return None
+    
+    folded = _fold(text)
+    # Prefix matches approximate the stemmed matching of fts::search
+    matches = [
+        match for match in _WORD.finditer(folded)
+        if any(match.group().startswith(term) for term in terms)
+    ]
+    
+    start = 0
+    if matches and len(text) > width:
+        start = max(0, min(matches[0].start() - width // 4, len(text) - width))
+    end = min(len(text), start + width)
+    
+    parts = []
+    position = start
+    for match in matches:
+        if match.start() < start or match.end() > end:
+            continue
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"<mark>{html.escape(text[match.start():match.end()])}</mark>")
+        position = match.end()
+    parts.append(html.escape(text[position:end]))
+    
+    snippet = "".join(parts)
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(text):
+        snippet += "…"
+    return snippet
@@ -1,47 +1,180 @@
 """Database service with EdgeDB client management."""
 
-import hashlib
-from typing import Optional
-import edgedb
+import asyncio
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+import gel
 from antidote import injectable, inject
+from opentelemetry.trace import SpanKind
 from config import DatabaseConfig
+from auth.passwords import PasswordHasher
+from observability import Metrics, tracer
 
 # Import generated queries
-from queries.create_user_async_edgeql import create_user
+from auth.queries import authenticate_user, create_user
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so generated query strings compare equal to their .edgeql source."""
+    return " ".join(query.split())
+
+
+@lru_cache(maxsize=1)
+def load_query_names() -> Dict[str, str]:
+    """Map normalised query text to the name of its .edgeql file."""
+    return {
+        normalize_query(path.read_text()): path.stem
+        for path in BACKEND_DIR.glob("*/queries/*.edgeql")
+    }
+
+
+@lru_cache(maxsize=512)
+def query_name(query: str) -> str:
+    """Name of the generated query function that sends `query`, or "adhoc"."""
+    return load_query_names().get(normalize_query(query), "adhoc")
+
+
+class InstrumentedExecutor:
+    """Client proxy that times and traces every query under its generated function's name."""
+    
+    def __init__(self, executor: Any, metrics: Metrics):
+        self._executor = executor
+        self._metrics = metrics
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._executor, name)
+    
+    async def _run(self, method: str, query: str, *args, **kwargs) -> Any:
+        name = query_name(query)
+        outcome = "error"
+        start = time.perf_counter()
+        with tracer.start_as_current_span(
+            f"edgeql {name}",
+            kind=SpanKind.CLIENT,
+            attributes={"db.system": "edgedb", "db.operation.name": name},
+        ):
+            try:
+                result = await getattr(self._executor, method)(query, *args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                self._metrics.query_duration.labels(name, outcome).observe(time.perf_counter() - start)
+    
+    async def query(self, query: str, *args, **kwargs) -> Any:
+        return await self._run("query", query, *args, **kwargs)
+    
+    async def query_single(self, query: str, *args, **kwargs) -> Any:
+        return await self._run("query_single", query, *args, **kwargs)
+    
+    async def query_required_single(self, query: str, *args, **kwargs) -> Any:
+        return await self._run("query_required_single", query, *args, **kwargs)
+    
+    async def query_json(self, query: str, *args, **kwargs) -> Any:
+        return await self._run("query_json", query, *args, **kwargs)
+    
+    async def execute(self, query: str, *args, **kwargs) -> Any:
+        return await self._run("execute", query, *args, **kwargs)
+    
+    async def transaction(self):
+        """Retrying transactions whose queries are instrumented too."""
+        async for tx in self._executor.transaction():
+            yield _InstrumentedTransaction(tx, self._metrics)
+
+
+class _InstrumentedTransaction(InstrumentedExecutor):
+    """One attempt of a transaction, entered with `async with`."""
+    
+    async def __aenter__(self):
+        await self._executor.__aenter__()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return await self._executor.__aexit__(*exc_info)
 
 
 @injectable
 class DatabaseService:
     """EdgeDB database service with connection management."""
     
-    def __init__(self, config: DatabaseConfig = inject[DatabaseConfig]):
+    def __init__(
+        self,
+        config: DatabaseConfig = inject[DatabaseConfig],
+        hasher: PasswordHasher = inject[PasswordHasher],
+        metrics: Metrics = inject[Metrics]
+    ):
         self.config = config
-        self._client: Optional[edgedb.AsyncIOClient] = None
+        self.hasher = hasher
+        self.metrics = metrics
+        self._client: Optional[gel.AsyncIOClient] = None
+        self._executor: Optional[InstrumentedExecutor] = None
     
-    async def get_client(self) -> edgedb.AsyncIOClient:
+    def _create_client(self) -> gel.AsyncIOClient:
+        """Build the pooled client from configuration."""
+        client = gel.create_async_client(
+            host=self.config.host,
+            port=self.config.port,
+            database=self.config.database,
+            user=self.config.user,
+            password=self.config.password,
+            max_concurrency=self.config.max_concurrency,
+            timeout=self.config.connect_timeout,
+            wait_until_available=self.config.wait_until_available,
+        )
+        return client.with_retry_options(
+            gel.RetryOptions(attempts=self.config.retry_attempts)
+        )
+    
+    async def startup(self):
+        """Create the client and open connections before serving traffic."""
+        client = await self.get_client()
+        await client.ensure_connected()
+        
+        # Concurrent round trips make the pool open that many connections
+        warm = min(self.config.warm_connections, client.max_concurrency)
+        if warm > 1:
+            await asyncio.gather(*(client.query_single("SELECT 1") for _ in range(warm)))
+    
+    async def get_client(self) -> gel.AsyncIOClient:
         """Get or create EdgeDB client."""
+        # Creation does not await, so concurrent callers share one client
         if self._client is None:
-            self._client = edgedb.create_async_client(
-                host=self.config.host,
-                port=self.config.port,
-                database=self.config.database,
-                user=self.config.user,
-                password=self.config.password,
-            )
-        return self._client
+            self._client = self._create_client()
+            self._executor = InstrumentedExecutor(self._client, self.metrics)
+        return self._executor
+    
+    def pool_stats(self) -> Dict[str, int]:
+        """Return connection pool size and utilisation."""
+        if self._client is None:
+            return {"max_concurrency": 0, "free": 0, "in_use": 0}
+        max_concurrency = self._client.max_concurrency
+        free = self._client.free_size
+        return {
+            "max_concurrency": max_concurrency,
+            "free": free,
+            "in_use": max_concurrency - free,
+        }
     
     async def close(self):
         """Close database connection."""
         if self._client:
             await self._client.aclose()
             self._client = None
+            self._executor = None
     
     async def initialize(self):
         """Initialize database with default data."""
         client = await self.get_client()
         
+        # Hashing costs a full KDF run, so skip it on every start after the first
+        if await authenticate_user(client, username="admin") is not None:
+            return
+        
         # Create default admin user if it doesn't exist using generated query
-        password_hash = hashlib.sha256("admin123".encode()).hexdigest()
+        password_hash = await self.hasher.hash("admin123")
         
         await create_user(
             client,
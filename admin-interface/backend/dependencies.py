@@ -0,0 +1,13 @@
+"""FastAPI dependencies resolved from the Antidote world."""
+
+from typing import Any, TypeVar
+
+from fastapi import Depends
+from antidote import world
+
+T = TypeVar("T")
+
+
+def provide(dependency: type[T]) -> Any:
+    """Inject an Antidote-managed service into a route handler."""
+    return Depends(lambda: world[dependency])
@@ -0,0 +1,32 @@
+"""Graph module models."""
+
+from typing import List, Literal
+from pydantic import BaseModel
+
+NodeKind = Literal["content", "author", "concept"]
+# Directed from the work: it is authored by, discusses or cites the target
+EdgeKind = Literal["authored_by", "discusses", "cites"]
+
+
+class GraphNode(BaseModel):
+    """Node of a neighbourhood with its distance from the start node."""
+    id: str
+    kind: NodeKind
+    label: str
+    depth: int
+
+
+class GraphEdge(BaseModel):
+    """Edge between two nodes of a neighbourhood."""
+    source: str
+    target: str
+    kind: EdgeKind
+
+
+class Neighborhood(BaseModel):
+    """Nodes within `depth` hops of a node and the edges between them."""
+    id: str
+    depth: int
+    fanout: int
+    nodes: List[GraphNode]
+    edges: List[GraphEdge]
@@ -0,0 +1,158 @@
+# AUTOGENERATED FROM 'admin-interface/backend/graph/queries/get_graph_neighborhood.edgeql' WITH:
+#     $ gel-py --dir admin-interface/backend/graph/queries --file admin-interface/backend/graph/queries.py
+
+
+from __future__ import annotations
+import dataclasses
+import datetime
+import gel
+import uuid
+
+
+class NoPydanticValidation:
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source_type, _handler):
+        # Pydantic 2.x
+        from pydantic_core.core_schema import any_schema
+        return any_schema()
+    
+    @classmethod
+    def __get_validators__(cls):
+        # Pydantic 1.x
+        from pydantic.dataclasses import dataclass as pydantic_dataclass
+        _ = pydantic_dataclass(cls)
+        cls.__pydantic_model__.__get_validators__ = lambda: []
+        return []
+
+
+@dataclasses.dataclass
+class GetGraphNeighborhoodResult(NoPydanticValidation):
+    found: bool
+    contents: list[GetGraphNeighborhoodResultContentsItem]
+    authors: list[GetGraphNeighborhoodResultAuthorsItem]
+    concepts: list[GetGraphNeighborhoodResultConceptsItem]
+
+
+@dataclasses.dataclass
+class GetGraphNeighborhoodResultAuthorsItem(NoPydanticValidation):
+    id: uuid.UUID
+    name: str
+
+
+@dataclasses.dataclass
+class GetGraphNeighborhoodResultConceptsItem(NoPydanticValidation):
+    id: uuid.UUID
+    name: str
+
+
+@dataclasses.dataclass
+class GetGraphNeighborhoodResultContentsItem(NoPydanticValidation):
+    id: uuid.UUID
+    title: str
+    published_at: datetime.datetime | None
+    authors: list[GetGraphNeighborhoodResultContentsItemAuthorsItem]
+    concepts: list[GetGraphNeighborhoodResultContentsItemConceptsItem]
+    cites: list[GetGraphNeighborhoodResultContentsItemCitesItem]
+
+
+@dataclasses.dataclass
+class GetGraphNeighborhoodResultContentsItemAuthorsItem(NoPydanticValidation):
+    id: uuid.UUID
+
+
+@dataclasses.dataclass
+class GetGraphNeighborhoodResultContentsItemCitesItem(NoPydanticValidation):
+    id: uuid.UUID
+
+
+@dataclasses.dataclass
+class GetGraphNeighborhoodResultContentsItemConceptsItem(NoPydanticValidation):
+    id: uuid.UUID
+
+
+async def get_graph_neighborhood(
+    executor: gel.AsyncIOExecutor,
+    *,
+    depth: int,
+    fanout: int,
+    max_nodes: int,
+    node_id: uuid.UUID,
+) -> GetGraphNeighborhoodResult:
+    return await executor.query_required_single(
+        """\
+        WITH
+            depth := <int64>$depth,
+            fanout := <int64>$fanout,
+            max_nodes := <int64>$max_nodes,
+            start := (SELECT GraphNode FILTER .id = <uuid>$node_id),
+            # Every hop takes up to `fanout` neighbours of each kind per node and up
+            # to `max_nodes` new nodes in all; hops beyond `depth` start from nothing
+            hop1 := (
+                SELECT DISTINCT (
+                    FOR node IN start UNION (
+                        (SELECT node[is Content].authors LIMIT fanout)
+                        UNION (SELECT node[is Content].concepts LIMIT fanout)
+                        UNION (SELECT node[is Content].cites LIMIT fanout)
+                        UNION (SELECT node[is Content].cited_by LIMIT fanout)
+                        UNION (SELECT node[is Author].works LIMIT fanout)
+                        UNION (SELECT node[is Concept].works LIMIT fanout)
+                    )
+                )
+                FILTER .id NOT IN start.id
+                LIMIT max_nodes
+            ),
+            hop2 := (
+                SELECT DISTINCT (
+                    FOR node IN (SELECT hop1 FILTER depth >= 2) UNION (
+                        (SELECT node[is Content].authors LIMIT fanout)
+                        UNION (SELECT node[is Content].concepts LIMIT fanout)
+                        UNION (SELECT node[is Content].cites LIMIT fanout)
+                        UNION (SELECT node[is Content].cited_by LIMIT fanout)
+                        UNION (SELECT node[is Author].works LIMIT fanout)
+                        UNION (SELECT node[is Concept].works LIMIT fanout)
+                    )
+                )
+                FILTER .id NOT IN (start UNION hop1).id
+                LIMIT max_nodes
+            ),
+            hop3 := (
+                SELECT DISTINCT (
+                    FOR node IN (SELECT hop2 FILTER depth >= 3) UNION (
+                        (SELECT node[is Content].authors LIMIT fanout)
+                        UNION (SELECT node[is Content].concepts LIMIT fanout)
+                        UNION (SELECT node[is Content].cites LIMIT fanout)
+                        UNION (SELECT node[is Content].cited_by LIMIT fanout)
+                        UNION (SELECT node[is Author].works LIMIT fanout)
+                        UNION (SELECT node[is Concept].works LIMIT fanout)
+                    )
+                )
+                FILTER .id NOT IN (start UNION hop1 UNION hop2).id
+                LIMIT max_nodes
+            ),
+            nodes := start UNION hop1 UNION hop2 UNION hop3,
+        SELECT {
+            found := EXISTS start,
+            # Every edge has a work at one end, so the works carry them all
+            contents := nodes[is Content] {
+                id,
+                title,
+                published_at,
+                authors: { id } FILTER .id IN nodes.id,
+                concepts: { id } FILTER .id IN nodes.id,
+                cites: { id } FILTER .id IN nodes.id
+            },
+            authors := nodes[is Author] {
+                id,
+                name
+            },
+            concepts := nodes[is Concept] {
+                id,
+                name
+            }
+        }\
+        """,
+        depth=depth,
+        fanout=fanout,
+        max_nodes=max_nodes,
+        node_id=node_id,
+    )
@@ -0,0 +1,28 @@
+"""Graph routes."""
+
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+
+from auth.routes import get_current_user
+from auth.models import User
+from dependencies import provide
+from responses import APIResponse
+from graph.models import Neighborhood
+from graph.service import MAX_DEPTH, GraphService
+
+router = APIRouter(prefix="/graph", tags=["graph"])
+
+
+@router.get("/neighbors", response_model=Neighborhood)
+async def get_neighbors(
+    node_id: uuid.UUID = Query(..., alias="id"),
+    depth: int = Query(1, ge=1, le=MAX_DEPTH),
+    fanout: Optional[int] = Query(None, ge=1, description="Neighbours of each kind taken per node"),
+    current_user: User = Depends(get_current_user),
+    graph_service: GraphService = provide(GraphService)
+):
+    """Works, authors and concepts within `depth` hops of a node, and the edges between them."""
+    neighborhood = await graph_service.neighbors(node_id, depth=depth, fanout=fanout)
+    # Returned as a response so FastAPI does not validate the nodes a second time
+    return APIResponse(neighborhood)
@@ -0,0 +1,120 @@
+"""Graph service for walking the knowledge graph."""
+
+import uuid
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from antidote import injectable, inject
+
+from config import GraphConfig
+from database import DatabaseService
+from shared_state import SharedState
+
+# Import generated queries
+from graph.queries import GetGraphNeighborhoodResult, get_graph_neighborhood
+
+# Hops compiled into get_graph_neighborhood.edgeql
+MAX_DEPTH = 3
+
+
+def _to_neighborhood(
+    node_id: uuid.UUID,
+    depth: int,
+    fanout: int,
+    result: GetGraphNeighborhoodResult
+) -> Dict[str, Any]:
+    """Flatten the query result into nodes and edges, with each node's hop distance.
+    
+    Returns a plain dict shaped like Neighborhood, so it can be cached and sent
+    through APIResponse as is.
+    """
+    labels: Dict[str, Tuple[str, str]] = {}
+    edges: List[Dict[str, str]] = []
+    for content in result.contents:
+        source = str(content.id)
+        labels[source] = ("content", content.title)
+        for kind, targets in (
+            ("authored_by", content.authors),
+            ("discusses", content.concepts),
+            ("cites", content.cites),
+        ):
+            edges.extend({"source": source, "target": str(target.id), "kind": kind} for target in targets)
+    for author in result.authors:
+        labels[str(author.id)] = ("author", author.name)
+    for concept in result.concepts:
+        labels[str(concept.id)] = ("concept", concept.name)
+    
+    # Breadth-first over the returned edges, ignoring direction
+    adjacent = defaultdict(list)
+    for edge in edges:
+        adjacent[edge["source"]].append(edge["target"])
+        adjacent[edge["target"]].append(edge["source"])
+    start = str(node_id)
+    depths = {start: 0}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for neighbour in adjacent[current]:
+            if neighbour not in depths:
+                depths[neighbour] = depths[current] + 1
+                queue.append(neighbour)
+    
+    nodes = [
+        {"id": id_, "kind": kind, "label": label, "depth": depths.get(id_, depth)}
+        for id_, (kind, label) in labels.items()
+    ]
+    nodes.sort(key=lambda node: (node["depth"], node["kind"], node["label"]))
+    return {"id": start, "depth": depth, "fanout": fanout, "nodes": nodes, "edges": edges}
+
+
+@injectable
+class GraphService:
+    """Service for knowledge graph traversal."""
+    
+    def __init__(
+        self,
+        db: DatabaseService = inject[DatabaseService],
+        config: GraphConfig = inject[GraphConfig],
+        state: SharedState = inject[SharedState]
+    ):
+        self.db = db
+        self.config = config
+        # Popular nodes (a prolific author, a central concept) are walked once per TTL
+        self._cache = state.cache("graph", config.cache_ttl_seconds)
+    
+    async def neighbors(
+        self,
+        node_id: uuid.UUID,
+        depth: int = 1,
+        fanout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Walk up to `depth` hops from a node in one query.
+        
+        Returns a plain dict shaped like Neighborhood for APIResponse.
+        """
+        depth = min(depth, MAX_DEPTH)
+        fanout = min(fanout or self.config.default_fanout, self.config.max_fanout)
+        
+        key = f"{node_id}|{depth}|{fanout}"
+        cached = await self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        client = await self.db.get_client()
+        result = await get_graph_neighborhood(
+            client,
+            node_id=node_id,
+            depth=depth,
+            fanout=fanout,
+            max_nodes=self.config.max_nodes_per_hop
+        )
+        if not result.found:
+            raise HTTPException(status_code=404, detail="Node not found")
+        
+        neighborhood = _to_neighborhood(node_id, depth, fanout, result)
+        await self._cache.set(key, neighborhood)
+        return neighborhood
+    
+    def cache_stats(self) -> dict:
+        """Return neighbourhood cache size and hit/miss counters."""
+        return self._cache.stats()
@@ -0,0 +1,49 @@
+"""Conditional GET support: validators derived from a data version."""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+from fastapi import Request
+
+
+def make_etag(resource: str, version: Union[int, str]) -> str:
+    """Weak validator for a representation that changes whenever `version` does."""
+    return f'W/"{resource}-{version}"'
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """Headers letting browsers and proxies keep a copy but revalidate it on every use."""
+    headers = {
+        "ETag": etag,
+        # Responses depend on the caller being authenticated, so shared caches must not serve them
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no tags were sent."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or _opaque(etag) in map(_opaque, tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole-second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
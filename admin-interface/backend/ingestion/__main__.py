@@ -0,0 +1,39 @@
+"""Run the ingestion worker: python -m ingestion [--once]."""
+
+import argparse
+import asyncio
+import json
+import logging
+from antidote import world
+
+from config import IngestionConfig, load_env
+from database import DatabaseService
+from ingestion.worker import IngestionWorker
+
+
+async def main(once: bool):
+    config: IngestionConfig = world[IngestionConfig]
+    if not config.youtube_api_key:
+        logging.warning("YOUTUBE_API_KEY is not set; only a fake API server will accept requests")
+
+    db_service: DatabaseService = world[DatabaseService]
+    worker: IngestionWorker = world[IngestionWorker]
+    await db_service.startup()
+    try:
+        if once:
+            report = await worker.run_once()
+            print(json.dumps(report.summary()))
+        else:
+            await worker.run_forever()
+    finally:
+        await worker.close()
+        await db_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect video metadata for active YouTube sources")
+    parser.add_argument("--once", action="store_true", help="crawl every source once and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_env()
+    asyncio.run(main(args.once))
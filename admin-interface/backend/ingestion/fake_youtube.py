@@ -0,0 +1,148 @@
+"""Local stand-in for the YouTube Data API, for offline ingestion runs and benchmarks.
+
+Serves deterministic channels and uploads for the three endpoints the worker
+uses, honours If-None-Match, charges one quota unit per call and answers with
+the API's quotaExceeded error once the daily quota is spent.
+
+    python -m ingestion.fake_youtube --channels 100 --videos 500 --port 8081
+    YOUTUBE_API_URL=http://localhost:8081/youtube/v3 python -m ingestion --once
+"""
+
+import argparse
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class FakeYouTubeState:
+    """Uploads per channel plus quota and request accounting."""
+    channels: int = 10
+    videos_per_channel: int = 100
+    quota: int = 10_000
+    latency_ms: float = 0.0
+    used: int = 0
+    not_modified: int = 0
+    
+    def channel_id(self, n: int) -> str:
+        return f"UC{n:022d}"
+    
+    def video_ids(self, channel_id: str) -> List[str]:
+        """Upload ids of a channel, newest first."""
+        return [f"{channel_id[2:]}-{i:05d}" for i in reversed(range(self.videos_per_channel))]
+    
+    def published_at(self, video_id: str) -> datetime:
+        channel, index = video_id.rsplit("-", 1)
+        return EPOCH + timedelta(hours=int(index), seconds=int(channel) % 3600)
+    
+    def publish(self, count: int = 1) -> None:
+        """Upload `count` more videos to every channel."""
+        self.videos_per_channel += count
+
+
+def _etag(payload: object) -> str:
+    return '"' + hashlib.sha1(repr(payload).encode()).hexdigest() + '"'
+
+
+def create_fake_youtube_app(state: Optional[FakeYouTubeState] = None) -> FastAPI:
+    """Build the fake API application around `state`."""
+    state = state or FakeYouTubeState()
+    app = FastAPI(title="Fake YouTube Data API")
+    app.state.youtube = state
+
+    async def charge(request: Request, payload: Dict) -> Response:
+        if state.latency_ms:
+            await asyncio.sleep(state.latency_ms / 1000)
+        if state.used >= state.quota:
+            return JSONResponse(
+                {"error": {"code": 403, "errors": [{"reason": "quotaExceeded"}]}},
+                status_code=403,
+            )
+        state.used += 1
+        etag = _etag(payload)
+        if request.headers.get("if-none-match") == etag:
+            state.not_modified += 1
+            return Response(status_code=304, headers={"ETag": etag})
+        return JSONResponse({**payload, "etag": etag}, headers={"ETag": etag})
+
+    @app.get("/youtube/v3/channels")
+    async def channels(
+        request: Request,
+        id: Optional[str] = None,
+        forHandle: Optional[str] = None,
+        forUsername: Optional[str] = None,
+    ):
+        name = id or forHandle or forUsername or ""
+        digits = "".join(c for c in name if c.isdigit())
+        items = []
+        if digits and int(digits) < state.channels:
+            items = [{"id": state.channel_id(int(digits))}]
+        return await charge(request, {"items": items})
+
+    @app.get("/youtube/v3/playlistItems")
+    async def playlist_items(
+        request: Request, playlistId: str, maxResults: int = 5, pageToken: Optional[str] = None
+    ):
+        ids = state.video_ids("UC" + playlistId[2:])
+        start = int(pageToken or 0)
+        page = ids[start:start + maxResults]
+        payload = {
+            "items": [
+                {
+                    "contentDetails": {
+                        "videoId": video_id,
+                        "videoPublishedAt": state.published_at(video_id).isoformat(),
+                    }
+                }
+                for video_id in page
+            ]
+        }
+        if start + maxResults < len(ids):
+            payload["nextPageToken"] = str(start + maxResults)
+        return await charge(request, payload)
+
+    @app.get("/youtube/v3/videos")
+    async def videos(request: Request, id: str):
+        items = [
+            {
+                "id": video_id,
+                "snippet": {
+                    "title": f"Video {video_id}",
+                    "description": f"Description of {video_id}",
+                    "publishedAt": state.published_at(video_id).isoformat(),
+                },
+                "contentDetails": {"duration": f"PT{len(video_id)}M{int(video_id[-2:]) % 60}S"},
+            }
+            for video_id in id.split(",")
+        ]
+        return await charge(request, {"items": items})
+
+    @app.get("/_stats")
+    async def stats():
+        return {"quota_used": state.used, "quota": state.quota, "not_modified": state.not_modified}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--videos", type=int, default=100)
+    parser.add_argument("--quota", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+    state = FakeYouTubeState(
+        channels=args.channels,
+        videos_per_channel=args.videos,
+        quota=args.quota,
+        latency_ms=args.latency_ms,
+    )
+    uvicorn.run(create_fake_youtube_app(state), host="127.0.0.1", port=args.port)
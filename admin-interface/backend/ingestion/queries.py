@@ -0,0 +1,211 @@
+# AUTOGENERATED FROM:
+#     'admin-interface/backend/ingestion/queries/get_crawl_sources.edgeql'
+#     'admin-interface/backend/ingestion/queries/record_crawl_error.edgeql'
+#     'admin-interface/backend/ingestion/queries/record_duplicate_source.edgeql'
+#     'admin-interface/backend/ingestion/queries/set_platform_id.edgeql'
+#     'admin-interface/backend/ingestion/queries/update_crawl_state.edgeql'
+#     'admin-interface/backend/ingestion/queries/upsert_contents.edgeql'
+# WITH:
+#     $ gel-py --dir admin-interface/backend/ingestion/queries --file admin-interface/backend/ingestion/queries.py
+
+
+from __future__ import annotations
+import dataclasses
+import datetime
+import gel
+import uuid
+
+
+class NoPydanticValidation:
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source_type, _handler):
+        # Pydantic 2.x
+        from pydantic_core.core_schema import any_schema
+        return any_schema()
+    
+    @classmethod
+    def __get_validators__(cls):
+        # Pydantic 1.x
+        from pydantic.dataclasses import dataclass as pydantic_dataclass
+        _ = pydantic_dataclass(cls)
+        cls.__pydantic_model__.__get_validators__ = lambda: []
+        return []
+
+
+@dataclasses.dataclass
+class GetCrawlSourcesResult(NoPydanticValidation):
+    id: uuid.UUID
+    url: str
+    platform_id: str | None
+    crawl_etag: str | None
+    crawl_cursor: datetime.datetime | None
+
+
+@dataclasses.dataclass
+class RecordCrawlErrorResult(NoPydanticValidation):
+    id: uuid.UUID
+
+
+async def get_crawl_sources(
+    executor: gel.AsyncIOExecutor,
+    *,
+    type: str,
+) -> list[GetCrawlSourcesResult]:
+    return await executor.query(
+        """\
+        SELECT Source {
+            id,
+            url,
+            platform_id,
+            crawl_etag,
+            crawl_cursor
+        }
+        FILTER .is_active AND .type = <str>$type
+        ORDER BY .id\
+        """,
+        type=type,
+    )
+
+
+async def record_crawl_error(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID,
+    error: str,
+) -> RecordCrawlErrorResult | None:
+    return await executor.query_single(
+        """\
+        UPDATE Source
+        FILTER .id = <uuid>$source_id
+        SET {
+            last_crawl_at := datetime_of_statement(),
+            last_error := <str>$error,
+            stats_updated_at := datetime_of_statement()
+        }\
+        """,
+        source_id=source_id,
+        error=error,
+    )
+
+
+async def record_duplicate_source(
+    executor: gel.AsyncIOExecutor,
+    *,
+    type: str,
+    platform_id: str,
+    source_id: uuid.UUID,
+) -> RecordCrawlErrorResult | None:
+    return await executor.query_single(
+        """\
+        WITH
+            original := (
+                SELECT DETACHED Source
+                FILTER .type = <str>$type AND .platform_id = <str>$platform_id
+                LIMIT 1
+            )
+        UPDATE Source
+        FILTER .id = <uuid>$source_id
+        SET {
+            is_active := false,
+            last_crawl_at := datetime_of_statement(),
+            last_error := 'Same channel as source ' ++ <str>original.id,
+            stats_updated_at := datetime_of_statement()
+        }\
+        """,
+        type=type,
+        platform_id=platform_id,
+        source_id=source_id,
+    )
+
+
+async def set_platform_id(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID,
+    platform_id: str,
+) -> RecordCrawlErrorResult | None:
+    return await executor.query_single(
+        """\
+        UPDATE Source
+        FILTER .id = <uuid>$source_id
+        SET {
+            platform_id := <str>$platform_id
+        }\
+        """,
+        source_id=source_id,
+        platform_id=platform_id,
+    )
+
+
+async def update_crawl_state(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID,
+    platform_id: str | None = None,
+    crawl_etag: str | None = None,
+    crawl_cursor: datetime.datetime | None = None,
+) -> RecordCrawlErrorResult | None:
+    return await executor.query_single(
+        """\
+        UPDATE Source
+        FILTER .id = <uuid>$source_id
+        SET {
+            platform_id := <optional str>$platform_id ?? .platform_id,
+            crawl_etag := <optional str>$crawl_etag ?? .crawl_etag,
+            crawl_cursor := <optional datetime>$crawl_cursor ?? .crawl_cursor,
+            last_crawl_at := datetime_of_statement(),
+            last_error := {},
+            stats_updated_at := datetime_of_statement()
+        }\
+        """,
+        source_id=source_id,
+        platform_id=platform_id,
+        crawl_etag=crawl_etag,
+        crawl_cursor=crawl_cursor,
+    )
+
+
+async def upsert_contents(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID,
+    items: str,
+) -> int:
+    return await executor.query_single(
+        """\
+        WITH
+            source := (SELECT Source FILTER .id = <uuid>$source_id),
+        SELECT count((
+            FOR item IN json_array_unpack(<json>$items) UNION (
+                WITH
+                    content_hash := <str>item['content_hash'],
+                INSERT Content {
+                    source := source,
+                    external_id := <str>item['external_id'],
+                    content_hash := content_hash,
+                    title := <str>item['title'],
+                    description := <str>json_get(item, 'description'),
+                    url := <str>json_get(item, 'url'),
+                    duration := to_duration(seconds := <float64>json_get(item, 'duration_seconds')),
+                    published_at := <datetime>json_get(item, 'published_at')
+                }
+                UNLESS CONFLICT ON (.source, .external_id)
+                ELSE (
+                    # Known items are rewritten only when their metadata changed
+                    UPDATE Content
+                    FILTER .content_hash ?!= content_hash
+                    SET {
+                        content_hash := content_hash,
+                        title := <str>item['title'],
+                        description := <str>json_get(item, 'description'),
+                        url := <str>json_get(item, 'url'),
+                        duration := to_duration(seconds := <float64>json_get(item, 'duration_seconds')),
+                        published_at := <datetime>json_get(item, 'published_at')
+                    }
+                )
+            )
+        ))\
+        """,
+        source_id=source_id,
+        items=items,
+    )
@@ -0,0 +1,36 @@
+"""Token-bucket rate limiting for outbound API calls."""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket refilled at `rate` tokens per second up to `capacity`."""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and take them."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+    
+    @property
+    def available(self) -> float:
+        """Tokens that could be taken right now."""
+        self._refill()
+        return self._tokens
@@ -0,0 +1,220 @@
+"""Ingestion worker collecting video metadata for active YouTube sources."""
+
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from antidote import injectable, inject
+import gel
+import httpx
+
+from config import IngestionConfig
+from database import DatabaseService
+from ingestion.ratelimit import TokenBucket
+from ingestion.youtube import QuotaExceeded, YouTubeClient
+
+# Import generated queries
+from ingestion.queries import (
+    GetCrawlSourcesResult,
+    get_crawl_sources,
+    record_crawl_error,
+    record_duplicate_source,
+    set_platform_id,
+    update_crawl_state,
+    upsert_contents,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceReport:
+    """Outcome of crawling one source."""
+    source_id: uuid.UUID
+    requests: int = 0
+    fetched: int = 0
+    # Inserted or changed; re-crawled videos with unchanged metadata are skipped
+    written: int = 0
+    not_modified: bool = False
+    # Older uploads were left unread by the page cap and will not be crawled
+    truncated: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class IngestionReport:
+    """Outcome of one pass over all sources."""
+    sources: List[SourceReport] = field(default_factory=list)
+    quota_exceeded: bool = False
+    
+    def summary(self) -> Dict[str, int]:
+        return {
+            "sources": len(self.sources),
+            "requests": sum(r.requests for r in self.sources),
+            "fetched": sum(r.fetched for r in self.sources),
+            "written": sum(r.written for r in self.sources),
+            "not_modified": sum(r.not_modified for r in self.sources),
+            "truncated": sum(r.truncated for r in self.sources),
+            "errors": sum(r.error is not None for r in self.sources),
+        }
+
+
+@injectable
+class IngestionWorker:
+    """Fetches channel uploads concurrently and upserts them as Content."""
+    
+    def __init__(
+        self,
+        db: DatabaseService = inject[DatabaseService],
+        config: IngestionConfig = inject[IngestionConfig]
+    ):
+        self.db = db
+        self.config = config
+        self.limiter = TokenBucket(config.rate_per_second, config.burst)
+        self._source_limiters: Dict[uuid.UUID, TokenBucket] = {}
+        self._http: Optional[httpx.AsyncClient] = None
+        self._quota_exhausted = False
+        # Set before the first crawl to talk to an in-process fake API
+        self.transport: Optional[httpx.AsyncBaseTransport] = None
+    
+    def _source_limiter(self, source_id: uuid.UUID) -> TokenBucket:
+        limiter = self._source_limiters.get(source_id)
+        if limiter is None:
+            limiter = TokenBucket(self.config.source_rate_per_second, self.config.source_burst)
+            self._source_limiters[source_id] = limiter
+        return limiter
+    
+    def _youtube(self, source_id: uuid.UUID) -> YouTubeClient:
+        """Return an API client for one source, sharing the HTTP connection pool."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.config.youtube_api_url.rstrip("/") + "/",
+                timeout=self.config.request_timeout_seconds,
+                limits=httpx.Limits(max_connections=self.config.concurrency),
+                transport=self.transport,
+            )
+        limiters = (self._source_limiter(source_id), self.limiter)
+        return YouTubeClient(self._http, self.config.youtube_api_key, limiters)
+    
+    async def close(self):
+        """Close the HTTP connection pool."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    async def ingest_source(self, source: GetCrawlSourcesResult) -> SourceReport:
+        """Fetch uploads newer than the source's cursor and upsert them."""
+        report = SourceReport(source_id=source.id)
+        youtube = self._youtube(source.id)
+        client = await self.db.get_client()
+        
+        try:
+            channel_id = source.platform_id
+            if channel_id is None:
+                channel_id = await youtube.resolve_channel_id(source.url)
+                if channel_id is None:
+                    report.error = f"Cannot resolve a channel id from {source.url}"
+                    await self._record_error(client, report)
+                    return report
+                # Claimed before crawling: another source resolving to the same
+                # channel is a duplicate whose URL is spelled differently
+                try:
+                    await set_platform_id(client, source_id=source.id, platform_id=channel_id)
+                except gel.ConstraintViolationError:
+                    await record_duplicate_source(
+                        client, type="youtube", platform_id=channel_id, source_id=source.id
+                    )
+                    report.error = f"Channel {channel_id} is already crawled by another source"
+                    logger.info("Deactivated source %s: %s", source.id, report.error)
+                    return report
+            
+            uploads = await youtube.uploads_since(
+                channel_id,
+                since=source.crawl_cursor,
+                etag=source.crawl_etag,
+                max_pages=self.config.max_pages_per_source,
+            )
+            report.not_modified = uploads.not_modified
+            report.fetched = len(uploads.videos)
+            report.truncated = uploads.truncated
+            if uploads.truncated:
+                logger.info(
+                    "Source %s has uploads beyond %d pages that are not crawled",
+                    source.id, self.config.max_pages_per_source,
+                )
+            
+            # One statement cannot upsert the same video twice; pages may overlap while uploads shift
+            videos = list({video.external_id: video for video in uploads.videos}.values())
+            batch_size = self.config.write_batch_size
+            for start in range(0, len(videos), batch_size):
+                batch = videos[start:start + batch_size]
+                report.written += await upsert_contents(
+                    client,
+                    source_id=source.id,
+                    items=json.dumps([video.to_json() for video in batch]),
+                )
+            
+            # Advance the cursor only after every batch is stored
+            cursor = max((v.published_at for v in uploads.videos), default=None)
+            if source.crawl_cursor is not None and cursor is not None:
+                cursor = max(cursor, source.crawl_cursor)
+            await update_crawl_state(
+                client,
+                source_id=source.id,
+                platform_id=channel_id,
+                crawl_etag=uploads.etag,
+                crawl_cursor=cursor,
+            )
+        except QuotaExceeded:
+            self._quota_exhausted = True
+            raise
+        except (httpx.HTTPError, gel.EdgeDBError, ValueError, KeyError) as e:
+            report.error = f"{type(e).__name__}: {e}"
+            logger.warning("Ingestion of source %s failed: %s", source.id, report.error)
+            await self._record_error(client, report)
+        finally:
+            report.requests = youtube.requests
+        return report
+    
+    async def _record_error(self, client, report: SourceReport):
+        """Store a crawl error, shown on the source listing until a later crawl succeeds."""
+        try:
+            await record_crawl_error(client, source_id=report.source_id, error=report.error)
+        except gel.EdgeDBError as e:
+            # The report still carries the error; one source must not end the pass
+            logger.warning("Cannot record the crawl error of source %s: %s", report.source_id, e)
+    
+    async def run_once(self) -> IngestionReport:
+        """Crawl every active YouTube source once."""
+        client = await self.db.get_client()
+        sources = await get_crawl_sources(client, type="youtube")
+        report = IngestionReport()
+        self._quota_exhausted = False
+        semaphore = asyncio.Semaphore(self.config.concurrency)
+        
+        async def crawl(source: GetCrawlSourcesResult) -> Optional[SourceReport]:
+            async with semaphore:
+                # Sources still queued when the quota runs out are left for the next pass
+                if self._quota_exhausted:
+                    return None
+                try:
+                    return await self.ingest_source(source)
+                except QuotaExceeded:
+                    return None
+        
+        for result in await asyncio.gather(*(crawl(source) for source in sources)):
+            if result is not None:
+                report.sources.append(result)
+        report.quota_exceeded = self._quota_exhausted
+        return report
+    
+    async def run_forever(self):
+        """Crawl all sources every `interval_seconds`."""
+        while True:
+            report = await self.run_once()
+            logger.info("Ingestion pass: %s", report.summary())
+            if report.quota_exceeded:
+                logger.warning("YouTube quota exhausted, remaining sources deferred")
+            await asyncio.sleep(self.config.interval_seconds)
@@ -0,0 +1,201 @@
+"""Minimal async client for the YouTube Data API v3."""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from ingestion.ratelimit import TokenBucket
+
+# Pages of the uploads playlist and video ids per videos.list call
+PAGE_SIZE = 50
+
+_DURATION = re.compile(
+    r"P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?"
+)
+
+
+class QuotaExceeded(Exception):
+    """The API key has no quota left for today."""
+
+
+@dataclass
+class Video:
+    """Video metadata in the shape written to Content."""
+    external_id: str
+    title: str
+    description: Optional[str]
+    url: str
+    duration_seconds: Optional[float]
+    published_at: datetime
+    
+    def to_json(self) -> Dict[str, Any]:
+        fields = {
+            "external_id": self.external_id,
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "duration_seconds": self.duration_seconds,
+            "published_at": self.published_at.isoformat(),
+        }
+        # Stored with the row, so the upsert can skip videos whose metadata has not changed
+        fields["content_hash"] = hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+        return fields
+
+
+@dataclass
+class Uploads:
+    """Result of an incremental uploads listing."""
+    not_modified: bool = False
+    etag: Optional[str] = None
+    videos: List[Video] = field(default_factory=list)
+    # Stopped at `max_pages` with older uploads newer than `since` left unread
+    truncated: bool = False
+
+
+def parse_channel_url(url: str) -> Optional[Tuple[str, str]]:
+    """Return the channels.list filter ("id", "forHandle" or "forUsername") for a channel URL."""
+    parsed = urlparse(url if "//" in url else f"https://{url}")
+    parts = [p for p in parsed.path.split("/") if p]
+    if not parts:
+        return None
+    if parts[0].startswith("@"):
+        return "forHandle", parts[0]
+    if parts[0] == "channel" and len(parts) > 1:
+        return "id", parts[1]
+    if parts[0] == "user" and len(parts) > 1:
+        return "forUsername", parts[1]
+    # Legacy /c/<name> custom URLs cannot be resolved through channels.list
+    return None
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Convert an ISO 8601 duration such as PT1H2M3S into seconds."""
+    match = _DURATION.fullmatch(value or "")
+    if not value or not match:
+        return None
+    parts = {k: int(v) for k, v in match.groupdict().items() if v}
+    return float(
+        parts.get("days", 0) * 86400
+        + parts.get("hours", 0) * 3600
+        + parts.get("minutes", 0) * 60
+        + parts.get("seconds", 0)
+    )
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class YouTubeClient:
+    """YouTube Data API calls, each one paid for from every given token bucket."""
+    
+    def __init__(self, http: httpx.AsyncClient, api_key: str, limiters: Sequence[TokenBucket] = ()):
+        self.http = http
+        self.api_key = api_key
+        # Narrowest limit first, so waiting on it does not hold shared tokens
+        self.limiters = limiters
+        self.requests = 0
+    
+    async def _get(
+        self, path: str, params: Dict[str, Any], etag: Optional[str] = None
+    ) -> Optional[httpx.Response]:
+        """Issue one API call; returns None when the ETag still matches."""
+        for limiter in self.limiters:
+            await limiter.acquire()
+        self.requests += 1
+        
+        headers = {"If-None-Match": etag} if etag else {}
+        response = await self.http.get(path, params={**params, "key": self.api_key}, headers=headers)
+        if response.status_code == 304:
+            return None
+        if response.status_code == 403 and "quotaExceeded" in response.text:
+            raise QuotaExceeded(response.text)
+        response.raise_for_status()
+        return response
+    
+    async def resolve_channel_id(self, url: str) -> Optional[str]:
+        """Look up the channel id for a channel URL."""
+        ref = parse_channel_url(url)
+        if ref is None:
+            return None
+        kind, value = ref
+        if kind == "id":
+            return value
+        response = await self._get("channels", {"part": "id", kind: value})
+        items = response.json().get("items", [])
+        return items[0]["id"] if items else None
+    
+    async def uploads_since(
+        self,
+        channel_id: str,
+        since: Optional[datetime],
+        etag: Optional[str] = None,
+        max_pages: int = 1,
+    ) -> Uploads:
+        """List uploads published after `since`, newest first.
+        
+        The ETag only covers the first page; if it still matches nothing
+        was uploaded and no further calls are made. Listing starts from the
+        newest upload, so uploads beyond `max_pages` pages are never reached.
+        """
+        # Every channel's uploads playlist id is its channel id with a UU prefix
+        playlist_id = "UU" + channel_id[2:]
+        result = Uploads()
+        video_ids: List[str] = []
+        page_token: Optional[str] = None
+        
+        for page in range(max_pages):
+            params = {"part": "contentDetails", "playlistId": playlist_id, "maxResults": PAGE_SIZE}
+            if page_token:
+                params["pageToken"] = page_token
+            response = await self._get("playlistItems", params, etag if page == 0 else None)
+            if response is None:
+                result.not_modified = True
+                return result
+            
+            body = response.json()
+            if page == 0:
+                result.etag = response.headers.get("ETag") or body.get("etag")
+            
+            reached_cursor = False
+            for item in body.get("items", []):
+                details = item["contentDetails"]
+                published = details.get("videoPublishedAt")
+                if since is not None and published and _parse_time(published) <= since:
+                    reached_cursor = True
+                    break
+                video_ids.append(details["videoId"])
+            
+            page_token = body.get("nextPageToken")
+            if reached_cursor or not page_token:
+                break
+        else:
+            result.truncated = True
+        
+        for start in range(0, len(video_ids), PAGE_SIZE):
+            batch = video_ids[start:start + PAGE_SIZE]
+            response = await self._get(
+                "videos",
+                {"part": "snippet,contentDetails", "id": ",".join(batch), "maxResults": PAGE_SIZE},
+            )
+            result.videos.extend(self._to_video(item) for item in response.json().get("items", []))
+        
+        return result
+    
+    @staticmethod
+    def _to_video(item: Dict[str, Any]) -> Video:
+        snippet = item["snippet"]
+        return Video(
+            external_id=item["id"],
+            title=snippet["title"],
+            description=snippet.get("description") or None,
+            url=f"https://www.youtube.com/watch?v={item['id']}",
+            duration_seconds=parse_duration(item.get("contentDetails", {}).get("duration")),
+            published_at=_parse_time(snippet["publishedAt"]),
+        )
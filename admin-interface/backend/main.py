@@ -1,26 +1,71 @@
-"""Main FastAPI application with Antidote dependency injection."""
+"""Main FastAPI application with Antidote dependency injection.
 
-import os
-from fastapi import FastAPI
+Nothing happens at import: serve the app through its factory,
+`uvicorn main:create_app --factory`, or run `python main.py`.
+"""
+
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from antidote import world
 
-# Import config first to ensure .env is loaded
-from config import AppConfig
+from config import AppConfig, load_env
 from database import DatabaseService
+from auth.api_keys import ApiKeyService
+from auth.service import AuthService
+from contents.service import ContentService
+from graph.service import GraphService
+from observability import METRICS_CONTENT_TYPE, InstrumentationMiddleware, Metrics, setup_tracing, shutdown_tracing
+from responses import APIResponse
+from shared_state import SharedState
 # Import modular routes
 from auth.routes import router as auth_router
 from sources.routes import router as sources_router
+from contents.routes import router as contents_router
+from graph.routes import router as graph_router
+
+router = APIRouter()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to the database before serving and close it on shutdown."""
+    print("🚀 Starting Grundrisse Admin API...")
+    
+    config: AppConfig = world[AppConfig]
+    print(f"📋 App: {config.title} v{config.version}")
+    print(f"🗄️ Database: {config.database.host}:{config.database.port}/{config.database.database}")
+    print(f"🌐 Server: {config.server.host}:{config.server.port} (debug={config.server.debug})")
+    
+    # Connect and warm the pool before accepting traffic
+    db_service: DatabaseService = world[DatabaseService]
+    await db_service.startup()
+    print(f"🔌 Database pool: {db_service.pool_stats()}")
+    
+    # Initialize database
+    await db_service.initialize()
+    
+    print("✅ Application startup complete!")
+    try:
+        yield
+    finally:
+        await db_service.close()
+        await world[SharedState].close()
+        shutdown_tracing()
 
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
+    # The one place configuration is read; services are built on first use
+    load_env()
     config: AppConfig = world[AppConfig]
     
     app = FastAPI(
         title=config.title,
         version=config.version,
-        description=config.description
+        description=config.description,
+        default_response_class=APIResponse,
+        lifespan=lifespan
     )
     
     # CORS middleware
@@ -32,42 +77,27 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Added last so it wraps CORS and also times preflight requests
+    metrics: Metrics = world[Metrics]
+    app.add_middleware(InstrumentationMiddleware, metrics=metrics)
+    metrics.track_pool(lambda: world[DatabaseService].pool_stats())
+    metrics.track_cache("auth_token", lambda: world[AuthService].token_cache_stats())
+    metrics.track_cache("api_key", lambda: world[ApiKeyService].cache_stats())
+    metrics.track_cache("contents_search", lambda: world[ContentService].search_cache_stats())
+    metrics.track_cache("graph_neighbors", lambda: world[GraphService].cache_stats())
+    setup_tracing(config.observability)
+    
     # Include routers
+    app.include_router(router)
     app.include_router(auth_router)
     app.include_router(sources_router)
+    app.include_router(contents_router)
+    app.include_router(graph_router)
     
     return app
 
 
-app = create_app()
-
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize application on startup."""
-    print("🚀 Starting Grundrisse Admin API...")
-    
-    # Double-check environment is loaded
-    config: AppConfig = world[AppConfig]
-    print(f"📋 App: {config.title} v{config.version}")
-    print(f"🗄️ Database: {config.database.host}:{config.database.port}/{config.database.database}")
-    print(f"🌐 Server: {config.server.host}:{config.server.port} (debug={config.server.debug})")
-    
-    # Initialize database
-    db_service: DatabaseService = world[DatabaseService]
-    await db_service.initialize()
-    
-    print("✅ Application startup complete!")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on application shutdown."""
-    db_service: DatabaseService = world[DatabaseService]
-    await db_service.close()
-
-
-@app.get("/")
+@router.get("/")
 async def root():
     """Root endpoint with API information."""
     config: AppConfig = world[AppConfig]
@@ -78,12 +108,33 @@ async def root():
     }
 
 
+@router.get("/health")
+async def health():
+    """Health check with database pool utilisation."""
+    db_service: DatabaseService = world[DatabaseService]
+    return {
+        "status": "ok",
+        "database_pool": db_service.pool_stats()
+    }
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(world[Metrics].render(), media_type=METRICS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
+    # Single development process; production runs `python -m serve`
     import uvicorn
+    load_env()
     config: AppConfig = world[AppConfig]
     uvicorn.run(
-        app, 
-        host=config.server.host, 
+        "main:create_app",
+        factory=True,
+        host=config.server.host,
         port=config.server.port,
-        debug=config.server.debug
-    )
\ No newline at end of file
+        reload=config.server.debug,
+        proxy_headers=True,
+        forwarded_allow_ips=config.server.forwarded_allow_ips
+    )
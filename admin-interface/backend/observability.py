@@ -0,0 +1,187 @@
+"""Prometheus metrics and OpenTelemetry tracing for the API."""
+
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from antidote import injectable
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from config import ObservabilityConfig
+
+# A no-op until setup_tracing installs an SDK provider
+tracer = trace.get_tracer("grundrisse")
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Most queries finish in a few milliseconds; the HTTP defaults start at 5ms
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+StatsProvider = Callable[[], Dict[str, int]]
+
+
+class _StateCollector:
+    """Reads pool and cache counters from their owners at scrape time."""
+    
+    def __init__(self):
+        self.pool: Optional[StatsProvider] = None
+        self.caches: Dict[str, StatsProvider] = {}
+    
+    def collect(self):
+        if self.pool is not None:
+            stats = self.pool()
+            yield GaugeMetricFamily(
+                "edgedb_pool_max_concurrency", "Connections the pool may open",
+                value=stats["max_concurrency"]
+            )
+            connections = GaugeMetricFamily(
+                "edgedb_pool_connections", "Pool connections by state", labels=["state"]
+            )
+            connections.add_metric(["in_use"], stats["in_use"])
+            connections.add_metric(["free"], stats["free"])
+            yield connections
+        
+        if self.caches:
+            entries = GaugeMetricFamily("cache_entries", "Entries held", labels=["cache"])
+            hits = CounterMetricFamily("cache_hits", "Lookups served from the cache", labels=["cache"])
+            misses = CounterMetricFamily("cache_misses", "Lookups that missed the cache", labels=["cache"])
+            for name, provider in self.caches.items():
+                stats = provider()
+                entries.add_metric([name], stats["size"])
+                hits.add_metric([name], stats["hits"])
+                misses.add_metric([name], stats["misses"])
+            yield from (entries, hits, misses)
+
+
+@injectable
+class Metrics:
+    """Prometheus registry with the API's request, query and state metrics."""
+    
+    def __init__(self):
+        self.registry = CollectorRegistry()
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template and status",
+            ["method", "route", "status"],
+            registry=self.registry,
+        )
+        self.query_duration = Histogram(
+            "edgedb_query_duration_seconds",
+            "EdgeQL query latency by query name",
+            ["query", "outcome"],
+            buckets=QUERY_BUCKETS,
+            registry=self.registry,
+        )
+        self.login_attempts = Counter(
+            "login_attempts",
+            "Login attempts by outcome: success, failure or limited by username or IP",
+            ["outcome"],
+            registry=self.registry,
+        )
+        self._state = _StateCollector()
+        self.registry.register(self._state)
+    
+    def track_pool(self, provider: StatsProvider):
+        """Report connection pool usage from `provider` (DatabaseService.pool_stats)."""
+        self._state.pool = provider
+    
+    def track_cache(self, name: str, provider: StatsProvider):
+        """Report size and hit/miss counters from a TTLCache.stats-like provider."""
+        self._state.caches[name] = provider
+    
+    def render(self) -> bytes:
+        """Current values in the Prometheus text format."""
+        if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+            return generate_latest(self.registry)
+        
+        # Under `python -m serve` histograms are summed over every worker's files;
+        # pool and cache state is that of the worker answering the scrape
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(self._state)
+        return generate_latest(registry)
+
+
+def _route_template(scope) -> str:
+    # FastAPI leaves the matched route in the scope; raw paths would explode label cardinality
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    """Times every request by route template and wraps it in a server span.
+    
+    A plain ASGI middleware, so streamed bodies are timed in full and the
+    spans of queries run by the handler become children of the request span.
+    """
+    
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        method = scope["method"]
+        # Continue a trace started by the caller (W3C traceparent)
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        start = time.perf_counter()
+        with tracer.start_as_current_span(
+            method,
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = _route_template(scope)
+                span.update_name(f"{method} {route}")
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status)
+                self.metrics.request_duration.labels(method, route, str(status)).observe(
+                    time.perf_counter() - start
+                )
+
+
+_provider = None
+
+
+def setup_tracing(config: ObservabilityConfig) -> bool:
+    """Export spans over OTLP/HTTP when an endpoint is configured."""
+    global _provider
+    if not config.otlp_endpoint or _provider is not None:
+        return _provider is not None
+    
+    # The SDK and exporter are only loaded when tracing is on
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    
+    _provider = TracerProvider(resource=Resource.create({"service.name": config.service_name}))
+    _provider.add_span_processor(
+        BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{config.otlp_endpoint.rstrip('/')}/v1/traces"))
+    )
+    trace.set_tracer_provider(_provider)
+    return True
+
+
+def shutdown_tracing():
+    """Flush spans still waiting in the batch processor."""
+    if _provider is not None:
+        _provider.shutdown()
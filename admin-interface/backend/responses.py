@@ -0,0 +1,16 @@
+"""JSON response encoded with orjson, byte-compatible with pydantic's output."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# pydantic writes UTC datetimes with a trailing Z; keep clients seeing the same strings
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class APIResponse(ORJSONResponse):
+    """Default response class; also returned directly by routes that skip response_model validation."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
@@ -0,0 +1 @@
+# Scheduler module
@@ -0,0 +1,46 @@
+"""Run the crawl scheduler: python -m scheduler [--once]."""
+
+import argparse
+import asyncio
+import json
+import logging
+from antidote import world
+
+from config import SchedulerConfig, load_env
+from database import DatabaseService
+from ingestion.worker import IngestionWorker
+from scheduler.service import Scheduler
+
+
+async def main(once: bool):
+    db_service: DatabaseService = world[DatabaseService]
+    worker: IngestionWorker = world[IngestionWorker]
+    scheduler: Scheduler = world[Scheduler]
+    await db_service.startup()
+    logging.info("Scheduler %s running %s jobs", scheduler.owner, world[SchedulerConfig].source_types)
+    try:
+        if once:
+            outcomes = await scheduler.run_once()
+            print(json.dumps([
+                {
+                    "source_id": str(o.source_id),
+                    "new_items": o.new_items,
+                    "next_in_seconds": o.next_in.total_seconds() if o.next_in else None,
+                    "error": o.error,
+                }
+                for o in outcomes
+            ]))
+        else:
+            await scheduler.run_forever()
+    finally:
+        await worker.close()
+        await db_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run due per-source crawl jobs")
+    parser.add_argument("--once", action="store_true", help="run one batch of due jobs and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_env()
+    asyncio.run(main(args.once))
@@ -0,0 +1,175 @@
+"""Job storage backends for the crawl scheduler."""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+from antidote import injectable, inject
+
+from database import DatabaseService
+
+# Import generated queries
+from scheduler.queries import (
+    claim_crawl_jobs,
+    complete_crawl_job,
+    ensure_crawl_jobs,
+    fail_crawl_job,
+)
+
+
+@dataclass
+class ClaimedJob:
+    """A job leased to one scheduler process.
+    
+    `source` carries the crawl state the ingestion worker needs: id, type,
+    url, platform_id, crawl_etag and crawl_cursor.
+    """
+    id: uuid.UUID
+    interval: timedelta
+    attempts: int
+    source: Any
+
+
+class JobBackend(Protocol):
+    """Durable queue of per-source crawl jobs with lease-based claiming."""
+    
+    async def ensure_jobs(self, types: Sequence[str], interval: timedelta) -> int:
+        """Create jobs for active sources of `types` that have none; returns how many."""
+        ...
+    
+    async def claim(self, owner: str, limit: int, lease: timedelta) -> List[ClaimedJob]:
+        """Lease up to `limit` due jobs to `owner`."""
+        ...
+    
+    async def complete(
+        self, job_id: uuid.UUID, owner: str, new_items: int, interval: timedelta
+    ) -> bool:
+        """Record a successful run and schedule the next; False if the lease was lost."""
+        ...
+    
+    async def fail(self, job_id: uuid.UUID, owner: str, error: str, retry_in: timedelta) -> bool:
+        """Record a failed run and schedule a retry; False if the lease was lost."""
+        ...
+
+
+@injectable
+class GelJobBackend:
+    """Jobs stored as CrawlJob objects, shared by every scheduler process.
+    
+    Claims run at serializable isolation: when two processes race for the same
+    jobs one of them conflicts and is retried by the client, so a job is never
+    leased twice.
+    """
+    
+    def __init__(self, db: DatabaseService = inject[DatabaseService]):
+        self.db = db
+    
+    async def ensure_jobs(self, types: Sequence[str], interval: timedelta) -> int:
+        client = await self.db.get_client()
+        return await ensure_crawl_jobs(client, types=list(types), interval=interval)
+    
+    async def claim(self, owner: str, limit: int, lease: timedelta) -> List[ClaimedJob]:
+        client = await self.db.get_client()
+        jobs = await claim_crawl_jobs(client, limit=limit, owner=owner, lease=lease)
+        return [
+            ClaimedJob(id=job.id, interval=job.interval, attempts=job.attempts, source=job.source)
+            for job in jobs
+        ]
+    
+    async def complete(
+        self, job_id: uuid.UUID, owner: str, new_items: int, interval: timedelta
+    ) -> bool:
+        client = await self.db.get_client()
+        result = await complete_crawl_job(
+            client, job_id=job_id, owner=owner, interval=interval, new_items=new_items
+        )
+        return result is not None
+    
+    async def fail(self, job_id: uuid.UUID, owner: str, error: str, retry_in: timedelta) -> bool:
+        client = await self.db.get_client()
+        result = await fail_crawl_job(
+            client, job_id=job_id, owner=owner, retry_in=retry_in, error=error
+        )
+        return result is not None
+
+
+@dataclass
+class _MemoryJob:
+    source: Any
+    interval: timedelta
+    next_run_at: datetime
+    attempts: int = 0
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_new_items: Optional[int] = None
+    last_error: Optional[str] = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+
+class InMemoryJobBackend:
+    """Process-local backend for tests and single-process development."""
+    
+    def __init__(self, sources: Sequence[Any] = ()):
+        self.sources: List[Any] = list(sources)
+        self.jobs: Dict[uuid.UUID, _MemoryJob] = {}
+    
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+    
+    def _owned(self, job_id: uuid.UUID, owner: str) -> Optional[_MemoryJob]:
+        job = self.jobs.get(job_id)
+        if job is None or job.lease_owner != owner:
+            return None
+        job.lease_owner = job.lease_expires_at = None
+        return job
+    
+    async def ensure_jobs(self, types: Sequence[str], interval: timedelta) -> int:
+        scheduled = {job.source.id for job in self.jobs.values()}
+        created = 0
+        for source in self.sources:
+            if source.type in types and source.id not in scheduled:
+                job = _MemoryJob(source=source, interval=interval, next_run_at=self._now())
+                self.jobs[job.id] = job
+                created += 1
+        return created
+    
+    async def claim(self, owner: str, limit: int, lease: timedelta) -> List[ClaimedJob]:
+        now = self._now()
+        due = sorted(
+            (
+                job for job in self.jobs.values()
+                if job.next_run_at <= now
+                and (job.lease_expires_at is None or job.lease_expires_at <= now)
+            ),
+            key=lambda job: job.next_run_at,
+        )[:limit]
+        for job in due:
+            job.lease_owner = owner
+            job.lease_expires_at = now + lease
+            job.attempts += 1
+        return [
+            ClaimedJob(id=job.id, interval=job.interval, attempts=job.attempts, source=job.source)
+            for job in due
+        ]
+    
+    async def complete(
+        self, job_id: uuid.UUID, owner: str, new_items: int, interval: timedelta
+    ) -> bool:
+        job = self._owned(job_id, owner)
+        if job is None:
+            return False
+        job.attempts = 0
+        job.interval = interval
+        job.next_run_at = self._now() + interval
+        job.last_new_items = new_items
+        job.last_error = None
+        return True
+    
+    async def fail(self, job_id: uuid.UUID, owner: str, error: str, retry_in: timedelta) -> bool:
+        job = self._owned(job_id, owner)
+        if job is None:
+            return False
+        job.next_run_at = self._now() + retry_in
+        job.last_error = error
+        return True
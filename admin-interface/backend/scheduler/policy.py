@@ -0,0 +1,20 @@
+"""Crawl interval adaptation and retry backoff."""
+
+import random
+from datetime import timedelta
+
+from config import SchedulerConfig
+
+
+def next_interval(current: timedelta, new_items: int, config: SchedulerConfig) -> timedelta:
+    """Poll sources that produced new content sooner, quiet ones later."""
+    factor = config.speedup_factor if new_items > 0 else config.slowdown_factor
+    seconds = current.total_seconds() * factor
+    seconds = max(config.min_interval_seconds, min(config.max_interval_seconds, seconds))
+    return timedelta(seconds=seconds)
+
+
+def retry_delay(attempts: int, config: SchedulerConfig) -> timedelta:
+    """Exponential backoff, jittered so failed jobs do not retry in lockstep."""
+    ceiling = min(config.retry_max_seconds, config.retry_base_seconds * 2 ** max(attempts - 1, 0))
+    return timedelta(seconds=random.uniform(config.retry_base_seconds / 2, ceiling))
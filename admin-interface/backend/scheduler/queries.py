@@ -0,0 +1,190 @@
+# AUTOGENERATED FROM:
+#     'admin-interface/backend/scheduler/queries/claim_crawl_jobs.edgeql'
+#     'admin-interface/backend/scheduler/queries/complete_crawl_job.edgeql'
+#     'admin-interface/backend/scheduler/queries/ensure_crawl_jobs.edgeql'
+#     'admin-interface/backend/scheduler/queries/fail_crawl_job.edgeql'
+# WITH:
+#     $ gel-py --dir admin-interface/backend/scheduler/queries --file admin-interface/backend/scheduler/queries.py
+
+
+from __future__ import annotations
+import dataclasses
+import datetime
+import gel
+import uuid
+
+
+class NoPydanticValidation:
+    @classmethod
+    def __get_pydantic_core_schema__(cls, _source_type, _handler):
+        # Pydantic 2.x
+        from pydantic_core.core_schema import any_schema
+        return any_schema()
+    
+    @classmethod
+    def __get_validators__(cls):
+        # Pydantic 1.x
+        from pydantic.dataclasses import dataclass as pydantic_dataclass
+        _ = pydantic_dataclass(cls)
+        cls.__pydantic_model__.__get_validators__ = lambda: []
+        return []
+
+
+@dataclasses.dataclass
+class ClaimCrawlJobsResult(NoPydanticValidation):
+    id: uuid.UUID
+    interval: datetime.timedelta
+    attempts: int
+    source: ClaimCrawlJobsResultSource
+
+
+@dataclasses.dataclass
+class ClaimCrawlJobsResultSource(NoPydanticValidation):
+    id: uuid.UUID
+    type: str
+    url: str
+    platform_id: str | None
+    crawl_etag: str | None
+    crawl_cursor: datetime.datetime | None
+
+
+@dataclasses.dataclass
+class CompleteCrawlJobResult(NoPydanticValidation):
+    id: uuid.UUID
+
+
+async def claim_crawl_jobs(
+    executor: gel.AsyncIOExecutor,
+    *,
+    limit: int,
+    owner: str,
+    lease: datetime.timedelta,
+) -> list[ClaimCrawlJobsResult]:
+    return await executor.query(
+        """\
+        WITH
+            now := datetime_of_statement(),
+            due := (
+                SELECT CrawlJob
+                FILTER .next_run_at <= now
+                    AND .source.is_active
+                    AND ((.lease_expires_at <= now) ?? true)
+                ORDER BY .next_run_at
+                LIMIT <int64>$limit
+            ),
+        SELECT (
+            UPDATE due
+            SET {
+                lease_owner := <str>$owner,
+                lease_expires_at := now + <duration>$lease,
+                attempts := .attempts + 1
+            }
+        ) {
+            id,
+            interval,
+            attempts,
+            source: {
+                id,
+                type,
+                url,
+                platform_id,
+                crawl_etag,
+                crawl_cursor
+            }
+        }\
+        """,
+        limit=limit,
+        owner=owner,
+        lease=lease,
+    )
+
+
+async def complete_crawl_job(
+    executor: gel.AsyncIOExecutor,
+    *,
+    job_id: uuid.UUID,
+    owner: str,
+    interval: datetime.timedelta,
+    new_items: int,
+) -> CompleteCrawlJobResult | None:
+    return await executor.query_single(
+        """\
+        WITH
+            now := datetime_of_statement(),
+        UPDATE CrawlJob
+        FILTER .id = <uuid>$job_id AND .lease_owner = <str>$owner
+        SET {
+            lease_owner := {},
+            lease_expires_at := {},
+            attempts := 0,
+            interval := <duration>$interval,
+            next_run_at := now + <duration>$interval,
+            last_run_at := now,
+            last_new_items := <int32>$new_items,
+            last_error := {}
+        }\
+        """,
+        job_id=job_id,
+        owner=owner,
+        interval=interval,
+        new_items=new_items,
+    )
+
+
+async def ensure_crawl_jobs(
+    executor: gel.AsyncIOExecutor,
+    *,
+    types: list[str],
+    interval: datetime.timedelta,
+) -> int:
+    return await executor.query_single(
+        """\
+        WITH
+            types := array_unpack(<array<str>>$types),
+            unscheduled := (
+                SELECT Source
+                FILTER .is_active
+                    AND .type IN types
+                    AND NOT EXISTS .<source[IS CrawlJob]
+            ),
+        SELECT count((
+            FOR source IN unscheduled UNION (
+                INSERT CrawlJob {
+                    source := source,
+                    interval := <duration>$interval
+                }
+            )
+        ))\
+        """,
+        types=types,
+        interval=interval,
+    )
+
+
+async def fail_crawl_job(
+    executor: gel.AsyncIOExecutor,
+    *,
+    job_id: uuid.UUID,
+    owner: str,
+    retry_in: datetime.timedelta,
+    error: str,
+) -> CompleteCrawlJobResult | None:
+    return await executor.query_single(
+        """\
+        WITH
+            now := datetime_of_statement(),
+        UPDATE CrawlJob
+        FILTER .id = <uuid>$job_id AND .lease_owner = <str>$owner
+        SET {
+            lease_owner := {},
+            lease_expires_at := {},
+            next_run_at := now + <duration>$retry_in,
+            last_run_at := now,
+            last_error := <str>$error
+        }\
+        """,
+        job_id=job_id,
+        owner=owner,
+        retry_in=retry_in,
+        error=error,
+    )
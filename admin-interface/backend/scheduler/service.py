@@ -0,0 +1,125 @@
+"""Crawl scheduler running per-source jobs from a shared queue."""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import List, Optional, Set
+from antidote import injectable, inject
+
+from config import SchedulerConfig
+from ingestion.worker import IngestionWorker
+from ingestion.youtube import QuotaExceeded
+from scheduler.backends import ClaimedJob, GelJobBackend, JobBackend
+from scheduler.policy import next_interval, retry_delay
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobOutcome:
+    """Result of running one claimed job."""
+    job_id: uuid.UUID
+    source_id: uuid.UUID
+    new_items: int = 0
+    next_in: Optional[timedelta] = None
+    error: Optional[str] = None
+    lease_lost: bool = False
+
+
+@injectable
+class Scheduler:
+    """Claims due crawl jobs, runs them through the ingestion worker and reschedules them."""
+    
+    def __init__(
+        self,
+        backend: JobBackend = inject[GelJobBackend],
+        worker: IngestionWorker = inject[IngestionWorker],
+        config: SchedulerConfig = inject[SchedulerConfig]
+    ):
+        self.backend = backend
+        self.worker = worker
+        self.config = config
+        # Identifies this process's leases; unique even across restarts with a reused pid
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._paused_until = 0.0
+    
+    async def sync_jobs(self) -> int:
+        """Give newly added or reactivated sources a crawl job."""
+        interval = timedelta(seconds=self.config.initial_interval_seconds)
+        created = await self.backend.ensure_jobs(self.config.source_types, interval)
+        if created:
+            logger.info("Scheduled %d new sources", created)
+        return created
+    
+    async def claim(self, limit: int) -> List[ClaimedJob]:
+        """Lease up to `limit` due jobs unless crawling is paused."""
+        if limit <= 0 or time.monotonic() < self._paused_until:
+            return []
+        lease = timedelta(seconds=self.config.lease_seconds)
+        return await self.backend.claim(self.owner, limit, lease)
+    
+    async def run_job(self, job: ClaimedJob) -> JobOutcome:
+        """Crawl one source and reschedule its job from the result."""
+        outcome = JobOutcome(job_id=job.id, source_id=job.source.id)
+        try:
+            report = await self.worker.ingest_source(job.source)
+            outcome.error = report.error
+            outcome.new_items = report.fetched
+        except QuotaExceeded:
+            # Nothing more can be fetched today; stop claiming until the retry ceiling
+            self._paused_until = time.monotonic() + self.config.retry_max_seconds
+            outcome.error = "YouTube quota exceeded"
+            outcome.next_in = timedelta(seconds=self.config.retry_max_seconds)
+        except Exception as e:
+            logger.exception("Crawl job %s failed", job.id)
+            outcome.error = f"{type(e).__name__}: {e}"
+        
+        if outcome.error is None:
+            outcome.next_in = next_interval(job.interval, outcome.new_items, self.config)
+            recorded = await self.backend.complete(
+                job.id, self.owner, outcome.new_items, outcome.next_in
+            )
+        else:
+            outcome.next_in = outcome.next_in or retry_delay(job.attempts, self.config)
+            recorded = await self.backend.fail(job.id, self.owner, outcome.error, outcome.next_in)
+        
+        # The lease ran out mid-crawl and another process may have re-run the job
+        outcome.lease_lost = not recorded
+        if outcome.lease_lost:
+            logger.warning("Lease on crawl job %s expired before it finished", job.id)
+        return outcome
+    
+    async def run_once(self) -> List[JobOutcome]:
+        """Sync jobs, then run one batch of due jobs to completion."""
+        await self.sync_jobs()
+        jobs = await self.claim(self.config.concurrency)
+        return list(await asyncio.gather(*(self.run_job(job) for job in jobs)))
+    
+    async def run_forever(self):
+        """Keep up to `concurrency` jobs running, claiming more as slots free up."""
+        running: Set[asyncio.Task] = set()
+        next_sync = 0.0
+        while True:
+            if time.monotonic() >= next_sync:
+                await self.sync_jobs()
+                next_sync = time.monotonic() + self.config.sync_interval_seconds
+            
+            for job in await self.claim(self.config.concurrency - len(running)):
+                task = asyncio.create_task(self.run_job(job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            
+            # Wake on the poll interval, or as soon as a slot frees up
+            if running:
+                await asyncio.wait(
+                    running,
+                    timeout=self.config.poll_interval_seconds,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            else:
+                await asyncio.sleep(self.config.poll_interval_seconds)
@@ -0,0 +1,99 @@
+"""Production server: python -m serve [--workers N].
+
+Runs the app factory in N uvicorn worker processes sharing one listening
+socket. The supervisor restarts workers that die. Signals:
+
+- SIGHUP replaces every worker with a fresh one, for example to pick up new code or .env values
+- SIGTTIN / SIGTTOU add or remove a worker
+- SIGTERM / SIGINT stop accepting connections and give in-flight
+  requests SERVER_GRACEFUL_TIMEOUT seconds to finish
+
+With more than one worker, a state server process backs the shared caches
+and counters (see shared_state.py), and Prometheus metrics are aggregated
+across workers through PROMETHEUS_MULTIPROC_DIR.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import uvicorn
+from antidote import world
+
+from config import ServerConfig, StateConfig, load_env
+from shared_state import run_state_server, socket_in_use
+
+logger = logging.getLogger("serve")
+
+
+def _start_state_server(path: str, max_entries: int) -> multiprocessing.Process:
+    """Start the state server and wait until its socket accepts connections."""
+    # A configured STATE_SOCKET may belong to another running server
+    if socket_in_use(path):
+        raise RuntimeError(f"A state server is already listening on {path}; set STATE_SOCKET to a free path")
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_state_server, args=(path, max_entries), name="state-server", daemon=True
+    )
+    process.start()
+    deadline = time.monotonic() + 10
+    # A stale socket file exists before the server replaces it, so connect rather than check the path
+    while not socket_in_use(path):
+        if not process.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError(f"State server did not start on {path}")
+        time.sleep(0.05)
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the admin API with multiple worker processes")
+    parser.add_argument("--workers", type=int, help="worker processes (default SERVER_WORKERS, 0 = one per core)")
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    load_env()
+    server: ServerConfig = world[ServerConfig]
+    state: StateConfig = world[StateConfig]
+    workers = args.workers or server.workers or os.cpu_count() or 1
+    
+    runtime_dir = tempfile.mkdtemp(prefix="grundrisse-")
+    state_server = None
+    try:
+        if workers > 1:
+            # Workers are spawned interpreters and read their configuration from this environment
+            if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+                metrics_dir = os.path.join(runtime_dir, "metrics")
+                os.mkdir(metrics_dir)
+                os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+            if os.getenv("STATE_BACKEND", "socket") == "socket":
+                socket_path = state.socket_path or os.path.join(runtime_dir, "state.sock")
+                os.environ["STATE_BACKEND"] = "socket"
+                os.environ["STATE_SOCKET"] = socket_path
+                state_server = _start_state_server(socket_path, state.max_entries)
+                logger.info("State server listening on %s", socket_path)
+        
+        uvicorn.run(
+            "main:create_app",
+            factory=True,
+            host=args.host or server.host,
+            port=args.port or server.port,
+            workers=workers,
+            timeout_graceful_shutdown=server.graceful_timeout_seconds,
+            # Behind a reverse proxy the login limiter must see the client, not the proxy
+            proxy_headers=True,
+            forwarded_allow_ips=server.forwarded_allow_ips,
+        )
+    finally:
+        if state_server is not None:
+            state_server.terminate()
+            state_server.join()
+        shutil.rmtree(runtime_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
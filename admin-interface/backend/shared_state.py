@@ -0,0 +1,256 @@
+"""Counters and caches that can be shared by every worker process on a node.
+
+`SharedState` hands out namespaced caches and counters over a pluggable
+store:
+
+- `LocalStore` keeps entries in this process. It is the default and all a
+  single worker needs.
+- `SocketStore` talks to a `StateServer` over a Unix socket, so that
+  `python -m serve` workers see the same cache entries and counters.
+
+Values must be JSON-compatible; the socket store sends them with orjson.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Any, Dict, List, Protocol, Tuple
+
+import orjson
+from antidote import injectable, inject
+
+from cache import TTLCache
+from config import StateConfig
+
+logger = logging.getLogger(__name__)
+
+# Entries without a TTL still expire eventually so the store cannot fill with dead keys
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+class StateUnavailable(Exception):
+    """The shared store could not be reached."""
+
+
+class StateStore(Protocol):
+    """Key-value operations every store supports; TTLs are in seconds."""
+    
+    async def get(self, key: str) -> Any: ...
+    
+    async def set(self, key: str, value: Any, ttl: float) -> None: ...
+    
+    async def delete(self, key: str) -> None: ...
+    
+    async def incr(self, key: str, amount: int, ttl: float) -> int: ...
+
+
+class LocalStore:
+    """Entries held by this process, bounded and evicted least recently used."""
+    
+    def __init__(self, max_entries: int):
+        self._entries: TTLCache[Any] = TTLCache(max_entries)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    async def get(self, key: str) -> Any:
+        return self._entries.get(key)
+    
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries.set(key, value, time.time() + ttl)
+    
+    async def delete(self, key: str) -> None:
+        self._entries.delete(key)
+    
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        # The TTL is set by the first increment, like a fixed window
+        return self._entries.add(key, amount, time.time() + ttl)
+
+
+class SocketStore:
+    """Client of a StateServer over a small pool of connections, one request in flight on each."""
+    
+    def __init__(self, path: str, timeout: float = 1.0, connections: int = 4):
+        self.path = path
+        self.timeout = timeout
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(connections)
+    
+    async def _call(self, *request: Any) -> Any:
+        async with self._slots:
+            connection = None
+            try:
+                if self._idle:
+                    connection = self._idle.pop()
+                else:
+                    connection = await asyncio.wait_for(
+                        asyncio.open_unix_connection(self.path), self.timeout
+                    )
+                reader, writer = connection
+                writer.write(orjson.dumps(request) + b"\n")
+                line = await asyncio.wait_for(reader.readline(), self.timeout)
+                if not line:
+                    raise ConnectionError("state server closed the connection")
+            except BaseException as e:
+                # A request interrupted mid-flight, cancellation included, leaves its
+                # reply unread on the connection, so the connection is dropped
+                if connection is not None:
+                    connection[1].close()
+                if isinstance(e, (OSError, asyncio.TimeoutError)):
+                    raise StateUnavailable(str(e)) from e
+                raise
+            self._idle.append(connection)
+            return orjson.loads(line)
+    
+    async def get(self, key: str) -> Any:
+        return await self._call("get", key)
+    
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._call("set", key, value, ttl)
+    
+    async def delete(self, key: str) -> None:
+        await self._call("delete", key)
+    
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        return await self._call("incr", key, amount, ttl)
+    
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+def socket_in_use(path: str) -> bool:
+    """Whether a server accepts connections on the Unix socket at `path`."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+class StateServer:
+    """Serves a LocalStore to the workers of one node over a Unix socket."""
+    
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.store = LocalStore(max_entries)
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        operations = {
+            "get": self.store.get,
+            "set": self.store.set,
+            "delete": self.store.delete,
+            "incr": self.store.incr,
+        }
+        try:
+            while line := await reader.readline():
+                operation, *args = orjson.loads(line)
+                result = await operations[operation](*args)
+                writer.write(orjson.dumps(result) + b"\n")
+        except (ConnectionError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning("Dropping state client: %s", e)
+        finally:
+            writer.close()
+    
+    async def serve_forever(self):
+        if os.path.exists(self.path):
+            # Replacing a live socket would split its workers from the new ones
+            if socket_in_use(self.path):
+                raise RuntimeError(f"A state server is already listening on {self.path}")
+            # Left behind by a server that did not shut down cleanly
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self._handle, path=self.path)
+        async with server:
+            await server.serve_forever()
+
+
+def run_state_server(path: str, max_entries: int):
+    """Process target for `python -m serve`."""
+    try:
+        asyncio.run(StateServer(path, max_entries).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+class SharedCache:
+    """TTL cache in one namespace of the shared store, counting its own hits and misses."""
+    
+    def __init__(self, store: StateStore, namespace: str, ttl: float):
+        self.store = store
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+    
+    async def get(self, key: str) -> Any:
+        """Return a live entry, or None on a miss or when the store is unreachable."""
+        try:
+            value = await self.store.get(f"{self.namespace}:{key}")
+        except StateUnavailable:
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self.store.set(f"{self.namespace}:{key}", value, self.ttl)
+        except StateUnavailable:
+            pass
+    
+    async def delete(self, key: str) -> None:
+        try:
+            await self.store.delete(f"{self.namespace}:{key}")
+        except StateUnavailable:
+            pass
+    
+    def stats(self) -> Dict[str, int]:
+        """Return this process's hit/miss counters, and the entry count when it is known."""
+        return {
+            "size": len(self.store) if isinstance(self.store, LocalStore) else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@injectable
+class SharedState:
+    """Entry point to the node's shared store, chosen by STATE_BACKEND."""
+    
+    def __init__(self, config: StateConfig = inject[StateConfig]):
+        self.config = config
+        if config.backend == "socket" and config.socket_path:
+            self.store: StateStore = SocketStore(config.socket_path, connections=config.connections)
+        else:
+            self.store = LocalStore(config.max_entries)
+    
+    @property
+    def shared(self) -> bool:
+        """Whether other processes see the same entries."""
+        return isinstance(self.store, SocketStore)
+    
+    def cache(self, namespace: str, ttl: float) -> SharedCache:
+        return SharedCache(self.store, namespace, ttl)
+    
+    async def get(self, key: str) -> Any:
+        """Return a live value, or None."""
+        return await self.store.get(key)
+    
+    async def delete(self, key: str) -> None:
+        await self.store.delete(key)
+    
+    async def incr(self, key: str, amount: int = 1, ttl: float = DEFAULT_TTL_SECONDS) -> int:
+        """Add to a counter, creating it with `ttl` if it does not exist."""
+        return await self.store.incr(key, amount, ttl)
+    
+    async def close(self):
+        if isinstance(self.store, SocketStore):
+            await self.store.close()
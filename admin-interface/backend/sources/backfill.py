@@ -0,0 +1,30 @@
+"""Fill Source.canonical_key on existing rows: python -m sources.backfill."""
+
+import argparse
+import asyncio
+import json
+import logging
+from antidote import world
+
+from config import load_env
+from database import DatabaseService
+from sources.service import SourceService
+
+
+async def main(batch_size: int):
+    db_service: DatabaseService = world[DatabaseService]
+    await db_service.startup()
+    try:
+        result = await world[SourceService].backfill_canonical_keys(batch_size)
+        print(json.dumps(result, indent=2))
+    finally:
+        await db_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Set canonical keys of sources created before they existed")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_env()
+    asyncio.run(main(args.batch_size))
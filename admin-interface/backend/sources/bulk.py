@@ -0,0 +1,97 @@
+"""Incremental parsers for bulk source uploads."""
+
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+
+from starlette.datastructures import UploadFile
+
+# Each parsed row is either a mapping of fields or a parse error message
+ParsedRow = Tuple[Optional[dict], Optional[str]]
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+CSV_MEDIA_TYPES = {"text/csv", "application/csv"}
+
+
+def parse_stream(
+    chunks: AsyncIterator[bytes],
+    media_type: str,
+    filename: str = ""
+) -> Optional[AsyncIterator[ParsedRow]]:
+    """Pick a row parser from the media type or file extension."""
+    filename = filename.lower()
+    if media_type in CSV_MEDIA_TYPES or filename.endswith(".csv"):
+        return parse_csv(iter_lines(chunks))
+    if media_type in NDJSON_MEDIA_TYPES or filename.endswith((".ndjson", ".jsonl")):
+        return parse_ndjson(iter_lines(chunks))
+    return None
+
+
+async def read_upload(upload: UploadFile, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Read an uploaded file in fixed-size chunks."""
+    while chunk := await upload.read(chunk_size):
+        yield chunk
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of byte chunks into decoded lines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Parse one JSON object per non-blank line."""
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield None, f"Invalid JSON: {e}"
+            continue
+        if isinstance(item, dict):
+            yield item, None
+        else:
+            yield None, "Expected a JSON object"
+
+
+async def parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[ParsedRow]:
+    """Parse CSV records keyed by the header row."""
+    header = None
+    record: List[str] = []
+    async for line in lines:
+        if not record and not line.strip():
+            continue
+        record.append(line + "\n")
+        # An odd number of quotes leaves a quoted field open: its newline is part of the value
+        if sum(part.count('"') for part in record) % 2:
+            continue
+        values = next(csv.reader(record))
+        record = []
+        if header is None:
+            header = [value.strip().lower() for value in values]
+            continue
+        if len(values) != len(header):
+            yield None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield dict(zip(header, values)), None
+    if record:
+        yield None, "Unterminated quoted field"
+
+
+async def parse_json_array(items: List) -> AsyncIterator[ParsedRow]:
+    """Adapt an already decoded JSON array to the row stream interface."""
+    for item in items:
+        if isinstance(item, dict):
+            yield item, None
+        else:
+            yield None, "Expected a JSON object"
@@ -0,0 +1,120 @@
+"""Canonical keys that identify a source regardless of how its URL is written.
+
+`canonical_key(type, url)` folds the spellings of one address into one key,
+stored in the exclusive `Source.canonical_key`, for example:
+
+    https://www.youtube.com/@Foo/videos  ->  youtube:@foo
+    youtube.com/channel/UCabc?si=x       ->  youtube:channel/UCabc
+    https://foo.substack.com/feed        ->  substack:foo
+    https://bsky.app/profile/Foo.bsky.social  ->  bluesky:foo.bsky.social
+    HTTP://Example.com:80/feed/?b=2&a=1  ->  rss:example.com/feed?a=1&b=2
+
+Only the URL is looked at, so a YouTube channel added once by handle and
+once by channel id still gets two keys. Ingestion catches those: it stores
+the resolved channel id in `Source.platform_id`, exclusive per type, and
+deactivates the later source as a duplicate.
+"""
+
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that never change what a URL points to
+TRACKING_PARAMS = {"si", "feature", "ref", "fbclid", "gclid"}
+
+# YouTube paths that name a channel, and the channel tabs that may follow them
+YOUTUBE_CHANNEL_PREFIXES = {"channel", "c", "user"}
+YOUTUBE_TABS = {"videos", "shorts", "streams", "playlists", "featured", "about", "community", "live"}
+# Top-level paths that are pages, not channel names
+YOUTUBE_PAGES = {"watch", "playlist", "results", "feed", "shorts", "embed", "live", "hashtag", "redirect"}
+
+
+def _split(url: str):
+    url = url.strip()
+    # Pasted addresses often lack a scheme
+    if "://" not in url:
+        url = "https://" + url
+    return urlsplit(url)
+
+
+def _host(url: str) -> str:
+    host = (_split(url).hostname or "").rstrip(".")
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+
+def _segments(url: str) -> List[str]:
+    return [segment for segment in _split(url).path.split("/") if segment]
+
+
+def normalize_url(url: str) -> str:
+    """Scheme-less URL with a lowercase host, no default port, fragment, tracking
+    parameters or trailing slash, and sorted query parameters."""
+    parts = _split(url)
+    host = _host(url)
+    if parts.port and parts.port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+    path = "/".join(_segments(url))
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith("utm_")
+    )
+    key = f"{host}/{path}" if path else host
+    return f"{key}?{urlencode(query)}" if query else key
+
+
+def _youtube(url: str) -> Optional[str]:
+    if _host(url) not in ("youtube.com", "youtube-nocookie.com"):
+        return None
+    segments = _segments(url)
+    if not segments:
+        return None
+    if segments[0].startswith("@"):
+        # Handles are case-insensitive
+        return segments[0].lower()
+    if segments[0] in YOUTUBE_CHANNEL_PREFIXES and len(segments) > 1:
+        name = segments[1]
+        # Channel ids are case-sensitive, custom and legacy user names are not
+        return f"channel/{name}" if segments[0] == "channel" else f"{segments[0]}/{name.lower()}"
+    if segments[0] not in YOUTUBE_PAGES and (len(segments) == 1 or segments[1] in YOUTUBE_TABS):
+        # youtube.com/name resolves like /c/name
+        return f"c/{segments[0].lower()}"
+    return None
+
+
+def _substack(url: str) -> Optional[str]:
+    host = _host(url)
+    if host.endswith(".substack.com"):
+        return host[:-len(".substack.com")]
+    # Custom domains: the publication is the host, whatever page was pasted
+    return host or None
+
+
+def _bluesky(url: str) -> Optional[str]:
+    segments = _segments(url)
+    if _host(url) == "bsky.app" and len(segments) > 1 and segments[0] == "profile":
+        handle = segments[1]
+        # DIDs are case-sensitive, handles are domain names
+        return handle if handle.startswith("did:") else handle.lower()
+    return None
+
+
+CANONICALIZERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "youtube": _youtube,
+    "substack": _substack,
+    "bluesky": _bluesky,
+}
+
+
+def canonical_key(source_type: str, url: str) -> str:
+    """Key shared by every spelling of a source's URL, prefixed with its type.
+    
+    Types without rules of their own, and URLs their rules do not recognise,
+    fall back to `normalize_url`.
+    """
+    canonicalize = CANONICALIZERS.get(source_type)
+    key = canonicalize(url) if canonicalize else None
+    return f"{source_type}:{key or normalize_url(url)}"
@@ -1,17 +1,57 @@
 """Sources module models."""
 
+import uuid
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import AwareDatetime, BaseModel, model_validator
+
+# Mirrors the one_of constraint on Source.type in dbschema/default.gel
+SourceType = Literal["youtube", "rss", "podcast", "substack", "bluesky"]
+ChangeKind = Literal["insert", "update", "delete"]
 
 
 class SourceCreate(BaseModel):
     """Request model for creating a source."""
     name: str
-    type: str
+    type: SourceType
     url: str
 
 
+class SourceUpdate(BaseModel):
+    """Request model for editing a source; omitted fields keep their value."""
+    name: Optional[str] = None
+    type: Optional[SourceType] = None
+    url: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
+class SourceFilter(BaseModel):
+    """Sources matching every given condition."""
+    type: Optional[SourceType] = None
+    is_active: Optional[bool] = None
+    # With an offset: the database cannot compare a naive time
+    created_before: Optional[AwareDatetime] = None
+
+
+class SourceSelection(BaseModel):
+    """Sources a bulk request acts on: the listed ids, those matching the filter, or both."""
+    ids: Optional[List[uuid.UUID]] = None
+    filter: Optional[SourceFilter] = None
+    
+    @model_validator(mode="after")
+    def check_not_everything(self) -> "SourceSelection":
+        # An empty selection would match every source
+        conditions = self.filter.model_dump(exclude_none=True) if self.filter else {}
+        if self.ids is None and not conditions:
+            raise ValueError("give ids or at least one filter condition")
+        return self
+
+
+class SourceBulkUpdate(SourceSelection):
+    """Request model for pausing or resuming many sources at once."""
+    is_active: bool
+
+
 class Source(BaseModel):
     """Source model."""
     id: str
@@ -19,5 +59,93 @@ class Source(BaseModel):
     type: str
     url: str
     is_active: bool
-    created_at: Optional[datetime] = None
+    created_at: datetime
     updated_at: Optional[datetime] = None
+    # Ingestion aggregates, maintained as content is written and crawls finish
+    content_count: int = 0
+    last_published_at: Optional[datetime] = None
+    last_crawl_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
+class SourcePage(BaseModel):
+    """One page of sources with a cursor for the next page."""
+    items: List[Source]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+class SourceTypeStats(BaseModel):
+    """Ingestion summary of the sources of one type."""
+    type: str
+    total: int
+    active: int
+    failing: int
+    content_count: int
+    last_published_at: Optional[datetime] = None
+    last_crawl_at: Optional[datetime] = None
+
+
+class SourceStats(BaseModel):
+    """Response model for the ingestion summary of all sources."""
+    total: int
+    active: int
+    # Sources whose last crawl failed
+    failing: int
+    never_crawled: int
+    content_count: int
+    last_published_at: Optional[datetime] = None
+    last_crawl_at: Optional[datetime] = None
+    by_type: List[SourceTypeStats]
+
+
+class BulkRowResult(BaseModel):
+    """Outcome of one row of a bulk import."""
+    row: int
+    # duplicate: the URL matches an existing source or an earlier row of the upload
+    status: Literal["created", "valid", "duplicate", "invalid", "failed"]
+    source: Optional[Source] = None
+    error: Optional[str] = None
+
+
+class BulkImportResult(BaseModel):
+    """Response model for a bulk import."""
+    dry_run: bool
+    total: int
+    created: int
+    duplicate: int
+    invalid: int
+    failed: int
+    # Set when the upload exceeded the row limit and was not read to the end
+    truncated: bool = False
+    results: List[BulkRowResult]
+
+
+class SourceBulkItem(BaseModel):
+    """Outcome for one source of a bulk update or delete."""
+    id: str
+    status: Literal["updated", "deleted", "not_found"]
+    source: Optional[Source] = None
+
+
+class SourceBulkResult(BaseModel):
+    """Response model for a bulk update or delete."""
+    matched: int
+    results: List[SourceBulkItem]
+
+
+class SourceChange(BaseModel):
+    """One entry of the sources change feed."""
+    seq: int
+    kind: ChangeKind
+    source_id: str
+    changed_at: datetime
+    # Current state of the source; None once it has been deleted
+    source: Optional[Source] = None
+
+
+class SourceChangePage(BaseModel):
+    """Changes after a cursor, in order, with the cursor to resume from."""
+    changes: List[SourceChange]
+    next_cursor: str
+    has_more: bool
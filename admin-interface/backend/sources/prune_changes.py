@@ -0,0 +1,26 @@
+"""Drop change feed entries past the retention window: python -m sources.prune_changes."""
+
+import asyncio
+import json
+import logging
+from antidote import world
+
+from config import load_env
+from database import DatabaseService
+from sources.service import SourceService
+
+
+async def main():
+    db_service: DatabaseService = world[DatabaseService]
+    await db_service.startup()
+    try:
+        result = await world[SourceService].prune_changes()
+        print(json.dumps(result, indent=2))
+    finally:
+        await db_service.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    load_env()
+    asyncio.run(main())
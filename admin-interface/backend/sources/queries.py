@@ -1,8 +1,21 @@
 # AUTOGENERATED FROM:
+#     'admin-interface/backend/sources/queries/bulk_create_sources.edgeql'
+#     'admin-interface/backend/sources/queries/count_sources.edgeql'
 #     'admin-interface/backend/sources/queries/create_source.edgeql'
 #     'admin-interface/backend/sources/queries/delete_source.edgeql'
+#     'admin-interface/backend/sources/queries/delete_sources.edgeql'
 #     'admin-interface/backend/sources/queries/get_all_sources.edgeql'
 #     'admin-interface/backend/sources/queries/get_source_by_id.edgeql'
+#     'admin-interface/backend/sources/queries/get_source_changes.edgeql'
+#     'admin-interface/backend/sources/queries/get_source_changes_horizon.edgeql'
+#     'admin-interface/backend/sources/queries/get_sources_page.edgeql'
+#     'admin-interface/backend/sources/queries/get_sources_stats.edgeql'
+#     'admin-interface/backend/sources/queries/get_sources_version.edgeql'
+#     'admin-interface/backend/sources/queries/get_sources_without_canonical_key.edgeql'
+#     'admin-interface/backend/sources/queries/prune_source_changes.edgeql'
+#     'admin-interface/backend/sources/queries/set_canonical_key.edgeql'
+#     'admin-interface/backend/sources/queries/update_source.edgeql'
+#     'admin-interface/backend/sources/queries/update_sources.edgeql'
 # WITH:
 #     $ gel-py --dir admin-interface/backend/sources/queries --file admin-interface/backend/sources/queries.py
 
@@ -20,7 +33,7 @@ class NoPydanticValidation:
         # Pydantic 2.x
         from pydantic_core.core_schema import any_schema
         return any_schema()
-
+    
     @classmethod
     def __get_validators__(cls):
         # Pydantic 1.x
@@ -31,19 +44,151 @@ class NoPydanticValidation:
 
 
 @dataclasses.dataclass
-class CreateSourceResult(NoPydanticValidation):
+class BulkCreateSourcesResult(NoPydanticValidation):
     id: uuid.UUID
+    name: str
+    type: str
+    url: str
+    is_active: bool | None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime | None
+    content_count: int | None
+    last_published_at: datetime.datetime | None
+    last_crawl_at: datetime.datetime | None
+    last_error: str | None
+    row: int
 
 
 @dataclasses.dataclass
-class GetAllSourcesResult(NoPydanticValidation):
+class CreateSourceResult(NoPydanticValidation):
     id: uuid.UUID
     name: str
     type: str
     url: str
     is_active: bool | None
-    created_at: datetime.datetime | None
+    created_at: datetime.datetime
     updated_at: datetime.datetime | None
+    content_count: int | None
+    last_published_at: datetime.datetime | None
+    last_crawl_at: datetime.datetime | None
+    last_error: str | None
+
+
+@dataclasses.dataclass
+class DeleteSourceResult(NoPydanticValidation):
+    id: uuid.UUID
+
+
+@dataclasses.dataclass
+class GetSourceChangesResult(NoPydanticValidation):
+    seq: int
+    kind: str
+    source_id: uuid.UUID
+    changed_at: datetime.datetime
+    settled: bool
+    source: CreateSourceResult | None
+
+
+@dataclasses.dataclass
+class GetSourcesStatsResult(NoPydanticValidation):
+    total: int
+    active: int
+    failing: int
+    never_crawled: int
+    content_count: int
+    last_published_at: datetime.datetime | None
+    last_crawl_at: datetime.datetime | None
+    by_type: list[GetSourcesStatsResultByTypeItem]
+
+
+@dataclasses.dataclass
+class GetSourcesStatsResultByTypeItem(NoPydanticValidation):
+    type: str
+    total: int
+    active: int
+    failing: int
+    content_count: int
+    last_published_at: datetime.datetime | None
+    last_crawl_at: datetime.datetime | None
+
+
+@dataclasses.dataclass
+class GetSourcesVersionResult(NoPydanticValidation):
+    seq: int | None
+    changes: int
+    changed_at: datetime.datetime | None
+    stats_updated_at: datetime.datetime | None
+
+
+@dataclasses.dataclass
+class GetSourcesWithoutCanonicalKeyResult(NoPydanticValidation):
+    id: uuid.UUID
+    type: str
+    url: str
+
+
+@dataclasses.dataclass
+class PruneSourceChangesResult(NoPydanticValidation):
+    pruned: int
+    through: int | None
+
+
+async def bulk_create_sources(
+    executor: gel.AsyncIOExecutor,
+    *,
+    sources: str,
+) -> list[BulkCreateSourcesResult]:
+    return await executor.query(
+        """\
+        FOR item IN enumerate(json_array_unpack(<json>$sources)) UNION (
+            SELECT (
+                INSERT Source {
+                    name := <str>item.1['name'],
+                    type := <str>item.1['type'],
+                    url := <str>item.1['url'],
+                    canonical_key := <str>item.1['canonical_key']
+                }
+                UNLESS CONFLICT ON .canonical_key
+            ) {
+                id,
+                name,
+                type,
+                url,
+                is_active,
+                created_at,
+                updated_at,
+                content_count,
+                last_published_at,
+                last_crawl_at,
+                last_error,
+                row := item.0
+            }
+        )\
+        """,
+        sources=sources,
+    )
+
+
+async def count_sources(
+    executor: gel.AsyncIOExecutor,
+    *,
+    type: str | None = None,
+    is_active: bool | None = None,
+) -> int:
+    return await executor.query_single(
+        """\
+        WITH
+            type_filter := <optional str>$type,
+            is_active_filter := <optional bool>$is_active,
+        SELECT count(
+            Source
+            FILTER ((.type = type_filter) ?? true)
+                AND ((.is_active = is_active_filter) ?? true)
+        )\
+        """,
+        type=type,
+        is_active=is_active,
+    )
 
 
 async def create_source(
@@ -52,18 +197,36 @@ async def create_source(
     name: str,
     type: str,
     url: str,
-) -> CreateSourceResult:
+    canonical_key: str,
+) -> CreateSourceResult | None:
     return await executor.query_single(
         """\
-        INSERT Source {
-            name := <str>$name,
-            type := <str>$type,
-            url := <str>$url
+        SELECT (
+            INSERT Source {
+                name := <str>$name,
+                type := <str>$type,
+                url := <str>$url,
+                canonical_key := <str>$canonical_key
+            }
+            UNLESS CONFLICT ON .canonical_key
+        ) {
+            id,
+            name,
+            type,
+            url,
+            is_active,
+            created_at,
+            updated_at,
+            content_count,
+            last_published_at,
+            last_crawl_at,
+            last_error
         }\
         """,
         name=name,
         type=type,
         url=url,
+        canonical_key=canonical_key,
     )
 
 
@@ -71,7 +234,7 @@ async def delete_source(
     executor: gel.AsyncIOExecutor,
     *,
     source_id: uuid.UUID,
-) -> CreateSourceResult | None:
+) -> DeleteSourceResult | None:
     return await executor.query_single(
         """\
         DELETE Source
@@ -81,9 +244,42 @@ async def delete_source(
     )
 
 
+async def delete_sources(
+    executor: gel.AsyncIOExecutor,
+    *,
+    ids: list[uuid.UUID] | None = None,
+    type: str | None = None,
+    is_active: bool | None = None,
+    created_before: datetime.datetime | None = None,
+) -> list[DeleteSourceResult]:
+    return await executor.query(
+        """\
+        WITH
+            ids := <optional array<uuid>>$ids,
+            type_filter := <optional str>$type,
+            is_active_filter := <optional bool>$is_active,
+            created_before := <optional datetime>$created_before,
+        SELECT (
+            DELETE Source
+            FILTER
+                (NOT EXISTS ids OR .id IN array_unpack(ids))
+                AND ((.type = type_filter) ?? true)
+                AND ((.is_active = is_active_filter) ?? true)
+                AND ((.created_at < created_before) ?? true)
+        ) {
+            id
+        }\
+        """,
+        ids=ids,
+        type=type,
+        is_active=is_active,
+        created_before=created_before,
+    )
+
+
 async def get_all_sources(
     executor: gel.AsyncIOExecutor,
-) -> list[GetAllSourcesResult]:
+) -> list[CreateSourceResult]:
     return await executor.query(
         """\
         SELECT Source {
@@ -93,7 +289,11 @@ async def get_all_sources(
             url,
             is_active,
             created_at,
-            updated_at
+            updated_at,
+            content_count,
+            last_published_at,
+            last_crawl_at,
+            last_error
         }
         ORDER BY .created_at DESC\
         """,
@@ -104,7 +304,7 @@ async def get_source_by_id(
     executor: gel.AsyncIOExecutor,
     *,
     source_id: uuid.UUID,
-) -> GetAllSourcesResult | None:
+) -> CreateSourceResult | None:
     return await executor.query_single(
         """\
         SELECT Source {
@@ -114,9 +314,351 @@ async def get_source_by_id(
             url,
             is_active,
             created_at,
-            updated_at
+            updated_at,
+            content_count,
+            last_published_at,
+            last_crawl_at,
+            last_error
         }
         FILTER .id = <uuid>$source_id\
         """,
         source_id=source_id,
     )
+
+
+async def get_source_changes(
+    executor: gel.AsyncIOExecutor,
+    *,
+    commit_lag: datetime.timedelta,
+    since: int,
+    limit: int,
+) -> list[GetSourceChangesResult]:
+    return await executor.query(
+        """\
+        SELECT SourceChange {
+            seq,
+            kind,
+            source_id,
+            changed_at,
+            # Old enough that any lower sequence number still missing belongs to a rolled-back write
+            settled := .changed_at < datetime_of_statement() - <duration>$commit_lag,
+            source := (
+                SELECT Source {
+                    id,
+                    name,
+                    type,
+                    url,
+                    is_active,
+                    created_at,
+                    updated_at,
+                    content_count,
+                    last_published_at,
+                    last_crawl_at,
+                    last_error
+                }
+                FILTER .id = SourceChange.source_id
+                LIMIT 1
+            )
+        }
+        FILTER .seq > <int64>$since
+        ORDER BY .seq
+        LIMIT <int64>$limit\
+        """,
+        commit_lag=commit_lag,
+        since=since,
+        limit=limit,
+    )
+
+
+async def get_source_changes_horizon(
+    executor: gel.AsyncIOExecutor,
+) -> int | None:
+    return await executor.query_single(
+        """\
+        SELECT (SELECT ChangeLogHorizon FILTER .log = 'sources').through\
+        """,
+    )
+
+
+async def get_sources_page(
+    executor: gel.AsyncIOExecutor,
+    *,
+    type: str | None = None,
+    is_active: bool | None = None,
+    cursor_created_at: datetime.datetime | None = None,
+    cursor_id: uuid.UUID | None = None,
+    limit: int,
+) -> list[CreateSourceResult]:
+    return await executor.query(
+        """\
+        WITH
+            type_filter := <optional str>$type,
+            is_active_filter := <optional bool>$is_active,
+            cursor_created_at := <optional datetime>$cursor_created_at,
+            cursor_id := <optional uuid>$cursor_id,
+        SELECT Source {
+            id,
+            name,
+            type,
+            url,
+            is_active,
+            created_at,
+            updated_at,
+            content_count,
+            last_published_at,
+            last_crawl_at,
+            last_error
+        }
+        FILTER
+            ((.type = type_filter) ?? true)
+            AND ((.is_active = is_active_filter) ?? true)
+            AND ((
+                .created_at < cursor_created_at
+                OR (.created_at = cursor_created_at AND .id < cursor_id)
+            ) ?? true)
+        ORDER BY .created_at DESC THEN .id DESC
+        LIMIT <int64>$limit\
+        """,
+        type=type,
+        is_active=is_active,
+        cursor_created_at=cursor_created_at,
+        cursor_id=cursor_id,
+        limit=limit,
+    )
+
+
+async def get_sources_stats(
+    executor: gel.AsyncIOExecutor,
+) -> GetSourcesStatsResult:
+    return await executor.query_required_single(
+        """\
+        WITH
+            # Only the aggregates stored on Source are read, never Content
+            by_type := (GROUP Source BY .type),
+        SELECT {
+            total := count(Source),
+            active := count(Source FILTER .is_active),
+            failing := count(Source FILTER EXISTS .last_error),
+            never_crawled := count(Source FILTER NOT EXISTS .last_crawl_at),
+            content_count := sum(Source.content_count),
+            last_published_at := max(Source.last_published_at),
+            last_crawl_at := max(Source.last_crawl_at),
+            by_type := (
+                SELECT by_type {
+                    type := .key.type,
+                    total := count(.elements),
+                    active := count(.elements FILTER .is_active),
+                    failing := count(.elements FILTER EXISTS .last_error),
+                    content_count := sum(.elements.content_count),
+                    last_published_at := max(.elements.last_published_at),
+                    last_crawl_at := max(.elements.last_crawl_at)
+                }
+                ORDER BY .type
+            )
+        }\
+        """,
+    )
+
+
+async def get_sources_version(
+    executor: gel.AsyncIOExecutor,
+) -> GetSourcesVersionResult:
+    return await executor.query_required_single(
+        """\
+        WITH
+            latest := (SELECT SourceChange ORDER BY .seq DESC LIMIT 1),
+            # Ingestion aggregates change without a catalogue change
+            stats := (SELECT Source ORDER BY .stats_updated_at DESC EMPTY LAST LIMIT 1),
+        SELECT {
+            seq := latest.seq,
+            # A write taking a lower seq can commit after a higher one is visible,
+            # leaving the highest seq unchanged; the count still moves
+            changes := count(SourceChange),
+            changed_at := latest.changed_at,
+            stats_updated_at := stats.stats_updated_at
+        }\
+        """,
+    )
+
+
+async def get_sources_without_canonical_key(
+    executor: gel.AsyncIOExecutor,
+    *,
+    after_id: uuid.UUID | None = None,
+    limit: int,
+) -> list[GetSourcesWithoutCanonicalKeyResult]:
+    return await executor.query(
+        """\
+        WITH
+            after_id := <optional uuid>$after_id,
+        SELECT Source {
+            id,
+            type,
+            url
+        }
+        FILTER
+            NOT EXISTS .canonical_key
+            AND ((.id > after_id) ?? true)
+        ORDER BY .id
+        LIMIT <int64>$limit\
+        """,
+        after_id=after_id,
+        limit=limit,
+    )
+
+
+async def prune_source_changes(
+    executor: gel.AsyncIOExecutor,
+    *,
+    retention: datetime.timedelta,
+) -> PruneSourceChangesResult:
+    return await executor.query_required_single(
+        """\
+        WITH
+            pruned := (
+                DELETE SourceChange
+                FILTER .changed_at < datetime_of_statement() - <duration>$retention
+            ),
+            # Remember where the log now starts, so older cursors can be told apart
+            horizon := (
+                FOR seq IN max(pruned.seq) UNION (
+                    INSERT ChangeLogHorizon {
+                        log := 'sources',
+                        through := seq
+                    }
+                    UNLESS CONFLICT ON .log
+                    ELSE (
+                        UPDATE ChangeLogHorizon
+                        SET {
+                            through := max({.through, seq})
+                        }
+                    )
+                )
+            ),
+        SELECT {
+            pruned := count(pruned),
+            through := horizon.through
+        }\
+        """,
+        retention=retention,
+    )
+
+
+async def set_canonical_key(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID,
+    canonical_key: str,
+) -> DeleteSourceResult | None:
+    return await executor.query_single(
+        """\
+        SELECT (
+            UPDATE Source
+            FILTER .id = <uuid>$source_id
+            SET {
+                canonical_key := <str>$canonical_key
+            }
+        ) {
+            id
+        }\
+        """,
+        source_id=source_id,
+        canonical_key=canonical_key,
+    )
+
+
+async def update_source(
+    executor: gel.AsyncIOExecutor,
+    *,
+    source_id: uuid.UUID,
+    name: str | None = None,
+    type: str | None = None,
+    url: str | None = None,
+    canonical_key: str | None = None,
+    is_active: bool | None = None,
+) -> CreateSourceResult | None:
+    return await executor.query_single(
+        """\
+        SELECT (
+            UPDATE Source
+            FILTER .id = <uuid>$source_id
+            SET {
+                name := <optional str>$name ?? .name,
+                type := <optional str>$type ?? .type,
+                url := <optional str>$url ?? .url,
+                canonical_key := <optional str>$canonical_key ?? .canonical_key,
+                is_active := <optional bool>$is_active ?? .is_active,
+                # A new address may name another channel, so ingestion starts over
+                platform_id := .platform_id IF (<optional str>$url ?? .url) = .url ELSE <str>{},
+                crawl_etag := .crawl_etag IF (<optional str>$url ?? .url) = .url ELSE <str>{},
+                crawl_cursor := .crawl_cursor IF (<optional str>$url ?? .url) = .url ELSE <datetime>{}
+            }
+        ) {
+            id,
+            name,
+            type,
+            url,
+            is_active,
+            created_at,
+            updated_at,
+            content_count,
+            last_published_at,
+            last_crawl_at,
+            last_error
+        }\
+        """,
+        source_id=source_id,
+        name=name,
+        type=type,
+        url=url,
+        canonical_key=canonical_key,
+        is_active=is_active,
+    )
+
+
+async def update_sources(
+    executor: gel.AsyncIOExecutor,
+    *,
+    ids: list[uuid.UUID] | None = None,
+    type: str | None = None,
+    is_active: bool | None = None,
+    created_before: datetime.datetime | None = None,
+    set_is_active: bool,
+) -> list[CreateSourceResult]:
+    return await executor.query(
+        """\
+        WITH
+            ids := <optional array<uuid>>$ids,
+            type_filter := <optional str>$type,
+            is_active_filter := <optional bool>$is_active,
+            created_before := <optional datetime>$created_before,
+        SELECT (
+            UPDATE Source
+            FILTER
+                (NOT EXISTS ids OR .id IN array_unpack(ids))
+                AND ((.type = type_filter) ?? true)
+                AND ((.is_active = is_active_filter) ?? true)
+                AND ((.created_at < created_before) ?? true)
+            SET {
+                is_active := <bool>$set_is_active
+            }
+        ) {
+            id,
+            name,
+            type,
+            url,
+            is_active,
+            created_at,
+            updated_at,
+            content_count,
+            last_published_at,
+            last_crawl_at,
+            last_error
+        }\
+        """,
+        ids=ids,
+        type=type,
+        is_active=is_active,
+        created_before=created_before,
+        set_is_active=set_is_active,
+    )
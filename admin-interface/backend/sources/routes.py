@@ -1,41 +1,230 @@
 """Sources routes."""
 
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
-from antidote import inject
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import UploadFile
 
 from auth.routes import get_current_user
 from auth.models import User
-from sources.models import Source, SourceCreate
+from dependencies import provide
+from export import ExportFormat, export_response
+from http_cache import cache_headers, is_not_modified, make_etag
+from responses import APIResponse
+from sources.bulk import parse_json_array, parse_stream, read_upload
+from sources.models import (
+    BulkImportResult,
+    Source,
+    SourceBulkResult,
+    SourceBulkUpdate,
+    SourceChangePage,
+    SourceCreate,
+    SourcePage,
+    SourceSelection,
+    SourceStats,
+    SourceUpdate,
+)
 from sources.service import SourceService
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
 
-@router.get("/", response_model=List[Source])
+@router.get("/", response_model=SourcePage)
 async def get_sources(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    source_type: Optional[str] = Query(None, alias="type"),
+    is_active: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
-    source_service: SourceService = inject[SourceService]
+    source_service: SourceService = provide(SourceService)
 ):
-    """Get all sources."""
-    return await source_service.get_all_sources()
+    """Get a page of sources, optionally filtered by type and status."""
+    # Any write to any source or to its ingestion stats bumps the version, so unchanged pages get a 304
+    version, last_modified = await source_service.catalogue_version()
+    etag = make_etag("sources", version)
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    
+    page = await source_service.list_sources(
+        limit=limit,
+        cursor=cursor,
+        source_type=source_type,
+        is_active=is_active
+    )
+    # Returned as a response so FastAPI does not validate the rows a second time
+    return APIResponse(page, headers=headers)
+
+
+@router.get("/stats", response_model=SourceStats)
+async def get_source_stats(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Get source counts, content counts and crawl health, overall and per type."""
+    version, last_modified = await source_service.catalogue_version()
+    etag = make_etag("sources-stats", version)
+    headers = cache_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    
+    stats = await source_service.stats()
+    return APIResponse(stats.model_dump(), headers=headers)
+
+
+@router.get("/export")
+async def export_sources(
+    export_format: ExportFormat = Query("ndjson", alias="format"),
+    source_type: Optional[str] = Query(None, alias="type"),
+    is_active: Optional[bool] = None,
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Stream all matching sources as NDJSON or CSV."""
+    rows = await source_service.export_sources(
+        export_format,
+        source_type=source_type,
+        is_active=is_active
+    )
+    return export_response(rows, export_format, "sources")
+
+
+@router.get("/changes", response_model=SourceChangePage)
+async def get_source_changes(
+    since: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    wait: float = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Get inserts, updates and deletions after a cursor; long-polls for up to `wait` seconds."""
+    return await source_service.get_changes(since=since, limit=limit, wait=wait)
+
+
+@router.get("/changes/stream")
+async def stream_source_changes(
+    since: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Stream changes after a cursor as server-sent events."""
+    # Validate the cursor before the response starts
+    page = await source_service.get_changes(since=since or last_event_id)
+    
+    async def events() -> AsyncIterator[str]:
+        nonlocal page
+        heartbeat = source_service.config.changes_heartbeat_seconds
+        while True:
+            for change in page.changes:
+                yield f"id: {change.seq}\nevent: {change.kind}\ndata: {change.model_dump_json()}\n\n"
+            if not page.changes:
+                yield ": keepalive\n\n"
+            page = await source_service.get_changes(
+                since=page.next_cursor,
+                wait=0 if page.has_more else heartbeat
+            )
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/", response_model=Source)
 async def create_source(
     source_data: SourceCreate,
     current_user: User = Depends(get_current_user),
-    source_service: SourceService = inject[SourceService]
+    source_service: SourceService = provide(SourceService)
 ):
-    """Create a new source."""
+    """Create a new source; 409 when its URL matches an existing source."""
     return await source_service.create_source(source_data)
 
 
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_create_sources(
+    request: Request,
+    dry_run: bool = False,
+    chunk_size: Optional[int] = Query(None, ge=1),
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Import sources from a JSON array, or an NDJSON/CSV body or file upload."""
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    
+    if media_type == "multipart/form-data":
+        form = await request.form()
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=400, detail="Expected a 'file' upload")
+        rows = parse_stream(
+            read_upload(upload),
+            (upload.content_type or "").lower(),
+            upload.filename or ""
+        )
+    elif media_type in ("", "application/json"):
+        try:
+            items = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array")
+        rows = parse_json_array(items)
+    else:
+        rows = parse_stream(request.stream(), media_type)
+    
+    if rows is None:
+        raise HTTPException(status_code=415, detail="Upload must be JSON, NDJSON or CSV")
+    
+    return await source_service.bulk_create_sources(
+        rows,
+        dry_run=dry_run,
+        chunk_size=chunk_size
+    )
+
+
+@router.patch("/", response_model=SourceBulkResult)
+async def bulk_update_sources(
+    update: SourceBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Pause or resume the listed sources, or all sources matching a filter, in one statement."""
+    return await source_service.bulk_update_sources(update, update.is_active)
+
+
+@router.delete("/", response_model=SourceBulkResult)
+async def bulk_delete_sources(
+    selection: SourceSelection,
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Delete the listed sources, or all sources matching a filter, in one statement."""
+    return await source_service.bulk_delete_sources(selection)
+
+
+@router.patch("/{source_id}", response_model=Source)
+async def update_source(
+    source_id: str,
+    changes: SourceUpdate,
+    current_user: User = Depends(get_current_user),
+    source_service: SourceService = provide(SourceService)
+):
+    """Edit a source; omitted fields are left unchanged."""
+    source = await source_service.update_source(source_id, changes)
+    if source is None:
+        raise HTTPException(status_code=404, detail="Source not found")
+    return source
+
+
 @router.delete("/{source_id}")
 async def delete_source(
     source_id: str,
     current_user: User = Depends(get_current_user),
-    source_service: SourceService = inject[SourceService]
+    source_service: SourceService = provide(SourceService)
 ):
     """Delete a source."""
     success = await source_service.delete_source(source_id)
@@ -1,79 +1,534 @@
 """Sources service for managing content sources."""
 
-from datetime import datetime
-from typing import List
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from fastapi import HTTPException
+from pydantic import ValidationError
 from antidote import injectable, inject
-import edgedb
+import gel
 
+from config import SourcesConfig
 from database import DatabaseService
-from sources.models import Source, SourceCreate
+from export import ExportFormat, encode_rows, iter_pages
+from pagination import decode_cursor, encode_cursor
+from sources.bulk import ParsedRow
+from sources.canonical import canonical_key
+from sources.models import (
+    BulkImportResult,
+    BulkRowResult,
+    Source,
+    SourceChange,
+    SourceBulkItem,
+    SourceBulkResult,
+    SourceChangePage,
+    SourceCreate,
+    SourceSelection,
+    SourceStats,
+    SourceTypeStats,
+    SourceUpdate,
+)
 
 # Import generated queries
 from sources.queries import (
-    get_all_sources,
+    BulkCreateSourcesResult,
+    CreateSourceResult,
+    GetSourceChangesResult,
+    bulk_create_sources as bulk_create_sources_query,
+    count_sources,
+    get_source_changes,
+    get_source_changes_horizon,
+    get_sources_page,
+    get_sources_stats,
+    get_sources_version,
+    get_sources_without_canonical_key,
+    set_canonical_key,
     create_source as create_source_query,
+    delete_source as delete_source_query,
+    delete_sources as delete_sources_query,
     get_source_by_id,
-    delete_source as delete_source_query
+    prune_source_changes,
+    update_source as update_source_query,
+    update_sources as update_sources_query
 )
 
 
+def _to_source(source: Union[CreateSourceResult, BulkCreateSourcesResult]) -> Source:
+    """Convert a generated query result into the API model."""
+    return Source(
+        id=str(source.id),
+        name=source.name,
+        type=source.type,
+        url=source.url,
+        is_active=source.is_active or False,
+        created_at=source.created_at,
+        updated_at=source.updated_at,
+        content_count=source.content_count or 0,
+        last_published_at=source.last_published_at,
+        last_crawl_at=source.last_crawl_at,
+        last_error=source.last_error
+    )
+
+
+def _to_source_row(source: CreateSourceResult) -> Dict[str, Any]:
+    """Map a trusted query result to a JSON-ready dict shaped like Source.
+    
+    Skips model validation on the hot read path; orjson encodes the UUID and
+    datetimes itself.
+    """
+    return {
+        "id": source.id,
+        "name": source.name,
+        "type": source.type,
+        "url": source.url,
+        "is_active": source.is_active or False,
+        "created_at": source.created_at,
+        "updated_at": source.updated_at,
+        "content_count": source.content_count or 0,
+        "last_published_at": source.last_published_at,
+        "last_crawl_at": source.last_crawl_at,
+        "last_error": source.last_error,
+    }
+
+
+EXPORT_FIELDS = ["id", "name", "type", "url", "is_active", "created_at", "updated_at"]
+
+
+def _to_export_row(source: CreateSourceResult) -> Dict[str, Any]:
+    """Flatten a source for NDJSON/CSV export."""
+    return {
+        "id": str(source.id),
+        "name": source.name,
+        "type": source.type,
+        "url": source.url,
+        "is_active": source.is_active,
+        "created_at": source.created_at,
+        "updated_at": source.updated_at,
+    }
+
+
+def _to_change(change: GetSourceChangesResult) -> SourceChange:
+    """Convert a change log entry into the API model."""
+    return SourceChange(
+        seq=change.seq,
+        kind=change.kind,
+        source_id=str(change.source_id),
+        changed_at=change.changed_at,
+        source=_to_source(change.source) if change.source else None
+    )
+
+
+def _deliverable(changes: List[GetSourceChangesResult], since: int) -> List[GetSourceChangesResult]:
+    """Return the changes that can be served without skipping one still in flight.
+    
+    Sequence numbers are taken at insert, so a lower one can commit after a
+    higher one is visible. A gap is passed only once the change after it is
+    settled; until then the feed stops before it.
+    """
+    deliverable = []
+    last = since
+    for change in changes:
+        if change.seq != last + 1 and not change.settled:
+            break
+        deliverable.append(change)
+        last = change.seq
+    return deliverable
+
+
+def _decode_change_cursor(cursor: Optional[str]) -> int:
+    """Change feed cursors are the sequence number of the last change seen."""
+    if not cursor:
+        return 0
+    try:
+        seq = int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if seq < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return seq
+
+
 @injectable
 class SourceService:
     """Service for managing content sources."""
     
-    def __init__(self, db: DatabaseService = inject[DatabaseService]):
+    def __init__(
+        self,
+        db: DatabaseService = inject[DatabaseService],
+        config: SourcesConfig = inject[SourcesConfig]
+    ):
         self.db = db
+        self.config = config
+        # Replaced on every write; long-polls in this process wait on it
+        self._changed = asyncio.Event()
+    
+    def _notify_changed(self):
+        """Wake change feed waiters after a write from this process."""
+        self._changed.set()
+        self._changed = asyncio.Event()
     
-    async def get_all_sources(self) -> List[Source]:
-        """Get all sources ordered by creation date."""
+    async def catalogue_version(self) -> Tuple[str, Optional[datetime]]:
+        """Version and time of the latest change to any source or its ingestion stats."""
         client = await self.db.get_client()
-        sources = await get_all_sources(client)
+        latest = await get_sources_version(client)
+        stats_at = latest.stats_updated_at
+        version = (
+            f"{latest.seq or 0}.{latest.changes}"
+            f"-{int(stats_at.timestamp() * 1_000_000) if stats_at else 0}"
+        )
+        changed = [at for at in (latest.changed_at, stats_at) if at is not None]
+        return version, max(changed, default=None)
+    
+    async def stats(self) -> SourceStats:
+        """Ingestion summary of all sources, read from their stored aggregates."""
+        client = await self.db.get_client()
+        stats = await get_sources_stats(client)
+        return SourceStats(
+            total=stats.total,
+            active=stats.active,
+            failing=stats.failing,
+            never_crawled=stats.never_crawled,
+            content_count=stats.content_count,
+            last_published_at=stats.last_published_at,
+            last_crawl_at=stats.last_crawl_at,
+            by_type=[
+                SourceTypeStats(
+                    type=item.type,
+                    total=item.total,
+                    active=item.active,
+                    failing=item.failing,
+                    content_count=item.content_count,
+                    last_published_at=item.last_published_at,
+                    last_crawl_at=item.last_crawl_at
+                )
+                for item in stats.by_type
+            ]
+        )
+    
+    async def list_sources(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        source_type: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Get one page of sources, newest first, with the filtered total.
         
-        return [
-            Source(
-                id=str(source.id),
-                name=source.name,
-                type=source.type,
-                url=source.url,
-                is_active=source.is_active or False,
-                created_at=source.created_at or datetime.now(),
-                updated_at=source.updated_at or datetime.now()
+        Returns a plain dict shaped like SourcePage for APIResponse.
+        """
+        limit = min(limit or self.config.default_page_size, self.config.max_page_size)
+        cursor_created_at, cursor_id = decode_cursor(cursor) if cursor else (None, None)
+        
+        client = await self.db.get_client()
+        # Fetch one extra row to know whether another page follows
+        sources, total = await asyncio.gather(
+            get_sources_page(
+                client,
+                type=source_type,
+                is_active=is_active,
+                cursor_created_at=cursor_created_at,
+                cursor_id=cursor_id,
+                limit=limit + 1
+            ),
+            count_sources(client, type=source_type, is_active=is_active)
+        )
+        
+        next_cursor = None
+        if len(sources) > limit:
+            sources = sources[:limit]
+            last = sources[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        
+        return {
+            "items": [_to_source_row(source) for source in sources],
+            "total": total,
+            "next_cursor": next_cursor,
+        }
+    
+    async def export_sources(
+        self,
+        export_format: ExportFormat,
+        source_type: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ) -> AsyncIterator[bytes]:
+        """Encode every matching source, reading one keyset page at a time."""
+        client = await self.db.get_client()
+        
+        async def fetch(
+            after: Optional[Tuple[datetime, uuid.UUID]], limit: int
+        ) -> List[CreateSourceResult]:
+            cursor_created_at, cursor_id = after or (None, None)
+            return await get_sources_page(
+                client,
+                type=source_type,
+                is_active=is_active,
+                cursor_created_at=cursor_created_at,
+                cursor_id=cursor_id,
+                limit=limit
             )
-            for source in sources
-        ]
+        
+        async def rows() -> AsyncIterator[List[Dict[str, Any]]]:
+            pages = iter_pages(
+                fetch,
+                lambda source: (source.created_at, source.id),
+                self.config.export_page_size
+            )
+            async for page in pages:
+                yield [_to_export_row(source) for source in page]
+        
+        return encode_rows(rows(), export_format, EXPORT_FIELDS)
     
     async def create_source(self, source_data: SourceCreate) -> Source:
         """Create a new source."""
         client = await self.db.get_client()
         
-        # Insert new source using generated query
-        new_source = await create_source_query(
+        # Insert and read back the new source in a single statement; the
+        # exclusive canonical key turns a duplicate into an empty result
+        source = await create_source_query(
             client,
             name=source_data.name,
             type=source_data.type,
-            url=source_data.url
+            url=source_data.url,
+            canonical_key=canonical_key(source_data.type, source_data.url)
         )
+        if source is None:
+            raise HTTPException(status_code=409, detail="A source with this URL already exists")
+        self._notify_changed()
         
-        # Fetch the complete source with all fields
-        complete_source = await get_source_by_id(
-            client,
-            source_id=new_source.id
+        return _to_source(source)
+    
+    async def bulk_create_sources(
+        self,
+        rows: AsyncIterator[ParsedRow],
+        dry_run: bool = False,
+        chunk_size: Optional[int] = None
+    ) -> BulkImportResult:
+        """Validate uploaded rows and insert them in chunks."""
+        chunk_size = min(
+            chunk_size or self.config.bulk_chunk_size,
+            self.config.bulk_max_chunk_size
+        )
+        client = await self.db.get_client()
+        
+        results: List[BulkRowResult] = []
+        chunk: List[Tuple[int, SourceCreate, str]] = []
+        # One statement cannot insert the same key twice, so repeats within the upload are caught here
+        seen_keys = set()
+        truncated = False
+        row_number = 0
+        
+        async for data, error in rows:
+            row_number += 1
+            if row_number > self.config.bulk_max_rows:
+                truncated = True
+                break
+            
+            if error is None:
+                try:
+                    source_data = SourceCreate.model_validate(data)
+                except ValidationError as e:
+                    error = "; ".join(
+                        f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                        for err in e.errors()
+                    )
+            
+            if error is not None:
+                results.append(BulkRowResult(row=row_number, status="invalid", error=error))
+                continue
+            
+            key = canonical_key(source_data.type, source_data.url)
+            if key in seen_keys:
+                results.append(BulkRowResult(row=row_number, status="duplicate", error="Repeats an earlier row"))
+                continue
+            seen_keys.add(key)
+            
+            if dry_run:
+                results.append(BulkRowResult(row=row_number, status="valid"))
+            else:
+                chunk.append((row_number, source_data, key))
+                if len(chunk) >= chunk_size:
+                    results.extend(await self._insert_chunk(client, chunk))
+                    chunk = []
+        
+        if chunk:
+            results.extend(await self._insert_chunk(client, chunk))
+        
+        if any(result.status == "created" for result in results):
+            self._notify_changed()
+        
+        # Invalid rows are reported as they are read, inserted ones per chunk
+        results.sort(key=lambda result: result.row)
+        return BulkImportResult(
+            dry_run=dry_run,
+            total=len(results),
+            created=sum(result.status == "created" for result in results),
+            duplicate=sum(result.status == "duplicate" for result in results),
+            invalid=sum(result.status == "invalid" for result in results),
+            failed=sum(result.status == "failed" for result in results),
+            truncated=truncated,
+            results=results
+        )
+    
+    async def _insert_chunk(
+        self,
+        client: gel.AsyncIOClient,
+        chunk: List[Tuple[int, SourceCreate, str]]
+    ) -> List[BulkRowResult]:
+        """Insert one chunk with a single statement in its own transaction."""
+        payload = json.dumps([
+            {**source_data.model_dump(), "canonical_key": key}
+            for _, source_data, key in chunk
+        ])
+        
+        try:
+            async for tx in client.transaction():
+                async with tx:
+                    created = await bulk_create_sources_query(tx, sources=payload)
+        except gel.EdgeDBError as e:
+            return [
+                BulkRowResult(row=row_number, status="failed", error=str(e))
+                for row_number, _, _ in chunk
+            ]
+        
+        # The query tags every inserted source with its position in the chunk;
+        # rows whose key was already taken are skipped and have no result
+        by_position = {source.row: source for source in created}
+        return [
+            BulkRowResult(
+                row=row_number,
+                status="created",
+                source=_to_source(by_position[position])
+            )
+            if position in by_position
+            else BulkRowResult(row=row_number, status="duplicate", error="Source already exists")
+            for position, (row_number, _, _) in enumerate(chunk)
+        ]
+    
+    async def backfill_canonical_keys(self, batch_size: int = 500) -> Dict[str, Any]:
+        """Set the canonical key of sources created before it existed.
+        
+        A source whose key is already taken keeps an empty key and is reported
+        as a duplicate, to be merged or deleted by hand.
+        """
+        client = await self.db.get_client()
+        updated = 0
+        duplicates: List[Dict[str, str]] = []
+        after_id = None
+        
+        while True:
+            sources = await get_sources_without_canonical_key(client, after_id=after_id, limit=batch_size)
+            if not sources:
+                break
+            for source in sources:
+                key = canonical_key(source.type, source.url)
+                try:
+                    await set_canonical_key(client, source_id=source.id, canonical_key=key)
+                    updated += 1
+                except gel.ConstraintViolationError:
+                    duplicates.append({"id": str(source.id), "url": source.url, "canonical_key": key})
+            after_id = sources[-1].id
+        
+        return {"updated": updated, "duplicates": duplicates}
+    
+    async def prune_changes(self) -> Dict[str, Any]:
+        """Delete change log entries older than the retention window.
+        
+        The highest pruned sequence number is kept, so feed cursors from
+        before it are answered with 410 instead of silently skipping changes.
+        """
+        client = await self.db.get_client()
+        result = await prune_source_changes(
+            client, retention=timedelta(days=self.config.changes_retention_days)
         )
+        return {"pruned": result.pruned, "through": result.through}
+    
+    async def update_source(self, source_id: str, changes: SourceUpdate) -> Optional[Source]:
+        """Apply the given fields to a source; None when it does not exist."""
+        client = await self.db.get_client()
+        
+        try:
+            key = None
+            if changes.type is not None or changes.url is not None:
+                # The canonical key depends on both, so fill in whichever is unchanged
+                current = await get_source_by_id(client, source_id=source_id)
+                if current is None:
+                    return None
+                key = canonical_key(changes.type or current.type, changes.url or current.url)
+            
+            source = await update_source_query(
+                client,
+                source_id=source_id,
+                name=changes.name,
+                type=changes.type,
+                url=changes.url,
+                canonical_key=key,
+                is_active=changes.is_active
+            )
+        except gel.InvalidValueError:
+            raise HTTPException(status_code=400, detail="Invalid source ID format")
+        except gel.ConstraintViolationError:
+            raise HTTPException(status_code=409, detail="A source with this URL already exists")
         
-        if not complete_source:
-            raise HTTPException(status_code=500, detail="Failed to create source")
-        
-        source = complete_source[0]  # get_source_by_id returns a list
-        return Source(
-            id=str(source.id),
-            name=source.name,
-            type=source.type,
-            url=source.url,
-            is_active=source.is_active or False,
-            created_at=source.created_at or datetime.now(),
-            updated_at=source.updated_at or datetime.now()
+        if source is None:
+            return None
+        self._notify_changed()
+        return _to_source(source)
+    
+    def _selection_args(self, selection: SourceSelection) -> Dict[str, Any]:
+        """Query arguments selecting the ids and filter of a bulk request."""
+        if selection.ids is not None and len(selection.ids) > self.config.bulk_max_rows:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {self.config.bulk_max_rows} ids per request"
+            )
+        conditions = selection.filter.model_dump() if selection.filter else {}
+        return {
+            "ids": selection.ids,
+            "type": conditions.get("type"),
+            "is_active": conditions.get("is_active"),
+            "created_before": conditions.get("created_before"),
+        }
+    
+    @staticmethod
+    def _not_found(selection: SourceSelection, matched: set) -> List[SourceBulkItem]:
+        """Results for requested ids that matched nothing."""
+        return [
+            SourceBulkItem(id=str(source_id), status="not_found")
+            for source_id in dict.fromkeys(selection.ids or [])
+            if source_id not in matched
+        ]
+    
+    async def bulk_update_sources(self, selection: SourceSelection, is_active: bool) -> SourceBulkResult:
+        """Pause or resume every selected source in one statement."""
+        client = await self.db.get_client()
+        updated = await update_sources_query(
+            client,
+            set_is_active=is_active,
+            **self._selection_args(selection)
         )
+        if updated:
+            self._notify_changed()
+        
+        results = [
+            SourceBulkItem(id=str(source.id), status="updated", source=_to_source(source))
+            for source in updated
+        ]
+        results += self._not_found(selection, {source.id for source in updated})
+        return SourceBulkResult(matched=len(updated), results=results)
+    
+    async def bulk_delete_sources(self, selection: SourceSelection) -> SourceBulkResult:
+        """Delete every selected source in one statement."""
+        client = await self.db.get_client()
+        deleted = await delete_sources_query(client, **self._selection_args(selection))
+        if deleted:
+            self._notify_changed()
+        
+        results = [SourceBulkItem(id=str(source.id), status="deleted") for source in deleted]
+        results += self._not_found(selection, {source.id for source in deleted})
+        return SourceBulkResult(matched=len(deleted), results=results)
     
     async def delete_source(self, source_id: str) -> bool:
         """Delete a source by ID."""
@@ -84,7 +539,58 @@ class SourceService:
                 client,
                 source_id=source_id
             )
+            if deleted is not None:
+                self._notify_changed()
             
             return deleted is not None
-        except edgedb.InvalidValueError:
+        except gel.InvalidValueError:
             raise HTTPException(status_code=400, detail="Invalid source ID format")
+    
+    async def get_changes(
+        self,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+        wait: float = 0
+    ) -> SourceChangePage:
+        """Get changes after a cursor, waiting up to `wait` seconds for one to appear."""
+        since_seq = _decode_change_cursor(since)
+        limit = min(limit or self.config.changes_page_size, self.config.changes_max_page_size)
+        deadline = time.monotonic() + min(wait, self.config.changes_max_wait_seconds)
+        commit_lag = timedelta(seconds=self.config.changes_commit_lag_seconds)
+        client = await self.db.get_client()
+        
+        horizon = await get_source_changes_horizon(client)
+        if horizon is not None and since_seq < horizon:
+            raise HTTPException(
+                status_code=410,
+                detail=f"Changes up to {horizon} were pruned; reload the sources and resume from cursor {horizon}"
+            )
+        
+        while True:
+            # Taken before querying so a write landing in between still wakes us
+            changed = self._changed
+            changes = _deliverable(
+                await get_source_changes(
+                    client, since=since_seq, limit=limit + 1, commit_lag=commit_lag
+                ),
+                since_seq
+            )
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                break
+            # Writes by other processes are only noticed by polling
+            try:
+                await asyncio.wait_for(
+                    changed.wait(),
+                    min(remaining, self.config.changes_poll_interval_seconds)
+                )
+            except asyncio.TimeoutError:
+                pass
+        
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        return SourceChangePage(
+            changes=[_to_change(change) for change in changes],
+            next_cursor=str(changes[-1].seq if changes else since_seq),
+            has_more=has_more
+        )
@@ -0,0 +1,44 @@
+"""Shared fixtures: the app wired to the in-memory database fake.
+
+Tests drive coroutines with `asyncio.run`, so no async plugin is needed.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable
+
+os.environ.setdefault("SECRET_KEY", "test")
+# Hashing at production cost would make every login take a noticeable time
+os.environ.setdefault("PASSWORD_HASH_ROUNDS", "4")
+
+import httpx
+import pytest
+from antidote import world
+
+from benchmarks.fakedb import FakeDatabaseService, FakeGel
+from database import DatabaseService
+from main import create_app
+
+ADMIN = {"username": "admin", "password": "admin123"}
+
+Scenario = Callable[[httpx.AsyncClient, FakeGel], Awaitable[Any]]
+
+
+@pytest.fixture
+def api() -> Callable[[Scenario], Any]:
+    """Run a scenario against a fresh app and FakeGel, with a client logged in as the default admin."""
+    
+    async def main(scenario: Scenario) -> Any:
+        with world.test.clone() as overrides:
+            db = FakeDatabaseService()
+            overrides[DatabaseService] = db
+            app = create_app()
+            await db.initialize()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/auth/login", json=ADMIN)
+                response.raise_for_status()
+                client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+                return await scenario(client, db.fake)
+    
+    return lambda scenario: asyncio.run(main(scenario))
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+PREFIX = "0123456789ab"
+
+
+async def create_key(client, **body):
+    response = await client.post("/auth/api-keys", json={"name": "crawler", **body})
+    response.raise_for_status()
+    return response.json()
+
+
+async def with_key(client, key: str):
+    """List API keys authenticated by `key` alone."""
+    return await client.get("/auth/api-keys", headers={"Authorization": "", "X-API-Key": key})
+
+
+def test_key_is_returned_once_and_authenticates(api):
+    async def scenario(client, db):
+        created = await create_key(client)
+        listed = (await client.get("/auth/api-keys")).json()
+        first = await with_key(client, created["key"])
+        second = await with_key(client, created["key"])
+        anonymous = await client.get("/auth/api-keys", headers={"Authorization": ""})
+        return created, listed, first, second, anonymous, db
+    
+    created, listed, first, second, anonymous, db = api(scenario)
+    assert created["key"].startswith(f"grk_{created['prefix']}.")
+    assert [key["id"] for key in listed] == [created["id"]]
+    assert "key" not in listed[0]
+    assert created["key"] not in db.api_keys[created["prefix"]].key_hash
+    assert (first.status_code, second.status_code, anonymous.status_code) == (200, 200, 403)
+    # The second request is answered from the lookup cache
+    assert db.queries["get_api_key_by_prefix"] == 1
+
+
+@pytest.mark.parametrize("key", ["grk_{prefix}.wrong-secret", "grk_{prefix}", "not-a-key"])
+def test_wrong_keys_are_rejected(api, key):
+    async def scenario(client, db):
+        created = await create_key(client)
+        return await with_key(client, key.format(prefix=created["prefix"]))
+    
+    response = api(scenario)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid API key"
+
+
+def test_expiry_date_is_enforced(api, monkeypatch):
+    async def scenario(client, db):
+        created = await create_key(client, expires_in_days=1)
+        valid = await with_key(client, created["key"])
+        later = datetime.now(timezone.utc) + timedelta(days=1, seconds=1)
+        monkeypatch.setattr("auth.api_keys.time.time", lambda: later.timestamp())
+        return valid, await with_key(client, created["key"])
+    
+    valid, expired = api(scenario)
+    assert valid.status_code == 200
+    assert expired.status_code == 401
+    assert expired.json()["detail"] == "API key expired"
+
+
+def test_revocation_takes_effect_despite_the_cache(api):
+    async def scenario(client, db):
+        created = await create_key(client)
+        before = await with_key(client, created["key"])
+        revoked = await client.delete(f"/auth/api-keys/{created['id']}")
+        after = await with_key(client, created["key"])
+        again = await client.delete(f"/auth/api-keys/{created['id']}")
+        listed = (await client.get("/auth/api-keys")).json()
+        return before, revoked, after, again, listed
+    
+    before, revoked, after, again, listed = api(scenario)
+    assert before.status_code == 200
+    assert revoked.status_code == 200
+    assert after.status_code == 401
+    assert again.status_code == 404
+    assert listed[0]["revoked_at"] is not None
+
+
+def test_new_key_replaces_a_cached_miss(api, monkeypatch):
+    monkeypatch.setattr("auth.api_keys.secrets.token_hex", lambda nbytes: PREFIX)
+    
+    async def scenario(client, db):
+        # A client retrying with a key that does not exist yet caches the miss
+        missing = await with_key(client, f"grk_{PREFIX}.early")
+        created = await create_key(client)
+        return missing, await with_key(client, created["key"])
+    
+    missing, found = api(scenario)
+    assert missing.status_code == 401
+    assert found.status_code == 200
+
+
+def test_revoking_a_malformed_id(api):
+    async def scenario(client, db):
+        return await client.delete("/auth/api-keys/not-a-uuid")
+    
+    assert api(scenario).status_code == 400
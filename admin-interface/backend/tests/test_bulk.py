@@ -0,0 +1,136 @@
+import asyncio
+
+import gel
+
+from sources.bulk import iter_lines, parse_csv
+
+
+def parse(*chunks: bytes):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+    
+    async def rows():
+        return [row async for row in parse_csv(iter_lines(stream()))]
+    
+    return asyncio.run(rows())
+
+
+def test_csv_quoted_fields_may_span_lines():
+    rows = parse(b'name,type,url\r\n"Two\r\nlines, ""quoted""",rss,https://example.com/a\r\n\r\nOne,rss,https://example.com/b\r\n')
+    assert rows == [
+        ({"name": 'Two\nlines, "quoted"', "type": "rss", "url": "https://example.com/a"}, None),
+        ({"name": "One", "type": "rss", "url": "https://example.com/b"}, None),
+    ]
+
+
+def test_csv_records_split_across_chunks():
+    rows = parse(b"\xef\xbb\xbfName,Type,URL\nA,r", b"ss,https://exa", b"mple.com/a")
+    assert rows == [({"name": "A", "type": "rss", "url": "https://example.com/a"}, None)]
+
+
+def test_csv_reports_bad_rows():
+    rows = parse(b'name,type,url\nA,rss\n"open,rss,https://example.com/b\n')
+    assert rows == [(None, "Expected 3 columns, got 2"), (None, "Unterminated quoted field")]
+
+
+SOURCES = [
+    {"name": "A", "type": "rss", "url": "https://example.com/a"},
+    {"name": "B", "type": "youtube", "url": "https://www.youtube.com/@b"},
+]
+
+
+def statuses(result):
+    return [(row["row"], row["status"]) for row in result["results"]]
+
+
+def test_json_import_reports_a_status_per_row(api):
+    async def scenario(client, db):
+        await client.post("/sources/", json=SOURCES[0])
+        rows = [
+            *SOURCES,
+            # Another spelling of B, then a row that fails validation
+            {"name": "B again", "type": "youtube", "url": "youtube.com/@B/videos"},
+            {"name": "C", "type": "myspace", "url": "https://example.com/c"},
+        ]
+        return (await client.post("/sources/bulk", json=rows)).json(), len(db.sources)
+    
+    result, stored = api(scenario)
+    assert statuses(result) == [(1, "duplicate"), (2, "created"), (3, "duplicate"), (4, "invalid")]
+    assert result["results"][0]["error"] == "Source already exists"
+    assert result["results"][2]["error"] == "Repeats an earlier row"
+    assert (result["created"], result["duplicate"], result["invalid"]) == (1, 2, 1)
+    assert stored == 2
+
+
+def test_ndjson_body_and_csv_upload(api):
+    async def scenario(client, db):
+        ndjson = b'{"name": "A", "type": "rss", "url": "https://example.com/a"}\n\nnot json\n'
+        from_body = await client.post(
+            "/sources/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"}
+        )
+        csv = b"name,type,url\nB,youtube,https://www.youtube.com/@b\n"
+        from_file = await client.post("/sources/bulk", files={"file": ("sources.csv", csv, "application/octet-stream")})
+        return from_body.json(), from_file.json()
+    
+    from_body, from_file = api(scenario)
+    assert statuses(from_body) == [(1, "created"), (2, "invalid")]
+    assert from_body["results"][1]["error"].startswith("Invalid JSON")
+    assert statuses(from_file) == [(1, "created")]
+    assert from_file["results"][0]["source"]["url"] == "https://www.youtube.com/@b"
+
+
+def test_unsupported_bodies_are_rejected(api):
+    async def scenario(client, db):
+        return [
+            (await client.post("/sources/bulk", content=b"x", headers={"Content-Type": "text/plain"})).status_code,
+            (await client.post("/sources/bulk", json={"name": "A"})).status_code,
+            (await client.post("/sources/bulk", files={"other": ("a.csv", b"", "text/csv")})).status_code,
+        ]
+    
+    assert api(scenario) == [415, 400, 400]
+
+
+def test_dry_run_validates_without_inserting(api):
+    async def scenario(client, db):
+        result = await client.post("/sources/bulk", params={"dry_run": True}, json=SOURCES + SOURCES[:1])
+        return result.json(), len(db.sources)
+    
+    result, stored = api(scenario)
+    assert statuses(result) == [(1, "valid"), (2, "valid"), (3, "duplicate")]
+    assert result["dry_run"] and stored == 0
+
+
+def test_rows_past_the_limit_are_not_read(api, monkeypatch):
+    monkeypatch.setenv("SOURCES_BULK_MAX_ROWS", "3")
+    rows = [{"name": f"S{n}", "type": "rss", "url": f"https://example.com/{n}"} for n in range(5)]
+    
+    async def scenario(client, db):
+        return (await client.post("/sources/bulk", json=rows)).json()
+    
+    result = api(scenario)
+    assert result["truncated"]
+    assert statuses(result) == [(1, "created"), (2, "created"), (3, "created")]
+
+
+def test_a_failed_chunk_fails_only_its_own_rows(api):
+    rows = [{"name": f"S{n}", "type": "rss", "url": f"https://example.com/{n}"} for n in range(5)]
+    
+    async def scenario(client, db):
+        insert = db._handlers["bulk_create_sources"]
+        chunks = []
+        
+        def fail_second_chunk(sources):
+            chunks.append(sources)
+            if len(chunks) == 2:
+                raise gel.TransactionSerializationError("could not serialize access")
+            return insert(sources)
+        
+        db._handlers["bulk_create_sources"] = fail_second_chunk
+        result = await client.post("/sources/bulk", params={"chunk_size": 2}, json=rows)
+        return result.json(), len(chunks)
+    
+    result, chunks = api(scenario)
+    assert chunks == 3
+    assert statuses(result) == [(1, "created"), (2, "created"), (3, "failed"), (4, "failed"), (5, "created")]
+    assert result["failed"] == 2
@@ -0,0 +1,61 @@
+import pytest
+
+import cache
+from cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock the cache reads, advanced by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_at_their_deadline(clock):
+    entries = TTLCache(10)
+    entries.set("a", 1, clock[0] + 5)
+    clock[0] += 4.9
+    assert entries.get("a") == 1
+    clock[0] += 0.1
+    assert entries.get("a") is None
+    assert len(entries) == 0
+    assert entries.stats() == {"size": 0, "max_size": 10, "hits": 1, "misses": 1}
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    entries = TTLCache(2)
+    entries.set("a", 1, clock[0] + 60)
+    entries.set("b", 2, clock[0] + 60)
+    # Reading "a" makes "b" the oldest
+    entries.get("a")
+    entries.set("c", 3, clock[0] + 60)
+    assert entries.get("b") is None
+    assert (entries.get("a"), entries.get("c")) == (1, 3)
+
+
+def test_zero_size_caches_nothing(clock):
+    entries = TTLCache(0)
+    entries.set("a", 1, clock[0] + 60)
+    assert entries.get("a") is None
+
+
+def test_counters_keep_their_first_deadline(clock):
+    counters = TTLCache(10)
+    assert counters.add("n", 1, clock[0] + 10) == 1
+    clock[0] += 5
+    assert counters.add("n", 2, clock[0] + 10) == 3
+    clock[0] += 5
+    # Expired at the deadline set by the first increment, so this starts over
+    assert counters.add("n", 1, clock[0] + 10) == 1
+
+
+def test_delete_and_clear(clock):
+    entries = TTLCache(10)
+    entries.set("a", 1, clock[0] + 60)
+    entries.set("b", 2, clock[0] + 60)
+    entries.delete("a")
+    entries.delete("missing")
+    assert entries.get("a") is None
+    entries.clear()
+    assert len(entries) == 0
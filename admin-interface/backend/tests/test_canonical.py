@@ -0,0 +1,50 @@
+import pytest
+
+from sources.canonical import canonical_key, normalize_url
+
+
+@pytest.mark.parametrize("source_type, url, key", [
+    ("youtube", "https://www.youtube.com/@Foo/videos", "youtube:@foo"),
+    ("youtube", "youtube.com/@foo", "youtube:@foo"),
+    ("youtube", "https://m.youtube.com/channel/UCabc?si=x", "youtube:channel/UCabc"),
+    ("youtube", "https://www.youtube.com/c/MyChannel/featured", "youtube:c/mychannel"),
+    ("youtube", "https://www.youtube.com/MyChannel", "youtube:c/mychannel"),
+    ("youtube", "https://www.youtube.com/user/OldName", "youtube:user/oldname"),
+    ("youtube", "https://www.youtube.com/watch?v=abc", "youtube:youtube.com/watch?v=abc"),
+    ("substack", "https://foo.substack.com/feed", "substack:foo"),
+    ("substack", "https://newsletter.example.com/p/post", "substack:newsletter.example.com"),
+    ("bluesky", "https://bsky.app/profile/Foo.bsky.social", "bluesky:foo.bsky.social"),
+    ("bluesky", "https://bsky.app/profile/did:plc:AbC", "bluesky:did:plc:AbC"),
+    ("rss", "HTTP://Example.com:80/feed/?b=2&a=1", "rss:example.com/feed?a=1&b=2"),
+    ("rss", "https://example.com:8443/feed#top", "rss:example.com:8443/feed"),
+    ("podcast", "https://example.com/feed.xml?utm_source=x&fbclid=y", "podcast:example.com/feed.xml"),
+])
+def test_canonical_key(source_type, url, key):
+    assert canonical_key(source_type, url) == key
+
+
+def test_channel_ids_keep_their_case():
+    assert canonical_key("youtube", "youtube.com/channel/UCabc") != canonical_key("youtube", "youtube.com/channel/ucabc")
+
+
+def test_type_is_part_of_the_key():
+    assert canonical_key("rss", "https://example.com/feed") != canonical_key("podcast", "https://example.com/feed")
+
+
+def test_normalize_url_keeps_blank_query_values():
+    assert normalize_url(" example.com/search/?q=&page=2 ") == "example.com/search?page=2&q="
+
+
+def test_another_spelling_of_a_source_url_is_a_409(api):
+    async def scenario(client, db):
+        first = await client.post(
+            "/sources/", json={"name": "Foo", "type": "youtube", "url": "https://www.youtube.com/@Foo"}
+        )
+        second = await client.post(
+            "/sources/", json={"name": "Foo again", "type": "youtube", "url": "youtube.com/@foo/videos?si=abc"}
+        )
+        return first, second
+    
+    first, second = api(scenario)
+    assert first.status_code == 200
+    assert second.status_code == 409
@@ -0,0 +1,133 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from antidote import world
+
+from sources.queries import GetSourceChangesResult
+from sources.routes import stream_source_changes
+from sources.service import SourceService, _deliverable
+
+NOW = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def change(seq: int, settled: bool = False) -> GetSourceChangesResult:
+    return GetSourceChangesResult(
+        seq=seq, kind="insert", source_id=uuid.uuid4(), changed_at=NOW, settled=settled, source=None
+    )
+
+
+def seqs(changes):
+    return [c.seq for c in changes]
+
+
+def test_contiguous_changes_are_delivered():
+    assert seqs(_deliverable([change(4), change(5), change(6)], since=3)) == [4, 5, 6]
+
+
+def test_empty_log_delivers_nothing():
+    assert _deliverable([], since=0) == []
+
+
+def test_feed_stops_before_a_gap_still_in_flight():
+    assert seqs(_deliverable([change(4), change(6), change(7)], since=3)) == [4]
+    assert _deliverable([change(5)], since=3) == []
+
+
+def test_gap_older_than_the_commit_lag_is_skipped():
+    changes = [change(4), change(6, settled=True), change(7), change(9)]
+    assert seqs(_deliverable(changes, since=3)) == [4, 6, 7]
+
+
+def create(client, name: str):
+    return client.post("/sources/", json={"name": name, "type": "rss", "url": f"https://example.com/{name}"})
+
+
+def test_changes_after_a_cursor(api):
+    async def scenario(client, db):
+        a = (await create(client, "a")).json()
+        cursor = (await client.get("/sources/changes")).json()["next_cursor"]
+        b = (await create(client, "b")).json()
+        await client.patch(f"/sources/{a['id']}", json={"name": "a2"})
+        await client.delete(f"/sources/{b['id']}")
+        later = (await client.get("/sources/changes", params={"since": cursor})).json()
+        first = (await client.get("/sources/changes", params={"since": cursor, "limit": 1})).json()
+        return a, b, cursor, later, first
+    
+    a, b, cursor, later, first = api(scenario)
+    assert cursor == "1"
+    assert [(c["kind"], c["source_id"]) for c in later["changes"]] == [
+        ("insert", b["id"]), ("update", a["id"]), ("delete", b["id"]),
+    ]
+    assert later["changes"][1]["source"]["name"] == "a2"
+    assert later["changes"][2]["source"] is None
+    assert (later["next_cursor"], later["has_more"]) == ("4", False)
+    assert (first["next_cursor"], first["has_more"]) == ("2", True)
+
+
+def test_changes_wait_behind_an_uncommitted_write(api):
+    async def scenario(client, db):
+        for name in "abc":
+            await create(client, name)
+        # Sequence 2 was taken by a write that has not committed yet
+        db.changes.pop(1)
+        return (await client.get("/sources/changes")).json()
+    
+    page = api(scenario)
+    assert [c["seq"] for c in page["changes"]] == [1]
+    assert page["next_cursor"] == "1"
+
+
+def test_long_poll_returns_a_change_made_while_waiting(api):
+    async def scenario(client, db):
+        async def write():
+            await asyncio.sleep(0.05)
+            await create(client, "a")
+        
+        started = asyncio.get_running_loop().time()
+        response, _ = await asyncio.gather(
+            client.get("/sources/changes", params={"wait": 5}), write()
+        )
+        return response.json(), asyncio.get_running_loop().time() - started
+    
+    page, elapsed = api(scenario)
+    assert [c["kind"] for c in page["changes"]] == ["insert"]
+    assert elapsed < 1
+
+
+def test_stream_sends_changes_as_events(api):
+    async def scenario(client, db):
+        await create(client, "a")
+        await create(client, "b")
+        response = await stream_source_changes(
+            since="1", last_event_id=None, current_user=None, source_service=world[SourceService]
+        )
+        events = response.body_iterator
+        sent = [await events.__anext__()]
+        await create(client, "c")
+        sent.append(await events.__anext__())
+        await events.aclose()
+        return sent
+    
+    first, second = api(scenario)
+    assert first.startswith("id: 2\nevent: insert\ndata: ")
+    assert second.startswith("id: 3\nevent: insert\ndata: ")
+
+
+def test_pruned_cursors_are_gone(api):
+    async def scenario(client, db):
+        for name in "abc":
+            await create(client, name)
+        # The first two changes are past the retention window
+        for change in db.changes[:2]:
+            change.changed_at -= timedelta(days=31)
+        pruned = await world[SourceService].prune_changes()
+        gone = await client.get("/sources/changes", params={"since": "1"})
+        resumed = (await client.get("/sources/changes", params={"since": "2"})).json()
+        return pruned, gone, resumed
+    
+    pruned, gone, resumed = api(scenario)
+    assert pruned == {"pruned": 2, "through": 2}
+    assert gone.status_code == 410
+    assert "resume from cursor 2" in gone.json()["detail"]
+    assert [c["seq"] for c in resumed["changes"]] == [3]
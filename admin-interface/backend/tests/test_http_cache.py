@@ -0,0 +1,84 @@
+import dataclasses
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+from http_cache import cache_headers, is_not_modified, make_etag
+
+ETAG = make_etag("sources", 42)
+MODIFIED = datetime(2024, 3, 1, 10, 0, 0, 500000, tzinfo=timezone.utc)
+
+
+def request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('W/"sources-42"', True),
+    ('"sources-42"', True),
+    ('"other", W/"sources-42"', True),
+    ("*", True),
+    ('W/"sources-41"', False),
+])
+def test_if_none_match(if_none_match, expected):
+    assert is_not_modified(request(if_none_match=if_none_match), ETAG, MODIFIED) is expected
+
+
+@pytest.mark.parametrize("if_modified_since, expected", [
+    # HTTP dates drop the fraction of a second
+    ("Fri, 01 Mar 2024 10:00:00 GMT", True),
+    ("Fri, 01 Mar 2024 11:00:00 GMT", True),
+    ("Fri, 01 Mar 2024 09:59:59 GMT", False),
+    ("not a date", False),
+])
+def test_if_modified_since(if_modified_since, expected):
+    assert is_not_modified(request(if_modified_since=if_modified_since), ETAG, MODIFIED) is expected
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    stale = request(if_none_match='W/"sources-41"', if_modified_since="Fri, 01 Mar 2024 11:00:00 GMT")
+    assert not is_not_modified(stale, ETAG, MODIFIED)
+
+
+def test_unconditional_request_is_modified():
+    assert not is_not_modified(request(), ETAG, MODIFIED)
+    assert not is_not_modified(request(if_modified_since="Fri, 01 Mar 2024 11:00:00 GMT"), ETAG, None)
+
+
+def test_cache_headers():
+    assert cache_headers(ETAG, MODIFIED) == {
+        "ETag": 'W/"sources-42"',
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+        "Last-Modified": "Fri, 01 Mar 2024 10:00:00 GMT",
+    }
+
+
+def test_listing_answers_304_until_the_catalogue_changes(api):
+    async def scenario(client, db):
+        await client.post("/sources/", json={"name": "Feed", "type": "rss", "url": "https://example.com/feed"})
+        first = await client.get("/sources/")
+        etag = first.headers["etag"]
+        unchanged = await client.get("/sources/", headers={"If-None-Match": etag})
+        await client.post("/sources/", json={"name": "Other", "type": "rss", "url": "https://example.com/other"})
+        changed = await client.get("/sources/", headers={"If-None-Match": etag})
+        return unchanged, changed
+    
+    unchanged, changed = api(scenario)
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert changed.status_code == 200
+    assert changed.json()["total"] == 2
+
+
+def test_late_commit_below_the_highest_seq_changes_the_etag(api):
+    async def scenario(client, db):
+        await client.post("/sources/", json={"name": "Feed", "type": "rss", "url": "https://example.com/feed"})
+        etag = (await client.get("/sources/")).headers["etag"]
+        # A change with a lower seq becomes visible; the highest seq stays the same
+        db.version = dataclasses.replace(db.version, changes=db.version.changes + 1)
+        return await client.get("/sources/", headers={"If-None-Match": etag})
+    
+    assert api(scenario).status_code == 200
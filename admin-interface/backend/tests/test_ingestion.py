@@ -0,0 +1,179 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List
+
+import gel
+import httpx
+
+from benchmarks.fakedb import FakeDatabaseService, FakeGel
+from config import IngestionConfig
+from ingestion.fake_youtube import FakeYouTubeState, create_fake_youtube_app
+from ingestion.worker import IngestionWorker
+
+
+def crawl(
+    state: FakeYouTubeState,
+    urls: List[str],
+    scenario: Callable[[IngestionWorker, FakeGel], Awaitable[Any]],
+    **config,
+) -> Any:
+    """Run a scenario with a worker talking to the fake API and a FakeGel holding `urls` as sources."""
+    db = FakeDatabaseService()
+    for n, url in enumerate(urls):
+        db.fake._create_source(name=f"Channel {n}", type="youtube", url=url, canonical_key=url)
+    # Limits high enough that the token buckets never wait
+    config = {
+        "rate_per_second": 1000, "burst": 1000, "source_rate_per_second": 1000, "source_burst": 1000,
+        **config,
+    }
+    worker = IngestionWorker(db=db, config=IngestionConfig(**config))
+    worker.transport = httpx.ASGITransport(app=create_fake_youtube_app(state))
+    
+    async def main():
+        try:
+            return await scenario(worker, db.fake)
+        finally:
+            await worker.close()
+    
+    return asyncio.run(main())
+
+
+def channel_url(state: FakeYouTubeState, n: int) -> str:
+    return f"https://www.youtube.com/channel/{state.channel_id(n)}"
+
+
+def test_first_crawl_stores_uploads_and_sets_the_cursor():
+    state = FakeYouTubeState(channels=2, videos_per_channel=10)
+    
+    async def scenario(worker, db):
+        report = await worker.run_once()
+        return report, dict(db.crawl_state), list(db.sources.values())
+    
+    report, crawl_state, sources = crawl(state, [channel_url(state, 0), "https://www.youtube.com/@channel1"], scenario)
+    assert report.summary() == {
+        "sources": 2, "requests": 5, "fetched": 20, "written": 20, "not_modified": 0, "truncated": 0, "errors": 0,
+    }
+    assert {s.platform_id for s in crawl_state.values()} == {state.channel_id(0), state.channel_id(1)}
+    for source in sources:
+        assert source.content_count == 10 and source.last_error is None
+        assert crawl_state[source.id].crawl_cursor == source.last_published_at
+
+
+def test_unchanged_uploads_are_skipped_by_etag():
+    state = FakeYouTubeState(channels=1, videos_per_channel=10)
+    
+    async def scenario(worker, db):
+        await worker.run_once()
+        return await worker.run_once()
+    
+    report = crawl(state, [channel_url(state, 0)], scenario)
+    assert report.summary()["not_modified"] == 1
+    assert report.sources[0].requests == 1 and report.sources[0].fetched == 0
+    assert state.not_modified == 1
+
+
+def test_cursor_advances_to_new_uploads_only():
+    state = FakeYouTubeState(channels=1, videos_per_channel=10)
+    
+    async def scenario(worker, db):
+        await worker.run_once()
+        first = db.crawl_state[next(iter(db.sources))].crawl_cursor
+        state.publish(3)
+        report = await worker.run_once()
+        return first, report, db
+    
+    first, report, db = crawl(state, [channel_url(state, 0)], scenario)
+    source = report.sources[0]
+    assert (source.fetched, source.written, source.not_modified) == (3, 3, False)
+    assert db.crawl_state[source.source_id].crawl_cursor > first
+    assert db.sources[source.source_id].content_count == 13
+
+
+
+def test_page_cap_reports_unread_history():
+    state = FakeYouTubeState(channels=1, videos_per_channel=120)
+    
+    async def scenario(worker, db):
+        first = await worker.run_once()
+        state.publish(3)
+        return first, await worker.run_once()
+    
+    first, second = crawl(state, [channel_url(state, 0)], scenario, max_pages_per_source=2)
+    assert (first.sources[0].fetched, first.sources[0].truncated) == (100, True)
+    assert first.summary()["truncated"] == 1
+    # Later crawls stop at the cursor, and the uploads past the cap stay unread
+    assert (second.sources[0].fetched, second.sources[0].truncated) == (3, False)
+
+
+def test_recrawled_videos_with_unchanged_metadata_are_not_written():
+    state = FakeYouTubeState(channels=1, videos_per_channel=10)
+    
+    async def scenario(worker, db):
+        await worker.run_once()
+        # Forget the crawl state, so the same uploads are listed and upserted again
+        for source_id in db.crawl_state:
+            db.crawl_state[source_id].crawl_etag = None
+            db.crawl_state[source_id].crawl_cursor = None
+        return await worker.run_once()
+    
+    report = crawl(state, [channel_url(state, 0)], scenario)
+    assert (report.sources[0].fetched, report.sources[0].written) == (10, 0)
+
+
+def test_quota_exhaustion_ends_the_pass_and_defers_remaining_sources():
+    state = FakeYouTubeState(channels=3, videos_per_channel=10, quota=4)
+    
+    async def scenario(worker, db):
+        return await worker.run_once(), db
+    
+    report, db = crawl(state, [channel_url(state, n) for n in range(3)], scenario, concurrency=1)
+    assert report.quota_exceeded
+    # Two calls per source: the third source is refused and keeps no cursor
+    assert len(report.sources) == 2
+    assert sum(s.crawl_cursor is None for s in db.crawl_state.values()) == 1
+    assert state.used == 4
+
+
+def test_failing_sources_record_their_error_and_do_not_end_the_pass():
+    state = FakeYouTubeState(channels=2, videos_per_channel=5)
+    urls = [channel_url(state, 0), "https://www.youtube.com/c/legacy", "https://www.youtube.com/@channel0"]
+    
+    async def scenario(worker, db):
+        # The first source claimed the channel in an earlier pass
+        first = next(s.id for s in db.sources.values() if s.url == urls[0])
+        db._set_platform_id(first, state.channel_id(0))
+        return await worker.run_once(), db
+    
+    report, db = crawl(state, urls, scenario)
+    by_url = {db.sources[r.source_id].url: r for r in report.sources}
+    assert by_url[urls[0]].error is None and by_url[urls[0]].written == 5
+    assert by_url[urls[1]].error == f"Cannot resolve a channel id from {urls[1]}"
+    assert by_url[urls[2]].error == f"Channel {state.channel_id(0)} is already crawled by another source"
+    errors = {source.url: source.last_error for source in db.sources.values()}
+    assert errors[urls[0]] is None
+    assert errors[urls[1]] == by_url[urls[1]].error
+    assert errors[urls[2]].startswith("Same channel as source ")
+    assert not next(s for s in db.sources.values() if s.url == urls[2]).is_active
+
+
+def test_database_errors_are_recorded_per_source():
+    state = FakeYouTubeState(channels=2, videos_per_channel=5)
+    
+    async def scenario(worker, db):
+        failing = next(iter(db.sources))
+        upsert = db._handlers["upsert_contents"]
+        
+        def flaky(source_id, items):
+            if source_id == failing:
+                raise gel.InternalServerError("connection lost")
+            return upsert(source_id=source_id, items=items)
+        
+        db._handlers["upsert_contents"] = flaky
+        return await worker.run_once(), db, failing
+    
+    report, db, failing = crawl(state, [channel_url(state, n) for n in range(2)], scenario)
+    errors = {r.source_id: r.error for r in report.sources}
+    assert errors.pop(failing) == "InternalServerError: connection lost"
+    assert list(errors.values()) == [None]
+    assert db.sources[failing].last_error == "InternalServerError: connection lost"
+    # The cursor stays put, so the next pass fetches the same uploads again
+    assert db.crawl_state[failing].crawl_cursor is None
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from antidote import world
+from fastapi import HTTPException
+
+from auth import limiter as limiter_module
+from auth.limiter import LoginLimiter
+
+WINDOW = 300
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """A LoginLimiter on a fresh local store, allowing 3 attempts per user and 5 per IP."""
+    monkeypatch.setenv("LOGIN_MAX_ATTEMPTS_PER_USER", "3")
+    monkeypatch.setenv("LOGIN_MAX_ATTEMPTS_PER_IP", "5")
+    monkeypatch.setenv("LOGIN_WINDOW_SECONDS", str(WINDOW))
+    monkeypatch.setenv("STATE_BACKEND", "local")
+    with world.test.clone():
+        yield world[LoginLimiter]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Start of a window, so sliding counts are easy to follow
+    now = [WINDOW * 1000.0]
+    monkeypatch.setattr(limiter_module.time, "time", lambda: now[0])
+    return now
+
+
+def attempts(limiter, username, ip, n):
+    """Make n failed attempts; return the Retry-After of the first rejected one, or None."""
+    async def run():
+        for _ in range(n):
+            try:
+                await limiter.check(username, ip)
+            except HTTPException as e:
+                assert e.status_code == 429
+                return int(e.headers["Retry-After"])
+            limiter.record_failure()
+    return asyncio.run(run())
+
+
+def test_username_is_limited_regardless_of_ip(limiter, clock):
+    assert attempts(limiter, "alice", "10.0.0.1", 3) is None
+    assert attempts(limiter, "Alice", "10.0.0.2", 1) is not None
+    assert attempts(limiter, "bob", "10.0.0.1", 1) is None
+
+
+def test_ip_is_limited_across_usernames(limiter, clock):
+    for n in range(5):
+        assert attempts(limiter, f"user{n}", "10.0.0.1", 1) is None
+    assert attempts(limiter, "user5", "10.0.0.1", 1) is not None
+    assert attempts(limiter, "user5", "10.0.0.2", 1) is None
+
+
+def test_previous_window_decays(limiter, clock):
+    attempts(limiter, "alice", None, 3)
+    # Two thirds into the next window one of the previous three still counts
+    clock[0] += WINDOW * 5 / 3
+    assert attempts(limiter, "alice", None, 2) is None
+    assert attempts(limiter, "alice", None, 1) is not None
+
+
+def test_retry_after_points_at_the_first_allowed_attempt(limiter, clock):
+    retry_after = attempts(limiter, "alice", None, 4)
+    assert attempts(limiter, "bob", None, 4) == retry_after
+    clock[0] += retry_after - 1
+    assert attempts(limiter, "bob", None, 1) is not None
+    clock[0] += 1
+    assert attempts(limiter, "alice", None, 1) is None
+
+
+def test_success_clears_the_username_and_is_not_counted_against_the_ip(limiter, clock):
+    async def log_in(username):
+        await limiter.check(username, "10.0.0.1")
+        await limiter.record_success(username, "10.0.0.1")
+    
+    async def run():
+        for n in range(20):
+            await log_in(f"user{n % 2}")
+    
+    asyncio.run(run())
+    assert attempts(limiter, "carol", "10.0.0.1", 3) is None
+
+
+def test_login_answers_429_with_retry_after(api, monkeypatch):
+    monkeypatch.setenv("LOGIN_MAX_ATTEMPTS_PER_USER", "2")
+    
+    async def scenario(client, db):
+        wrong = {"username": "admin", "password": "wrong"}
+        statuses = [(await client.post("/auth/login", json=wrong)).status_code for _ in range(2)]
+        return statuses, await client.post("/auth/login", json=wrong)
+    
+    statuses, limited = api(scenario)
+    assert statuses == [401, 401]
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) > 0
@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    item_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, item_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, item_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "bm90IGEgY3Vyc29y", "MjAyNC0wNS0wMXxub3QtYS11dWlk"])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_listing_pages_through_every_source_once(api):
+    async def scenario(client, db):
+        for n in range(7):
+            response = await client.post(
+                "/sources/",
+                json={"name": f"Feed {n}", "type": "rss", "url": f"https://example.com/feed{n}"},
+            )
+            assert response.status_code == 200
+        
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get("/sources/", params=params)).json()
+            assert page["total"] == 7
+            seen += [source["name"] for source in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return seen
+    
+    assert api(scenario) == [f"Feed {n}" for n in reversed(range(7))]
+
+
+def test_listing_rejects_a_bad_cursor(api):
+    async def scenario(client, db):
+        return await client.get("/sources/", params={"cursor": "garbage"})
+    
+    response = api(scenario)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from ingestion import ratelimit
+from ingestion.ratelimit import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock the bucket reads; sleeping advances it instead of waiting."""
+    now = [0.0]
+    sleeps = []
+    
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+    
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", sleep)
+    return now, sleeps
+
+
+def test_burst_is_served_without_waiting(clock):
+    now, sleeps = clock
+    bucket = TokenBucket(rate=2, capacity=5)
+    
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+    
+    asyncio.run(take(5))
+    assert sleeps == []
+    assert bucket.available == 0
+
+
+def test_empty_bucket_waits_for_the_refill(clock):
+    now, sleeps = clock
+    bucket = TokenBucket(rate=2, capacity=5)
+    
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+    
+    asyncio.run(take(7))
+    # Two more tokens at two per second
+    assert sum(sleeps) == pytest.approx(1.0)
+    assert now[0] == pytest.approx(1.0)
+
+
+def test_refill_stops_at_capacity(clock):
+    now, _ = clock
+    bucket = TokenBucket(rate=10, capacity=3)
+    asyncio.run(bucket.acquire(3))
+    now[0] += 60
+    assert bucket.available == 3
+
+
+def test_concurrent_callers_share_the_rate():
+    bucket = TokenBucket(rate=100, capacity=1)
+    
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        return loop.time() - start
+    
+    # One token up front, then five at 10ms each
+    assert asyncio.run(main()) >= 0.045
@@ -0,0 +1,121 @@
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+
+from config import SchedulerConfig
+from ingestion.worker import SourceReport
+from scheduler.backends import InMemoryJobBackend
+from scheduler.policy import next_interval, retry_delay
+from scheduler.service import Scheduler
+
+LEASE = timedelta(minutes=5)
+HOUR = timedelta(hours=1)
+
+
+@dataclass
+class FakeSource:
+    type: str = "youtube"
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+
+class FakeWorker:
+    """Ingestion worker answering every source with the same report."""
+    
+    def __init__(self, fetched: int = 0, error: Optional[str] = None):
+        self.fetched = fetched
+        self.error = error
+        self.crawled = []
+    
+    async def ingest_source(self, source) -> SourceReport:
+        self.crawled.append(source.id)
+        return SourceReport(source_id=source.id, fetched=self.fetched, error=self.error)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [datetime(2024, 1, 1, tzinfo=timezone.utc)]
+    monkeypatch.setattr(InMemoryJobBackend, "_now", staticmethod(lambda: now[0]))
+    return now
+
+
+def test_ensure_jobs_creates_one_job_per_source_of_the_types(clock):
+    backend = InMemoryJobBackend([FakeSource(), FakeSource(), FakeSource(type="rss")])
+    assert asyncio.run(backend.ensure_jobs(["youtube"], HOUR)) == 2
+    assert asyncio.run(backend.ensure_jobs(["youtube"], HOUR)) == 0
+
+
+def test_a_leased_job_is_not_claimed_again_until_the_lease_expires(clock):
+    backend = InMemoryJobBackend([FakeSource()])
+    asyncio.run(backend.ensure_jobs(["youtube"], HOUR))
+    
+    [job] = asyncio.run(backend.claim("a", 10, LEASE))
+    assert asyncio.run(backend.claim("b", 10, LEASE)) == []
+    
+    clock[0] += LEASE
+    [again] = asyncio.run(backend.claim("b", 10, LEASE))
+    assert (again.id, again.attempts) == (job.id, 2)
+    # "a" lost the lease, so its result is discarded
+    assert not asyncio.run(backend.complete(job.id, "a", 0, HOUR))
+    assert asyncio.run(backend.complete(job.id, "b", 0, HOUR))
+
+
+def test_claim_takes_the_most_overdue_jobs_first(clock):
+    backend = InMemoryJobBackend([FakeSource() for _ in range(3)])
+    asyncio.run(backend.ensure_jobs(["youtube"], HOUR))
+    jobs = list(backend.jobs.values())
+    for n, job in enumerate(jobs):
+        job.next_run_at = clock[0] - timedelta(minutes=n)
+    
+    claimed = asyncio.run(backend.claim("a", 2, LEASE))
+    assert [job.id for job in claimed] == [jobs[2].id, jobs[1].id]
+
+
+def test_completed_job_is_due_again_after_its_interval(clock):
+    backend = InMemoryJobBackend([FakeSource()])
+    asyncio.run(backend.ensure_jobs(["youtube"], HOUR))
+    [job] = asyncio.run(backend.claim("a", 1, LEASE))
+    asyncio.run(backend.complete(job.id, "a", 3, 2 * HOUR))
+    
+    clock[0] += 2 * HOUR - timedelta(seconds=1)
+    assert asyncio.run(backend.claim("a", 1, LEASE)) == []
+    clock[0] += timedelta(seconds=1)
+    [again] = asyncio.run(backend.claim("a", 1, LEASE))
+    # Attempts count failures in a row, so success resets them
+    assert again.attempts == 1
+
+
+def test_interval_shrinks_after_new_content_and_grows_otherwise():
+    config = SchedulerConfig(min_interval_seconds=900, max_interval_seconds=7200)
+    assert next_interval(HOUR, 5, config) == timedelta(minutes=30)
+    assert next_interval(HOUR, 0, config) == timedelta(minutes=90)
+    assert next_interval(timedelta(minutes=20), 5, config) == timedelta(minutes=15)
+    assert next_interval(2 * HOUR, 0, config) == 2 * HOUR
+
+
+def test_retry_delay_backs_off_exponentially_up_to_the_ceiling():
+    config = SchedulerConfig(retry_base_seconds=60, retry_max_seconds=600)
+    for attempts, ceiling in [(1, 60), (2, 120), (3, 240), (4, 480), (10, 600)]:
+        for _ in range(20):
+            assert 30 <= retry_delay(attempts, config).total_seconds() <= ceiling
+
+
+def test_scheduler_reschedules_successful_and_failed_crawls(clock):
+    sources = [FakeSource(), FakeSource()]
+    backend = InMemoryJobBackend(sources)
+    config = SchedulerConfig(retry_base_seconds=60, retry_max_seconds=60)
+    
+    scheduler = Scheduler(backend=backend, worker=FakeWorker(fetched=4), config=config)
+    [outcome, _] = asyncio.run(scheduler.run_once())
+    assert outcome.error is None and not outcome.lease_lost
+    assert outcome.next_in == next_interval(timedelta(seconds=config.initial_interval_seconds), 4, config)
+    
+    clock[0] += timedelta(days=1)
+    scheduler.worker = FakeWorker(error="HTTPStatusError: 500")
+    outcomes = asyncio.run(scheduler.run_once())
+    assert [outcome.error for outcome in outcomes] == ["HTTPStatusError: 500"] * 2
+    assert all(30 <= outcome.next_in.total_seconds() <= 60 for outcome in outcomes)
+    assert {job.last_error for job in backend.jobs.values()} == {"HTTPStatusError: 500"}
@@ -0,0 +1,43 @@
+import asyncio
+import socket
+
+import pytest
+
+from shared_state import SocketStore, StateServer, socket_in_use
+
+
+def test_state_server_replaces_a_stale_socket(tmp_path):
+    path = str(tmp_path / "state.sock")
+    # Bound and closed without unlinking, like a server that was killed
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    
+    async def main():
+        server = asyncio.create_task(StateServer(path, 10).serve_forever())
+        while not socket_in_use(path):
+            await asyncio.sleep(0.01)
+        store = SocketStore(path)
+        await store.set("k", 1, 60)
+        value = await store.get("k")
+        server.cancel()
+        return value
+    
+    assert not socket_in_use(path)
+    assert asyncio.run(main()) == 1
+
+
+def test_state_server_refuses_a_live_socket(tmp_path):
+    path = str(tmp_path / "state.sock")
+    
+    async def main():
+        first = asyncio.create_task(StateServer(path, 10).serve_forever())
+        while not socket_in_use(path):
+            await asyncio.sleep(0.01)
+        with pytest.raises(RuntimeError, match="already listening"):
+            await StateServer(path, 10).serve_forever()
+        # The running server keeps its socket
+        assert socket_in_use(path)
+        first.cancel()
+    
+    asyncio.run(main())
@@ -0,0 +1,46 @@
+from contents.snippets import highlight, query_terms
+
+
+def test_query_terms_are_folded_stems_without_operators():
+    assert query_terms("Revolução AND classe OR NOT mais-valia") == ["revoluc", "clas", "mais", "vali"]
+
+
+def test_accented_words_match_their_other_forms():
+    terms = query_terms("revolução")
+    assert highlight("As Revoluções de 1848", terms) == "As <mark>Revoluções</mark> de 1848"
+
+
+def test_text_is_escaped_around_marks():
+    assert highlight("<b>capital</b> & labour", query_terms("capital")) == (
+        "&lt;b&gt;<mark>capital</mark>&lt;/b&gt; &amp; labour"
+    )
+
+
+def test_long_text_is_windowed_around_the_first_match():
+    text = "filler " * 100 + "surplus value" + " filler" * 100
+    snippet = highlight(text, query_terms("surplus"), width=80)
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "<mark>surplus</mark>" in snippet
+    assert len(snippet.replace("<mark>", "").replace("</mark>", "")) == 82
+
+
+def test_no_match_returns_the_start_of_the_text():
+    assert highlight("abc " * 100, query_terms("zzzz"), width=10) == "abc abc ab…"
+
+
+def test_empty_text_has_no_snippet():
+    assert highlight(None, ["term"]) is None
+    assert highlight("", ["term"]) is None
+
+
+def test_search_rejects_times_without_an_offset(api):
+    async def scenario(client, db):
+        return await client.get("/contents/search", params={"q": "capital", "published_after": "2024-01-01T00:00:00"})
+    
+    response = api(scenario)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "published_after"]
+
+
+def test_marks_stay_aligned_after_characters_that_lowercase_longer():
+    assert highlight("İstanbul capital", query_terms("capital")) == "İstanbul <mark>capital</mark>"
@@ -0,0 +1,130 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+
+@pytest.mark.parametrize("method", ["PATCH", "DELETE"])
+def test_bulk_filter_rejects_times_without_an_offset(api, method):
+    async def scenario(client, db):
+        body = {"filter": {"created_before": "2024-01-01T00:00:00"}, "is_active": False}
+        return await client.request(method, "/sources/", json=body)
+    
+    response = api(scenario)
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][-1] == "created_before"
+
+
+async def create(client, name, type="rss", url=None):
+    response = await client.post(
+        "/sources/", json={"name": name, "type": type, "url": url or f"https://example.com/{name}"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_patch_edits_only_the_given_fields(api):
+    async def scenario(client, db):
+        source = await create(client, "a")
+        renamed = await client.patch(f"/sources/{source['id']}", json={"name": "Renamed"})
+        return source, renamed.json()
+    
+    source, renamed = api(scenario)
+    assert renamed["name"] == "Renamed"
+    assert (renamed["url"], renamed["type"], renamed["is_active"]) == (source["url"], "rss", True)
+
+
+def test_patch_url_recomputes_the_canonical_key(api):
+    async def scenario(client, db):
+        a = await create(client, "a", "youtube", "https://www.youtube.com/@a")
+        b = await create(client, "b", "youtube", "https://www.youtube.com/@b")
+        taken = await client.patch(f"/sources/{b['id']}", json={"url": "youtube.com/@A/videos"})
+        moved = await client.patch(f"/sources/{a['id']}", json={"url": "https://www.youtube.com/@c"})
+        # a's old key is free again
+        reused = await client.patch(f"/sources/{b['id']}", json={"url": "https://youtube.com/@a"})
+        # Changing the type alone re-keys the unchanged URL under the new type
+        retyped = await client.patch(f"/sources/{b['id']}", json={"type": "rss"})
+        return taken, moved, reused, retyped, sorted(db.canonical_keys)
+    
+    taken, moved, reused, retyped, keys = api(scenario)
+    assert taken.status_code == 409
+    assert moved.status_code == 200
+    assert reused.status_code == 200
+    assert retyped.json()["type"] == "rss"
+    assert keys == ["rss:youtube.com/@a", "youtube:@c"]
+
+
+def test_patch_unknown_or_malformed_id(api):
+    async def scenario(client, db):
+        missing = await client.patch("/sources/00000000-0000-0000-0000-000000000000", json={"url": "https://x.org"})
+        malformed = await client.patch("/sources/nope", json={"name": "x"})
+        return missing.status_code, malformed.status_code
+    
+    assert api(scenario) == (404, 400)
+
+
+def test_bulk_patch_by_ids_reports_missing_ones(api):
+    missing = "00000000-0000-0000-0000-000000000000"
+    
+    async def scenario(client, db):
+        a, b, c = [await create(client, name) for name in "abc"]
+        response = await client.patch("/sources/", json={"ids": [a["id"], b["id"], missing], "is_active": False})
+        return response.json(), {s.name: s.is_active for s in db.sources.values()}
+    
+    result, active = api(scenario)
+    assert result["matched"] == 2
+    assert sorted((item["status"], item["id"] == missing) for item in result["results"]) == [
+        ("not_found", True), ("updated", False), ("updated", False),
+    ]
+    assert active == {"a": False, "b": False, "c": True}
+
+
+def test_bulk_patch_by_filter(api):
+    async def scenario(client, db):
+        for name in "ab":
+            await create(client, name)
+        await create(client, "c", "youtube", "https://www.youtube.com/@c")
+        old = next(s for s in db.sources.values() if s.name == "a")
+        old.created_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        by_type = await client.patch("/sources/", json={"filter": {"type": "rss"}, "is_active": False})
+        by_age = await client.patch(
+            "/sources/",
+            json={"filter": {"is_active": False, "created_before": "2021-01-01T00:00:00Z"}, "is_active": True},
+        )
+        return by_type.json()["matched"], [item["source"]["name"] for item in by_age.json()["results"]]
+    
+    assert api(scenario) == (2, ["a"])
+
+
+def test_bulk_selection_must_not_be_everything(api):
+    async def scenario(client, db):
+        return [
+            (await client.patch("/sources/", json={"is_active": False})).status_code,
+            (await client.request("DELETE", "/sources/", json={"filter": {}})).status_code,
+        ]
+    
+    assert api(scenario) == [422, 422]
+
+
+def test_bulk_ids_are_capped(api, monkeypatch):
+    monkeypatch.setenv("SOURCES_BULK_MAX_ROWS", "2")
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    
+    async def scenario(client, db):
+        return await client.request("DELETE", "/sources/", json={"ids": ids})
+    
+    response = api(scenario)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "At most 2 ids per request"
+
+
+def test_bulk_delete(api):
+    async def scenario(client, db):
+        a, b = [await create(client, name) for name in "ab"]
+        response = await client.request("DELETE", "/sources/", json={"ids": [a["id"], a["id"]]})
+        return response.json(), [s.name for s in db.sources.values()]
+    
+    result, left = api(scenario)
+    assert result["matched"] == 1
+    assert [item["status"] for item in result["results"]] == ["deleted"]
+    assert left == ["b"]
@@ -11,6 +11,17 @@ interface Source {
   type: string;
   url: string;
   is_active: boolean;
+  content_count: number;
+  last_published_at: string | null;
+  last_crawl_at: string | null;
+  last_error: string | null;
+}
+
+interface SourceStats {
+  total: number;
+  active: number;
+  failing: number;
+  content_count: number;
 }
 
 interface DashboardProps {
@@ -20,6 +31,8 @@ interface DashboardProps {
 
 const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
   const [sources, setSources] = useState<Source[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [stats, setStats] = useState<SourceStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [showAddForm, setShowAddForm] = useState(false);
   const [newSource, setNewSource] = useState({
@@ -32,12 +45,14 @@ const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
     'Authorization': `Bearer ${localStorage.getItem('token')}`
   });
 
-  const fetchSources = async () => {
+  const fetchSources = async (cursor?: string) => {
     try {
       const response = await axios.get('http://localhost:8000/sources', {
-        headers: getAuthHeaders()
+        headers: getAuthHeaders(),
+        params: cursor ? { cursor } : {}
       });
-      setSources(response.data);
+      setSources(cursor ? [...sources, ...response.data.items] : response.data.items);
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Failed to fetch sources:', error);
     } finally {
@@ -45,8 +60,23 @@ const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
     }
   };
 
+  const fetchStats = async () => {
+    try {
+      const response = await axios.get('http://localhost:8000/sources/stats', {
+        headers: getAuthHeaders()
+      });
+      setStats(response.data);
+    } catch (error) {
+      console.error('Failed to fetch source stats:', error);
+    }
+  };
+
+  const formatDate = (value: string | null) =>
+    value ? new Date(value).toLocaleString() : 'never';
+
   useEffect(() => {
     fetchSources();
+    fetchStats();
   }, []);
 
   const handleAddSource = async (e: React.FormEvent) => {
@@ -58,6 +88,7 @@ const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
       setNewSource({ name: '', type: 'youtube', url: '' });
       setShowAddForm(false);
       fetchSources();
+      fetchStats();
     } catch (error) {
       console.error('Failed to add source:', error);
     }
@@ -70,6 +101,7 @@ const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
           headers: getAuthHeaders()
         });
         fetchSources();
+        fetchStats();
       } catch (error) {
         console.error('Failed to delete source:', error);
       }
@@ -98,6 +130,12 @@ const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
             </button>
           </div>
 
+          {stats && (
+            <p className="sources-stats">
+              {stats.total} sources ({stats.active} active, {stats.failing} failing), {stats.content_count} items
+            </p>
+          )}
+
           {showAddForm && (
             <form onSubmit={handleAddSource} className="add-source-form">
               <div className="form-group">
@@ -154,6 +192,12 @@ const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
                       <p className={`source-status ${source.is_active ? 'active' : 'inactive'}`}>
                         {source.is_active ? 'Active' : 'Inactive'}
                       </p>
+                      <p className="source-ingestion">
+                        {source.content_count} items, last published {formatDate(source.last_published_at)}, last crawled {formatDate(source.last_crawl_at)}
+                      </p>
+                      {source.last_error && (
+                        <p className="source-error">{source.last_error}</p>
+                      )}
                     </div>
                     <div className="source-actions">
                       <button 
@@ -166,6 +210,11 @@ const Dashboard: React.FC<DashboardProps> = ({ user, onLogout }) => {
                   </div>
                 ))
               )}
+              {nextCursor && (
+                <button onClick={() => fetchSources(nextCursor)} className="load-more-btn">
+                  Load more
+                </button>
+              )}
             </div>
           )}
         </section>